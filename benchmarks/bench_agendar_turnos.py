@@ -0,0 +1,110 @@
+"""Compara agendar N turnos con un bucle de agendar_turno contra Clinica.agendar_turnos.
+
+También mide agendar_turnos con el recolector de ciclos pausado por quien llama: la clínica no lo
+pausa porque el recolector es del proceso entero, pero un script de carga sin otros hilos puede.
+Al final agrega lotes chicos a una Agenda que ya tiene muchos turnos (como agendar_turnos o
+una serie sobre un médico con la agenda llena), contra los mismos turnos de a uno.
+
+Uso: python benchmarks/bench_agendar_turnos.py [cantidad_turnos]
+"""
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.agenda import Agenda
+from src.turno import Turno
+
+CANTIDAD_PACIENTES = 1000
+CANTIDAD_MEDICOS = 50
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+
+def crear_clinica():
+    clinica = Clinica()
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    return clinica
+
+
+def crear_solicitudes(cantidad):
+    inicio = datetime(2025, 1, 6, 8, 0)
+    solicitudes = []
+    for i in range(cantidad):
+        # Cada médico atiende un turno cada 15 minutos; los pacientes rotan
+        fecha_hora = inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+        solicitudes.append((f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", "Clínica", fecha_hora))
+    return solicitudes
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    solicitudes = crear_solicitudes(cantidad)
+
+    clinica = crear_clinica()
+    inicio = time.perf_counter()
+    for dni, matricula, especialidad, fecha_hora in solicitudes:
+        clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+    bucle = time.perf_counter() - inicio
+
+    clinica = crear_clinica()
+    inicio = time.perf_counter()
+    resultados = clinica.agendar_turnos(solicitudes)
+    lote = time.perf_counter() - inicio
+    assert all(r.fue_agendado() for r in resultados)
+
+    clinica = crear_clinica()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        resultados = clinica.agendar_turnos(solicitudes)
+        sin_recolector = time.perf_counter() - inicio
+    finally:
+        gc.enable()
+    assert all(r.fue_agendado() for r in resultados)
+
+    print(f"{cantidad} turnos")
+    for nombre, tiempo in (("bucle de agendar_turno", bucle), ("agendar_turnos", lote),
+                           ("agendar_turnos, recolector pausado", sin_recolector)):
+        print(f"  {nombre + ':':<36} {tiempo:.3f} s ({cantidad / tiempo:,.0f} turnos/s)")
+    medir_lotes_en_agenda_grande()
+
+
+def medir_lotes_en_agenda_grande(existentes=300_000, lotes=1000, por_lote=8):
+    paciente = Paciente("1", "Paciente", "01/01/1990")
+    medico = Medico("M-0", "Médico")
+    inicio = datetime(2025, 1, 6, 8, 0)
+    agenda = Agenda()
+    agenda.agregar_turnos([Turno(paciente, medico, inicio + timedelta(minutes=15 * i), "Clínica") for i in range(existentes)])
+    # Lotes repartidos por toda la agenda, en los minutos libres entre turnos
+    lotes_nuevos = [[Turno(paciente, medico, inicio + timedelta(minutes=15 * ((n * 7919 + k * 97) % existentes) + 1 + n % 13), "Clínica")
+                     for k in range(por_lote)] for n in range(lotes)]
+
+    inicio_medicion = time.perf_counter()
+    for lote in lotes_nuevos:
+        agenda.agregar_turnos(lote)
+    en_lote = time.perf_counter() - inicio_medicion
+    for lote in lotes_nuevos:
+        for turno in lote:
+            agenda.quitar_turno(turno)
+
+    inicio_medicion = time.perf_counter()
+    for lote in lotes_nuevos:
+        for turno in lote:
+            agenda.agregar_turno(turno)
+    de_a_uno = time.perf_counter() - inicio_medicion
+
+    print(f"{lotes} lotes de {por_lote} turnos en una Agenda con {existentes} turnos")
+    for nombre, tiempo in (("Agenda.agregar_turnos", en_lote), ("Agenda.agregar_turno de a uno", de_a_uno)):
+        print(f"  {nombre + ':':<36} {tiempo:.3f} s ({tiempo / lotes * 1e6:.1f} µs por lote)")
+
+if __name__ == "__main__":
+    main()
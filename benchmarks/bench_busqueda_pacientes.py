@@ -0,0 +1,113 @@
+"""Compara la búsqueda de pacientes por nombre recorriendo todos los pacientes contra el índice de nombres.
+
+Genera pacientes con nombres y apellidos al azar (los apellidos se arman con sílabas, así hay
+miles distintos, como en un padrón real) y mide:
+- búsquedas por prefijo ("mar gar")
+- búsquedas con errores de tipeo ("gonzales" por "González")
+
+Recorrer con errores de tipeo es muy lento: se mide sobre los primeros 100.000 pacientes y se
+estima el tiempo para todos.
+
+Uso: python benchmarks/bench_busqueda_pacientes.py [cantidad_pacientes]
+"""
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.texto import normalizar_texto
+from src.indice_nombres import distancia_edicion, distancia_permitida
+
+NOMBRES = ["María", "José", "Juan", "Ana", "Carlos", "Lucía", "Jorge", "Sofía", "Luis", "Valentina", "Miguel",
+           "Camila", "Pedro", "Martina", "Diego", "Julieta", "Pablo", "Florencia", "Mario", "Agustina", "Ramón",
+           "Paula", "Héctor", "Carolina", "Raúl", "Gabriela", "Sergio", "Natalia", "Oscar", "Romina", "Tomás",
+           "Milagros", "Matías", "Micaela", "Nicolás", "Rocío", "Facundo", "Belén", "Gonzalo", "Abril"]
+APELLIDOS = ["García", "González", "Rodríguez", "Fernández", "López", "Martínez", "Pérez", "Gómez", "Sánchez",
+             "Romero", "Díaz", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Acosta", "Benítez", "Medina",
+             "Herrera", "Suárez", "Aguirre", "Giménez", "Gutiérrez", "Pereyra", "Rojas", "Molina", "Castro"]
+SILABAS = ["ba", "be", "ca", "co", "da", "di", "fe", "ga", "gu", "la", "lo", "ma", "me", "na", "no", "pa", "pe",
+           "ra", "ri", "ro", "sa", "se", "ta", "to", "va", "ve", "za", "zu", "rez", "lla", "nez", "tti"]
+# (texto buscado, apellido que tiene que aparecer entre los resultados)
+BUSQUEDAS_PREFIJO = ["mar gar", "jos gonz", "fernandez", "luc ro", "sofia pereyra"]
+BUSQUEDAS_APROXIMADAS = ["gonzales", "maria garsia", "rodirguez", "juan peres", "gimenes"]
+
+
+def generar_nombres(cantidad):
+    azar = random.Random(42)
+    inventados = sorted({"".join(azar.choice(SILABAS) for _ in range(azar.randint(2, 4))).capitalize()
+                         for _ in range(30_000)})
+    for _ in range(cantidad):
+        # La mitad de los pacientes tiene uno de los apellidos frecuentes
+        apellido = azar.choice(APELLIDOS) if azar.random() < 0.5 else azar.choice(inventados)
+        nombres = azar.sample(NOMBRES, azar.choice([1, 1, 2]))
+        yield " ".join(nombres + [apellido])
+
+
+def buscar_recorriendo(pacientes, texto, cantidad):
+    buscadas = normalizar_texto(texto).split()
+    encontrados = []
+    for paciente in pacientes:
+        palabras = normalizar_texto(paciente.obtener_nombre()).split()
+        if all(any(p.startswith(b) for p in palabras) for b in buscadas):
+            encontrados.append(paciente)
+            if len(encontrados) == cantidad:
+                break
+    return encontrados
+
+
+def aproximado_recorriendo(pacientes, texto):
+    buscadas = normalizar_texto(texto).split()
+    encontrados = []
+    for paciente in pacientes:
+        palabras = normalizar_texto(paciente.obtener_nombre()).split()
+        if all(any(distancia_edicion(b, p, distancia_permitida(b)) <= distancia_permitida(b) for p in palabras)
+               for b in buscadas):
+            encontrados.append(paciente)
+    return encontrados
+
+
+def medir(funcion, repeticiones=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) / repeticiones, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pacientes = [Paciente(f"{i:08}", nombre, "01/01/1990") for i, nombre in enumerate(generar_nombres(cantidad))]
+    clinica = Clinica()
+    segundos = time.perf_counter()
+    for paciente in pacientes:
+        clinica.agregar_paciente(paciente)
+    segundos = time.perf_counter() - segundos
+    print(f"{cantidad} pacientes agregados en {segundos:.1f} s ({cantidad / segundos:,.0f} pacientes/s, con el índice)")
+
+    print(f"\nPor prefijo (primeros 10):")
+    for texto in BUSQUEDAS_PREFIJO:
+        recorriendo, esperado = medir(lambda: buscar_recorriendo(pacientes, texto, 10))
+        con_indice, obtenido = medir(lambda: clinica.buscar_pacientes_por_nombre(texto, 10), 20)
+        assert len(obtenido) == len(esperado)
+        print(f"  {texto!r:>18}: {recorriendo * 1000:8.1f} ms recorriendo, {con_indice * 1000:6.2f} ms con el índice")
+    # Lo peor para el recorrido: un nombre que no existe obliga a mirar a todos
+    recorriendo, _ = medir(lambda: buscar_recorriendo(pacientes, "zzz", 10))
+    con_indice, _ = medir(lambda: clinica.buscar_pacientes_por_nombre("zzz", 10), 20)
+    print(f"  {'zzz':>18}: {recorriendo * 1000:8.1f} ms recorriendo, {con_indice * 1000:6.2f} ms con el índice")
+
+    muestra = pacientes[:100_000]
+    print(f"\nCon errores de tipeo (primeros 10; recorriendo, estimado a partir de {len(muestra)} pacientes):")
+    for texto in BUSQUEDAS_APROXIMADAS:
+        recorriendo, esperado = medir(lambda: aproximado_recorriendo(muestra, texto))
+        recorriendo *= len(pacientes) / len(muestra)
+        con_indice, obtenido = medir(lambda: clinica.buscar_pacientes_aproximado(texto, 10), 20)
+        assert len(obtenido) == min(10, len(esperado)) or len(esperado) < len(obtenido)
+        mejor = obtenido[0][0].obtener_nombre() if obtenido else "-"
+        print(f"  {texto!r:>18}: {recorriendo * 1000:8.0f} ms recorriendo, {con_indice * 1000:6.2f} ms con el índice"
+              f" (primero: {mejor})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Mide cancelar y reprogramar turnos a medida que crece la cantidad de turnos agendados.
+
+Para 10^4, 10^5 y 10^6 turnos (o las cantidades indicadas) agenda los turnos en lote entre
+CANTIDAD_MEDICOS médicos, con un paciente cada TURNOS_POR_PACIENTE turnos, y mide el tiempo por
+operación de cancelar_turno y de reprogramar_turno sobre turnos al azar. Como referencia mide
+también quitar los mismos turnos de una lista por médico con list.remove, que es lo que haría
+falta sin los índices de la clínica.
+
+Uso: python benchmarks/bench_cancelacion.py [cantidad_turnos ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+CANTIDAD_MEDICOS = 20
+# Turnos por paciente: la historia de cada paciente no crece con la clínica
+TURNOS_POR_PACIENTE = 50
+OPERACIONES = 2_000
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+
+def crear_clinica(cantidad_turnos):
+    clinica = Clinica()
+    cantidad_pacientes = max(cantidad_turnos // TURNOS_POR_PACIENTE, CANTIDAD_MEDICOS)
+    for i in range(cantidad_pacientes):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    inicio = datetime(2025, 1, 6, 8, 0)
+    # Cada médico atiende cada 15 minutos; el paciente cambia con el horario para no superponerse
+    solicitudes = [(f"{(i // CANTIDAD_MEDICOS * 7 + i % CANTIDAD_MEDICOS) % cantidad_pacientes:08}",
+                    f"M-{i % CANTIDAD_MEDICOS}", "Clínica",
+                    inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS)))
+                   for i in range(cantidad_turnos)]
+    clinica.agendar_turnos(solicitudes)
+    return clinica
+
+
+def medir(cantidad_turnos):
+    clinica = crear_clinica(cantidad_turnos)
+    turnos = clinica.obtener_turnos()
+    azar = random.Random(1)
+    elegidos = azar.sample(turnos, 2 * OPERACIONES)
+    a_cancelar, a_reprogramar = elegidos[:OPERACIONES], elegidos[OPERACIONES:]
+    # Los turnos se mueven 5 minutos: horarios que nadie tiene
+    nuevas = [t.obtener_fecha_hora() + timedelta(minutes=5) for t in a_reprogramar]
+
+    por_medico = {}
+    for turno in turnos:
+        por_medico.setdefault(turno.obtener_medico().obtener_matricula(), []).append(turno)
+    inicio = time.perf_counter()
+    for turno in a_cancelar:
+        por_medico[turno.obtener_medico().obtener_matricula()].remove(turno)
+    lista = (time.perf_counter() - inicio) / OPERACIONES
+
+    inicio = time.perf_counter()
+    for turno in a_cancelar:
+        clinica.cancelar_turno(turno.obtener_id())
+    cancelar = (time.perf_counter() - inicio) / OPERACIONES
+
+    inicio = time.perf_counter()
+    for turno, fecha_hora in zip(a_reprogramar, nuevas):
+        clinica.reprogramar_turno(turno.obtener_id(), fecha_hora)
+    reprogramar = (time.perf_counter() - inicio) / OPERACIONES
+    assert len(clinica.obtener_turnos()) == cantidad_turnos - OPERACIONES
+    return cancelar, reprogramar, lista
+
+
+def main():
+    cantidades = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{OPERACIONES} operaciones sobre turnos al azar, {CANTIDAD_MEDICOS} médicos (µs por operación)")
+    print(f"  {'turnos':>10} {'cancelar_turno':>15} {'reprogramar_turno':>18} {'list.remove':>12}")
+    for cantidad in cantidades:
+        cancelar, reprogramar, lista = medir(cantidad)
+        print(f"  {cantidad:>10} {cancelar * 1e6:15.1f} {reprogramar * 1e6:18.1f} {lista * 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Mide cuántos turnos por segundo agenda la clínica según la cantidad de hilos.
+
+Cada hilo agenda su parte de las solicitudes con agendar_turno. Con "mismos médicos" todos los
+hilos piden turnos de todos los médicos (compiten por los mismos cerrojos); con "médicos
+propios" cada hilo trabaja con médicos distintos.
+
+Uso: python benchmarks/bench_concurrencia.py [cantidad_turnos]
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+CANTIDAD_PACIENTES = 1000
+CANTIDAD_MEDICOS = 64
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+HILOS = [1, 2, 4, 8, 16]
+
+
+def crear_clinica():
+    clinica = Clinica()
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    return clinica
+
+
+def crear_solicitudes(cantidad):
+    inicio = datetime(2025, 1, 6, 8, 0)
+    solicitudes = []
+    for i in range(cantidad):
+        fecha_hora = inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+        solicitudes.append((f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", "Clínica", fecha_hora))
+    return solicitudes
+
+
+def repartir(solicitudes, hilos, medicos_propios):
+    if medicos_propios:
+        # Cada hilo recibe todas las solicitudes de un grupo de médicos
+        return [[s for s in solicitudes if int(s[1][2:]) % hilos == n] for n in range(hilos)]
+    return [solicitudes[n::hilos] for n in range(hilos)]
+
+
+def medir(solicitudes, hilos, medicos_propios):
+    clinica = crear_clinica()
+    partes = repartir(solicitudes, hilos, medicos_propios)
+    barrera = threading.Barrier(hilos + 1)
+
+    def trabajo(parte):
+        barrera.wait()
+        for dni, matricula, especialidad, fecha_hora in parte:
+            clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+
+    trabajadores = [threading.Thread(target=trabajo, args=(parte,)) for parte in partes]
+    for trabajador in trabajadores:
+        trabajador.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - inicio
+    assert len(clinica.obtener_turnos()) == len(solicitudes)
+    return len(solicitudes) / segundos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    solicitudes = crear_solicitudes(cantidad)
+    print(f"{cantidad} turnos con agendar_turno (turnos/s)")
+    print(f"{'hilos':>5} | {'mismos médicos':>15} | {'médicos propios':>15}")
+    for hilos in HILOS:
+        compartidos = medir(solicitudes, hilos, medicos_propios=False)
+        propios = medir(solicitudes, hilos, medicos_propios=True)
+        print(f"{hilos:>5} | {compartidos:>15,.0f} | {propios:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compara la búsqueda de especialidad por día antes y después de usar máscaras de bits.
+
+Uso: python benchmarks/bench_disponibilidad.py
+"""
+import os
+import sys
+import timeit
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+REPETICIONES = 100_000
+
+
+def especialidad_para_dia_anterior(especialidades, dias_por_especialidad, dia):
+    # Réplica del algoritmo original: split, recorrido de todas las especialidades
+    # y búsqueda en la lista de días, ejecutando además el bucle de día único
+    if not dia or dia.strip() == "":
+        return []
+    especialidades_encontradas = []
+    dias_lista = [d.strip() for d in dia.split(",")]
+    for dia_individual in dias_lista:
+        for esp_name, dias in zip(especialidades, dias_por_especialidad):
+            if dia_individual.lower() in dias and esp_name not in especialidades_encontradas:
+                especialidades_encontradas.append(esp_name)
+    for esp_name, dias in zip(especialidades, dias_por_especialidad):
+        if dia.lower() in dias and esp_name not in especialidades_encontradas:
+            especialidades_encontradas.append(esp_name)
+    return especialidades_encontradas
+
+
+def main():
+    tipos = [("Cardiología", ["lunes", "miércoles"]), ("Clínica", ["martes", "jueves", "viernes"]),
+             ("Pediatría", ["lunes", "viernes"]), ("Traumatología", ["sábado"])]
+    medico = Medico("M-1", "Dra. Benchmark", [Especialidad(t, d) for t, d in tipos])
+    nombres = [t for t, _ in tipos]
+    dias = [d for _, d in tipos]
+
+    antes = timeit.timeit(lambda: especialidad_para_dia_anterior(nombres, dias, "viernes"), number=REPETICIONES)
+    despues = timeit.timeit(lambda: medico.obtener_especialidad_para_dia("viernes"), number=REPETICIONES)
+    indice = timeit.timeit(lambda: medico.obtener_especialidades_por_indice_dia(4), number=REPETICIONES)
+
+    print(f"{REPETICIONES} consultas con {len(tipos)} especialidades")
+    print(f"  antes (listas de días):          {antes * 1e9 / REPETICIONES:8.0f} ns/consulta")
+    print(f"  después (por nombre de día):     {despues * 1e9 / REPETICIONES:8.0f} ns/consulta")
+    print(f"  después (por número de día):     {indice * 1e9 / REPETICIONES:8.0f} ns/consulta")
+
+
+if __name__ == "__main__":
+    main()
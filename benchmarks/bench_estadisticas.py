@@ -0,0 +1,79 @@
+"""Compara las estadísticas de turnos recorriendo objetos Turno contra las columnas de NumPy.
+
+Requiere NumPy (pip install numpy).
+
+Uso: python benchmarks/bench_estadisticas.py [cantidad_turnos]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+CANTIDAD_PACIENTES = 10_000
+CANTIDAD_MEDICOS = 200
+ESPECIALIDADES = ["Clínica", "Cardiología", "Pediatría", "Dermatología"]
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+
+def crear_clinica(cantidad_turnos, columnar):
+    clinica = Clinica(columnar=columnar)
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        especialidad = Especialidad(ESPECIALIDADES[i % len(ESPECIALIDADES)], TODOS_LOS_DIAS)
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [especialidad]))
+    inicio = datetime(2025, 1, 6, 8, 0)
+    solicitudes = []
+    for i in range(cantidad_turnos):
+        medico = i % CANTIDAD_MEDICOS
+        # 40 turnos de 15 minutos por día (8 a 18 h)
+        numero = i // CANTIDAD_MEDICOS
+        fecha_hora = inicio + timedelta(days=numero // 40, minutes=15 * (numero % 40))
+        solicitudes.append((f"{i % CANTIDAD_PACIENTES:08}", f"M-{medico}",
+                            ESPECIALIDADES[medico % len(ESPECIALIDADES)], fecha_hora))
+    segundos = time.perf_counter()
+    resultados = clinica.agendar_turnos(solicitudes)
+    segundos = time.perf_counter() - segundos
+    assert all(r.fue_agendado() for r in resultados)
+    return clinica, segundos
+
+
+def medir(funcion, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    objetos, agendar_objetos = crear_clinica(cantidad, columnar=False)
+    columnar, agendar_columnar = crear_clinica(cantidad, columnar=True)
+    print(f"{cantidad} turnos; agendar_turnos: {agendar_objetos:.2f} s sin columnas, {agendar_columnar:.2f} s con columnas")
+
+    desde, hasta = datetime(2025, 1, 20), datetime(2025, 2, 20)
+    consultas = [
+        ("contar_turnos (rango de fechas)", lambda c: c.contar_turnos(desde, hasta)),
+        ("contar_turnos_por_medico", lambda c: c.contar_turnos_por_medico()),
+        ("contar_turnos_por_especialidad", lambda c: c.contar_turnos_por_especialidad(desde, hasta)),
+        ("contar_turnos_por_dia", lambda c: c.contar_turnos_por_dia()),
+        ("histograma_ocupacion", lambda c: c.histograma_ocupacion()),
+    ]
+    print(f"{'consulta':<34} {'objetos':>10} {'columnas':>10} {'mejora':>8}")
+    for nombre, consulta in consultas:
+        con_objetos, esperado = medir(lambda: consulta(objetos))
+        con_columnas, obtenido = medir(lambda: consulta(columnar))
+        assert obtenido == esperado, nombre
+        print(f"{nombre:<34} {con_objetos * 1000:>8.1f}ms {con_columnas * 1000:>8.1f}ms {con_objetos / con_columnas:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Mide la exportación de turnos y recetas a CSV y JSONL, con y sin gzip.
+
+Con los datos sintéticos de generador.py (por defecto 2.000.000 de turnos y 1.000.000 de
+recetas) informa filas por segundo y tamaño de cada archivo, el tiempo de exportar un mes de un
+médico y la memoria adicional máxima durante una exportación completa (con tracemalloc, que la
+hace más lenta: se mide aparte), que no depende de la cantidad de filas.
+
+Uso: python benchmarks/bench_exportacion.py [cantidad_turnos]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generador import DatosSinteticos, configuracion_para
+from src.clinica import Clinica
+from src.exportador import Exportador
+
+
+def memoria_adicional(exportar, ruta):
+    """Pico de memoria reservada durante la exportación, además de la que ya usaba la clínica."""
+    tracemalloc.start()
+    resultado = exportar(ruta)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado.obtener_filas(), pico
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    configuracion = configuracion_para(cantidad)
+    configuracion["recetas"] = cantidad // 2
+    segundos = time.perf_counter()
+    clinica = DatosSinteticos(**configuracion).poblar(Clinica())
+    print(f"Clínica con {cantidad} turnos y {configuracion['recetas']} recetas creada en "
+          f"{time.perf_counter() - segundos:.0f} s")
+    exportador = Exportador(clinica)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        print(f"\n{'archivo':<20} {'filas':>10} {'segundos':>9} {'filas/s':>10} {'MB':>8}")
+        for que, exportar in [("turnos", exportador.exportar_turnos), ("recetas", exportador.exportar_recetas)]:
+            for extension in ["csv", "jsonl", "csv.gz", "jsonl.gz"]:
+                nombre = f"{que}.{extension}"
+                resultado = exportar(os.path.join(directorio, nombre))
+                print(f"{nombre:<20} {resultado.obtener_filas():>10} {resultado.obtener_segundos():>9.1f} "
+                      f"{resultado.filas_por_segundo():>10,.0f} {resultado.obtener_bytes() / 1e6:>8.1f}")
+
+        resultado = exportador.exportar_turnos(os.path.join(directorio, "mes.csv"), datetime(2025, 1, 1),
+                                               datetime(2025, 2, 1), matricula="M-7")
+        print(f"\nEnero de M-7: {resultado.obtener_filas()} turnos en {resultado.obtener_segundos() * 1000:.1f} ms")
+
+        for que, exportar in [("turnos", exportador.exportar_turnos), ("recetas", exportador.exportar_recetas)]:
+            filas, pico = memoria_adicional(exportar, os.path.join(directorio, f"memoria_{que}.jsonl.gz"))
+            print(f"Memoria adicional máxima exportando {filas} {que}: {pico / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
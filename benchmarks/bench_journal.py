@@ -0,0 +1,67 @@
+"""Mide el tiempo de reinicio con AlmacenamientoJournal según el largo del journal.
+
+Para cada cantidad de turnos se escribe el journal (un registro por turno) y se mide cuánto
+tarda en abrirse la clínica: reproduciendo todo el journal, y con snapshots periódicos.
+
+Uso: python benchmarks/bench_journal.py [cantidad_maxima_turnos]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.almacenamiento_journal import AlmacenamientoJournal, NOMBRE_JOURNAL
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+CANTIDAD_PACIENTES = 1000
+CANTIDAD_MEDICOS = 50
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+SNAPSHOT_CADA = 5_000
+
+
+def poblar(clinica, cantidad_turnos):
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    inicio = datetime(2025, 1, 6, 8, 0)
+    for i in range(cantidad_turnos):
+        fecha_hora = inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+        clinica.agendar_turno(f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", "Clínica", fecha_hora)
+
+
+def medir_reinicio(cantidad_turnos, snapshot_cada):
+    with tempfile.TemporaryDirectory() as directorio:
+        clinica = Clinica(AlmacenamientoJournal(directorio, snapshot_cada=snapshot_cada))
+        poblar(clinica, cantidad_turnos)
+        clinica.cerrar()
+        with open(os.path.join(directorio, NOMBRE_JOURNAL), "rb") as archivo:
+            registros_en_journal = sum(1 for _ in archivo)
+
+        inicio = time.perf_counter()
+        clinica = Clinica(AlmacenamientoJournal(directorio, snapshot_cada=snapshot_cada))
+        segundos = time.perf_counter() - inicio
+        assert len(clinica.obtener_turnos()) == cantidad_turnos
+        clinica.cerrar()
+    return segundos, registros_en_journal
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 40_000
+    cantidad = 5_000
+    print(f"{'turnos':>8} | {'sin snapshots':>22} | {f'snapshot cada {SNAPSHOT_CADA}':>28}")
+    while cantidad <= maximo:
+        sin_snapshot, _ = medir_reinicio(cantidad, None)
+        con_snapshot, en_journal = medir_reinicio(cantidad, SNAPSHOT_CADA)
+        print(f"{cantidad:>8} | {sin_snapshot:>8.3f} s ({cantidad / sin_snapshot:>7,.0f} reg/s) | "
+              f"{con_snapshot:>8.3f} s ({en_journal:>5} en journal)")
+        cantidad *= 2
+
+
+if __name__ == "__main__":
+    main()
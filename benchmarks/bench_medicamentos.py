@@ -0,0 +1,95 @@
+"""Compara las consultas por medicamento recorriendo todas las historias clínicas contra el índice.
+
+Emite recetas con fechas al azar durante un año y mide:
+- pacientes a los que se les recetó ibuprofeno en un mes
+- los 10 medicamentos más recetados por un médico
+
+Uso: python benchmarks/bench_medicamentos.py [cantidad_recetas]
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.indice_medicamentos import normalizar_medicamento
+
+CANTIDAD_PACIENTES = 10_000
+CANTIDAD_MEDICOS = 200
+DROGAS = ["Ibuprofeno", "Paracetamol", "Amoxicilina", "Omeprazol", "Loratadina", "Enalapril", "Metformina",
+          "Atorvastatina", "Losartán", "Salbutamol", "Diclofenac", "Clonazepam", "Levotiroxina", "Ácido Fólico"]
+PRESENTACIONES = ["", " 100mg", " 400mg", " 500mg", " 600mg"]
+
+
+def crear_clinica(cantidad):
+    azar = random.Random(42)
+    medicamentos = [droga + presentacion for droga in DROGAS for presentacion in PRESENTACIONES]
+    clinica = Clinica()
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}"))
+    solicitudes = [(f"{azar.randrange(CANTIDAD_PACIENTES):08}", f"M-{azar.randrange(CANTIDAD_MEDICOS)}",
+                    azar.sample(medicamentos, azar.randint(1, 3)),
+                    datetime(2024, 1, 1) + timedelta(minutes=azar.randrange(366 * 24 * 60)))
+                   for _ in range(cantidad)]
+    segundos = time.perf_counter()
+    for dni, matricula, recetados, fecha in solicitudes:
+        clinica.emitir_receta(dni, matricula, recetados, fecha)
+    return clinica, time.perf_counter() - segundos
+
+
+def pacientes_recorriendo(clinica, medicamento, desde, hasta):
+    buscado = normalizar_medicamento(medicamento)
+    encontrados = {}
+    for paciente in clinica.obtener_pacientes():
+        for receta in clinica.obtener_historiales_por_dni(paciente.obtener_dni()).obtener_recetas():
+            if desde <= receta.obtener_fecha() < hasta and any(
+                    normalizar_medicamento(m).split(" ")[0] == buscado for m in receta.obtener_medicamentos()):
+                encontrados[paciente.obtener_dni()] = paciente
+    return set(encontrados)
+
+
+def mas_recetados_recorriendo(clinica, matricula, cantidad):
+    conteos = Counter()
+    for paciente in clinica.obtener_pacientes():
+        for receta in clinica.obtener_historiales_por_dni(paciente.obtener_dni()).obtener_recetas():
+            if receta.obtener_medico().obtener_matricula() == matricula:
+                conteos.update({normalizar_medicamento(m) for m in receta.obtener_medicamentos()})
+    return [veces for _, veces in conteos.most_common(cantidad)]
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    clinica, segundos = crear_clinica(cantidad)
+    print(f"{cantidad} recetas emitidas en {segundos:.1f} s ({cantidad / segundos:,.0f} recetas/s, con el índice)")
+
+    desde, hasta = datetime(2024, 6, 1), datetime(2024, 7, 1)
+    recorriendo, esperado = medir(lambda: pacientes_recorriendo(clinica, "Ibuprofeno", desde, hasta))
+    # Las fechas llegaron desordenadas: la primera consulta ordena lo pendiente de cada presentación
+    primera, obtenido = medir(lambda: {p.obtener_dni() for p in clinica.obtener_pacientes_por_medicamento("ibuprofeno", desde, hasta)})
+    con_indice, obtenido = medir(lambda: {p.obtener_dni() for p in clinica.obtener_pacientes_por_medicamento("ibuprofeno", desde, hasta)})
+    assert obtenido == esperado
+    print(f"Pacientes con ibuprofeno en junio ({len(obtenido)}): {recorriendo * 1000:.0f} ms recorriendo, "
+          f"{con_indice * 1000:.1f} ms con el índice ({recorriendo / con_indice:.0f}x; la primera vez {primera * 1000:.0f} ms)")
+
+    recorriendo, esperado = medir(lambda: mas_recetados_recorriendo(clinica, "M-7", 10))
+    con_indice, obtenido = medir(lambda: clinica.obtener_medicamentos_mas_recetados("M-7", 10))
+    assert [veces for _, veces in obtenido] == esperado
+    print(f"10 más recetados por M-7: {recorriendo * 1000:.0f} ms recorriendo, "
+          f"{con_indice * 1000:.3f} ms con el índice ({recorriendo / con_indice:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
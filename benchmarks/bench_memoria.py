@@ -0,0 +1,132 @@
+"""Mide con tracemalloc la memoria de una clínica sintética con muchos turnos y recetas.
+
+Informa los bytes por objeto de cada clase del dominio, cuánto ocupan las especialidades y los
+medicamentos leídos de un archivo con y sin internarlos (src/simbolos.py) y la memoria total de
+la clínica.
+
+Uso: python benchmarks/bench_memoria.py [cantidad_turnos]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.turno import Turno
+from src.receta import Receta
+from src.historiaclinica import HistoriaClinica
+from src.simbolos import SIMBOLOS, internar
+
+CANTIDAD_PACIENTES = 10_000
+CANTIDAD_MEDICOS = 200
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+MUESTRA = 100_000
+ESPECIALIDADES = ["Clínica", "Cardiología", "Pediatría", "Dermatología", "Traumatología", "Oftalmología"]
+MEDICAMENTOS = ["Ibuprofeno 400mg", "Paracetamol 500mg", "Amoxicilina 500mg", "Omeprazol 20mg", "Losartán 50mg"]
+
+
+def bytes_por_objeto(crear):
+    """Memoria promedio de MUESTRA objetos creados con crear(i), sin contar lo que comparten."""
+    gc.collect()
+    tracemalloc.start()
+    objetos = [crear(i) for i in range(MUESTRA)]
+    tamanio = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Se descuenta la lista que los contiene
+    return (tamanio - sys.getsizeof(objetos)) / len(objetos)
+
+
+def medir_objetos():
+    paciente = Paciente("12345678", "Paciente", "01/01/1990")
+    medico = Medico("M-1", "Médico", [Especialidad("Clínica", TODOS_LOS_DIAS)])
+    fecha = datetime(2025, 1, 6, 8, 0)
+    medicamentos = ["Ibuprofeno"]
+    print("Bytes por objeto (solo el objeto, los atributos son compartidos):")
+    print(f"  Paciente:        {bytes_por_objeto(lambda i: Paciente('12345678', 'Paciente', '01/01/1990')):6.0f}")
+    print(f"  Especialidad:    {bytes_por_objeto(lambda i: Especialidad('Clínica', ['lunes'])):6.0f}")
+    print(f"  Turno:           {bytes_por_objeto(lambda i: Turno(paciente, medico, fecha, 'Clínica')):6.0f}")
+    print(f"  Receta:          {bytes_por_objeto(lambda i: Receta(paciente, medico, medicamentos, fecha)):6.0f}  (con su lista de medicamentos)")
+    print(f"  HistoriaClinica: {bytes_por_objeto(lambda i: HistoriaClinica(paciente)):6.0f}  (con sus dos listas vacías)")
+    print(f"  Medico:          {bytes_por_objeto(lambda i: Medico('M-1', 'Médico')):6.0f}  (con su tabla por día)")
+
+
+def medir_textos(cantidad_turnos):
+    """Especialidades de los turnos y medicamentos de las recetas leídos de un archivo, con y sin internar.
+
+    Al leer un archivo (o el almacenamiento) cada campo es un texto nuevo aunque el nombre se
+    repita; sin internar, cada Turno y cada Receta conservaría su propia copia.
+    """
+    cantidad_recetas = cantidad_turnos // 10
+    lineas_turnos = [f"{i % CANTIDAD_PACIENTES:08},M-{i % CANTIDAD_MEDICOS},{ESPECIALIDADES[i % len(ESPECIALIDADES)]}"
+                     for i in range(cantidad_turnos)]
+    lineas_recetas = [f"{i % CANTIDAD_PACIENTES:08},M-{i % CANTIDAD_MEDICOS},"
+                      f"{MEDICAMENTOS[i % len(MEDICAMENTOS)]}; {MEDICAMENTOS[(i + 1) % len(MEDICAMENTOS)]}"
+                      for i in range(cantidad_recetas)]
+    mb = 1024 * 1024
+    print(f"\nEspecialidades de {cantidad_turnos} turnos y medicamentos de {cantidad_recetas} recetas leídos de un archivo:")
+    medidas = {}
+    for nombre, convertir in (("sin internar", str), ("internados", internar)):
+        gc.collect()
+        tracemalloc.start()
+        especialidades = [convertir(linea.split(",")[2]) for linea in lineas_turnos]
+        medicamentos = [[convertir(m) for m in linea.split(",")[2].split("; ")] for linea in lineas_recetas]
+        # Las listas son iguales en los dos casos: solo se comparan los textos
+        medidas[nombre] = (tracemalloc.get_traced_memory()[0] - sys.getsizeof(especialidades)
+                           - sum(map(sys.getsizeof, medicamentos)) - sys.getsizeof(medicamentos))
+        tracemalloc.stop()
+        del especialidades, medicamentos
+        print(f"  {nombre + ':':<14} {medidas[nombre] / mb:8.1f} MB")
+    print(f"  ahorro:        {(medidas['sin internar'] - medidas['internados']) / mb:8.1f} MB "
+          f"({len(SIMBOLOS)} textos distintos en la tabla de símbolos)")
+
+
+def medir_clinica(cantidad_turnos):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    clinica = Clinica()
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    base = tracemalloc.get_traced_memory()[0]
+
+    fecha_inicial = datetime(2025, 1, 6, 8, 0)
+    solicitudes = []
+    for i in range(cantidad_turnos):
+        fecha_hora = fecha_inicial + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+        solicitudes.append((f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", "Clínica", fecha_hora))
+    resultados = clinica.agendar_turnos(solicitudes)
+    del solicitudes, resultados
+    con_turnos = tracemalloc.get_traced_memory()[0]
+
+    for i in range(cantidad_turnos // 10):
+        clinica.emitir_receta(f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", ["Ibuprofeno 400mg"], fecha_inicial)
+    total, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    segundos = time.perf_counter() - inicio
+
+    mb = 1024 * 1024
+    print(f"\nClínica con {CANTIDAD_PACIENTES} pacientes, {CANTIDAD_MEDICOS} médicos, "
+          f"{cantidad_turnos} turnos y {cantidad_turnos // 10} recetas ({segundos:.1f} s):")
+    print(f"  pacientes y médicos: {base / mb:8.1f} MB")
+    print(f"  turnos:              {(con_turnos - base) / mb:8.1f} MB ({(con_turnos - base) / cantidad_turnos:.0f} bytes por turno, con índices)")
+    print(f"  total:               {total / mb:8.1f} MB (pico {pico / mb:.1f} MB)")
+    return clinica
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    medir_objetos()
+    medir_textos(cantidad)
+    medir_clinica(cantidad)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Mide el costo de las métricas en agendar_turno y obtener_historiales_por_dni.
+
+Compara la clínica sin métricas, con métricas activas y después de desactivarlas (que debería
+costar lo mismo que sin métricas: los métodos originales vuelven a su lugar).
+
+Uso: python benchmarks/bench_metricas.py [cantidad_turnos]
+"""
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+CANTIDAD_PACIENTES = 10_000
+CANTIDAD_MEDICOS = 200
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+
+def crear_clinica():
+    clinica = Clinica()
+    for i in range(CANTIDAD_PACIENTES):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    return clinica
+
+
+def medir(clinica, cantidad):
+    # Que la basura de la medición anterior no se recolecte durante esta
+    gc.collect()
+    inicio = datetime(2025, 1, 6, 8, 0)
+    segundos = time.perf_counter()
+    for i in range(cantidad):
+        fecha_hora = inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+        clinica.agendar_turno(f"{i % CANTIDAD_PACIENTES:08}", f"M-{i % CANTIDAD_MEDICOS}", "Clínica", fecha_hora)
+    agendar = (time.perf_counter() - segundos) / cantidad
+    segundos = time.perf_counter()
+    for i in range(cantidad):
+        clinica.obtener_historiales_por_dni(f"{i % CANTIDAD_PACIENTES:08}")
+    historia = (time.perf_counter() - segundos) / cantidad
+    return agendar, historia
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    sin_metricas = medir(crear_clinica(), cantidad)
+    clinica = crear_clinica()
+    metricas = clinica.activar_metricas()
+    con_metricas = medir(clinica, cantidad)
+    clinica = crear_clinica()
+    clinica.activar_metricas()
+    clinica.desactivar_metricas()
+    desactivadas = medir(clinica, cantidad)
+
+    print(f"{cantidad} llamadas de cada operación (µs por llamada)")
+    print(f"{'':<22} {'agendar_turno':>14} {'obtener_historiales':>20}")
+    for nombre, (agendar, historia) in [("sin métricas", sin_metricas), ("con métricas", con_metricas),
+                                        ("métricas desactivadas", desactivadas)]:
+        print(f"{nombre:<22} {agendar * 1e6:>14.2f} {historia * 1e6:>20.2f}")
+    print()
+    print("\n".join(metricas.resumen()))
+
+
+if __name__ == "__main__":
+    main()
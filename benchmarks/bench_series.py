@@ -0,0 +1,107 @@
+"""Compara agendar series de turnos semanales con agendar_serie contra agendar cada turno por separado.
+
+Para N series (por defecto 2.000) de 52 turnos semanales mide el tiempo y la memoria (tracemalloc)
+de un bucle de agendar_turno, de agendar_turnos con todas las fechas en un lote y de
+agendar_serie, que valida todas las fechas pero guarda cada serie como un solo objeto. También
+mide cuánto cuesta después crear los turnos de todas las series (obtener_turnos) y validar un
+turno suelto con las series pendientes.
+
+Uso: python benchmarks/bench_series.py [cantidad_series]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica, TurnoOcupadoException
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+SEMANAS = 52
+CANTIDAD_MEDICOS = 50
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+VALIDACIONES = 20_000
+
+
+def crear_clinica(cantidad_series):
+    clinica = Clinica()
+    for i in range(cantidad_series):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    for i in range(CANTIDAD_MEDICOS):
+        clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+    return clinica
+
+
+def crear_series(cantidad_series):
+    """(dni, matrícula, primera fecha): cada médico tiene sus series en días y horarios distintos."""
+    inicio = datetime(2025, 1, 6, 8, 0)
+    series = []
+    for i in range(cantidad_series):
+        horario = i // CANTIDAD_MEDICOS
+        primera = inicio + timedelta(days=horario % 7, minutes=15 * (horario // 7))
+        series.append((f"{i:08}", f"M-{i % CANTIDAD_MEDICOS}", primera))
+    return series
+
+
+def medir(cantidad_series, agendar):
+    # tracemalloc hace mucho más lento crear objetos: el tiempo y la memoria se miden por separado
+    clinica = crear_clinica(cantidad_series)
+    inicio = time.perf_counter()
+    agendar(clinica)
+    tiempo = time.perf_counter() - inicio
+    clinica = crear_clinica(cantidad_series)
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    agendar(clinica)
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    return clinica, tiempo, memoria
+
+
+def main():
+    cantidad_series = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    series = crear_series(cantidad_series)
+    solicitudes = [(dni, matricula, "Clínica", primera + timedelta(weeks=semana))
+                   for dni, matricula, primera in series for semana in range(SEMANAS)]
+
+    def bucle(clinica):
+        for dni, matricula, especialidad, fecha_hora in solicitudes:
+            clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+
+    def lote(clinica):
+        assert all(r.fue_agendado() for r in clinica.agendar_turnos(solicitudes))
+
+    def con_series(clinica):
+        for dni, matricula, primera in series:
+            assert clinica.agendar_serie(dni, matricula, "Clínica", primera, cantidad=SEMANAS).fue_agendada()
+
+    print(f"{cantidad_series} series de {SEMANAS} turnos semanales ({len(solicitudes)} turnos)")
+    for nombre, agendar in (("bucle de agendar_turno", bucle), ("agendar_turnos", lote), ("agendar_serie", con_series)):
+        clinica, tiempo, memoria = medir(cantidad_series, agendar)
+        print(f"  {nombre:<23} {tiempo:7.3f} s  {memoria / 1e6:7.1f} MB")
+
+    # Validar turnos sueltos contra las series pendientes: la mitad chocan
+    pruebas = [(dni, matricula, "Clínica", primera + timedelta(weeks=i % SEMANAS, minutes=(i % 2) * 5))
+               for i, (dni, matricula, primera) in zip(range(VALIDACIONES), series * (VALIDACIONES // len(series) + 1))]
+    inicio = time.perf_counter()
+    ocupados = 0
+    for prueba in pruebas:
+        try:
+            clinica.validar_turno(*prueba)
+        except TurnoOcupadoException:
+            ocupados += 1
+    validar = time.perf_counter() - inicio
+    print(f"  validar_turno con las series pendientes: {validar / len(pruebas) * 1e6:.2f} µs por turno ({ocupados} ocupados)")
+
+    inicio = time.perf_counter()
+    total = len(clinica.obtener_turnos())
+    print(f"  crear los {total} turnos de las series al pedirlos todos: {time.perf_counter() - inicio:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
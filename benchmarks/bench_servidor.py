@@ -0,0 +1,108 @@
+"""Generador de carga para el servidor: muchos clientes concurrentes agendando turnos.
+
+Levanta el servidor en otro proceso (python src/CLI.py servidor --puerto 0), o usa uno que ya
+esté corriendo si se indica su puerto. Cada cliente abre su conexión y manda solicitudes de a
+una (9 de cada 10 agendan un turno y la otra consulta una página de historia). Informa
+solicitudes por segundo y la latencia p50 y p99 de cada cantidad de clientes.
+
+Uso: python benchmarks/bench_servidor.py [cantidad_solicitudes] [puerto]
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.servidor import HOST, ClienteClinica
+
+CANTIDAD_PACIENTES = 1000
+CANTIDAD_MEDICOS = 50
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+CLIENTES = [1, 16, 64, 256]
+
+
+def iniciar_servidor():
+    """Levanta el servidor en otro proceso y devuelve (proceso, puerto)."""
+    cli = os.path.join(os.path.dirname(__file__), "..", "src", "CLI.py")
+    proceso = subprocess.Popen([sys.executable, cli, "servidor", "--puerto", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    # La primera línea es "Escuchando en host:puerto"
+    linea = proceso.stdout.readline()
+    return proceso, int(linea.rsplit(":", 1)[1])
+
+
+async def cargar_datos(puerto, prefijo):
+    cliente = await ClienteClinica.conectar(HOST, puerto)
+    for i in range(CANTIDAD_PACIENTES):
+        respuesta = await cliente.pedir("agregar_paciente", dni=f"{prefijo}{i:08}", nombre=f"Paciente {i}",
+                                        fecha_nacimiento="01/01/1990")
+        assert respuesta["ok"], respuesta
+    for i in range(CANTIDAD_MEDICOS):
+        respuesta = await cliente.pedir("agregar_medico", matricula=f"{prefijo}M-{i}", nombre=f"Médico {i}",
+                                        especialidades=[{"especialidad": "Clínica", "dias": TODOS_LOS_DIAS}])
+        assert respuesta["ok"], respuesta
+    await cliente.cerrar()
+
+
+def crear_solicitud(i, prefijo, inicio):
+    paciente = f"{prefijo}{i % CANTIDAD_PACIENTES:08}"
+    if i % 10 == 9:
+        return "historia", {"dni": paciente, "por_pagina": 20}
+    fecha_hora = inicio + timedelta(minutes=15 * (i // CANTIDAD_MEDICOS))
+    return "agendar_turno", {"dni": paciente, "matricula": f"{prefijo}M-{i % CANTIDAD_MEDICOS}",
+                             "especialidad": "Clínica", "fecha_hora": fecha_hora.isoformat()}
+
+
+async def medir(puerto, cantidad, clientes, prefijo, inicio):
+    solicitudes = [crear_solicitud(i, prefijo, inicio) for i in range(cantidad)]
+    conexiones = [await ClienteClinica.conectar(HOST, puerto) for _ in range(clientes)]
+    latencias = []
+
+    async def trabajo(cliente, parte):
+        for operacion, datos in parte:
+            enviada = time.perf_counter()
+            respuesta = await cliente.pedir(operacion, **datos)
+            latencias.append(time.perf_counter() - enviada)
+            assert respuesta["ok"], respuesta
+
+    segundos = time.perf_counter()
+    await asyncio.gather(*(trabajo(cliente, solicitudes[n::clientes]) for n, cliente in enumerate(conexiones)))
+    segundos = time.perf_counter() - segundos
+    for cliente in conexiones:
+        await cliente.cerrar()
+    latencias.sort()
+    return cantidad / segundos, latencias[len(latencias) // 2], latencias[int(len(latencias) * 0.99)]
+
+
+async def ejecutar(puerto, cantidad):
+    # Prefijo propio para no chocar con datos que ya tenga un servidor existente
+    prefijo = f"b{int(time.time())}-"
+    await cargar_datos(puerto, prefijo)
+    print(f"{cantidad} solicitudes por medición (90% agendar_turno, 10% historia)")
+    print(f"{'clientes':>8} | {'solicitudes/s':>13} | {'p50':>9} | {'p99':>9}")
+    for numero, clientes in enumerate(CLIENTES):
+        # Cada medición usa otro año, así los turnos no chocan con los de la anterior
+        inicio = datetime(2030 + numero, 1, 6, 8, 0)
+        por_segundo, p50, p99 = await medir(puerto, cantidad, clientes, prefijo, inicio)
+        print(f"{clientes:>8} | {por_segundo:>13,.0f} | {p50 * 1000:>7.2f}ms | {p99 * 1000:>7.2f}ms")
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    proceso = None
+    if len(sys.argv) > 2:
+        puerto = int(sys.argv[2])
+    else:
+        proceso, puerto = iniciar_servidor()
+    try:
+        asyncio.run(ejecutar(puerto, cantidad))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+
+if __name__ == "__main__":
+    main()
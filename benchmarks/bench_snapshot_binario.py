@@ -0,0 +1,75 @@
+"""Mide abrir un snapshot binario y la primera búsqueda de una historia según el tamaño de la clínica.
+
+Para 10^4 turnos hasta la cantidad indicada (por defecto 1.000.000) genera los datos sintéticos
+de generador.py, escribe el snapshot y mide: cuánto tarda en abrirse la clínica con
+AlmacenamientoBinario, la primera obtener_historiales_por_dni (trae al paciente del archivo) y las
+siguientes de otros pacientes, contra traer todo a memoria (lo que haría un formato que se lee
+entero al abrir). Buscar no debería crecer con la cantidad de historias, y abrir solo crece con la
+de médicos (se cargan al abrir; generador.py usa más médicos para más turnos).
+
+Uso: python benchmarks/bench_snapshot_binario.py [cantidad_maxima_turnos]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generador import DatosSinteticos, configuracion_para
+from src.clinica import Clinica
+from src.almacenamiento_binario import AlmacenamientoBinario, escribir_snapshot_binario
+
+APERTURAS = 20
+BUSQUEDAS = 200
+
+
+def medir(ruta, dnis):
+    aperturas, primeras, siguientes = [], [], []
+    azar = random.Random(7)
+    for _ in range(APERTURAS):
+        inicio = time.perf_counter()
+        clinica = Clinica(AlmacenamientoBinario(ruta))
+        aperturas.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        clinica.obtener_historiales_por_dni(azar.choice(dnis))
+        primeras.append(time.perf_counter() - inicio)
+        for dni in azar.sample(dnis, BUSQUEDAS // APERTURAS):
+            inicio = time.perf_counter()
+            clinica.obtener_historiales_por_dni(dni)
+            siguientes.append(time.perf_counter() - inicio)
+        clinica.cerrar()
+    clinica = Clinica(AlmacenamientoBinario(ruta))
+    inicio = time.perf_counter()
+    clinica.precargar()
+    todo = time.perf_counter() - inicio
+    clinica.cerrar()
+    return statistics.median(aperturas), statistics.median(primeras), statistics.median(siguientes), todo
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{'turnos':>9} {'médicos':>7} {'pacientes':>9} {'archivo':>9} {'escribir':>9} | {'abrir':>9} {'1.ª historia':>12} "
+          f"{'siguientes':>10} | {'traer todo':>10}")
+    cantidad = 10_000
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "clinica.bin")
+        while cantidad <= maximo:
+            configuracion = configuracion_para(cantidad)
+            datos = DatosSinteticos(**configuracion)
+            clinica = datos.poblar(Clinica())
+            inicio = time.perf_counter()
+            tamanio = escribir_snapshot_binario(clinica, ruta)
+            escribir = time.perf_counter() - inicio
+            dnis = [p.obtener_dni() for p in datos.obtener_pacientes()]
+            del clinica, datos
+            abrir, primera, siguiente, todo = medir(ruta, dnis)
+            print(f"{cantidad:>9} {configuracion['medicos']:>7} {len(dnis):>9} {tamanio / 1e6:>7.1f}MB {escribir:>8.2f}s | {abrir * 1e3:>7.2f}ms "
+                  f"{primera * 1e3:>10.3f}ms {siguiente * 1e3:>8.3f}ms | {todo:>9.2f}s")
+            cantidad *= 10
+
+
+if __name__ == "__main__":
+    main()
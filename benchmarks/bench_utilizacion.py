@@ -0,0 +1,52 @@
+"""Mide el reporte de utilización calculado en este proceso contra un pool de 1, 2, 4 y 8 procesos.
+
+Con los datos sintéticos de generador.py (por defecto 2.000.000 de turnos de 15 minutos)
+calcula el reporte de todo el año, verifica que todas las variantes den lo mismo y muestra la
+aceleración respecto de calcularlo en serie. La aceleración depende de los núcleos de la
+máquina: con más procesos que núcleos solo se agrega el costo de repartir el trabajo.
+
+Uso: python benchmarks/bench_utilizacion.py [cantidad_turnos]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generador import DatosSinteticos, configuracion_para, DURACION_TURNO
+from src.clinica import Clinica
+from src.reportes import reporte_utilizacion
+
+DESDE = datetime(2025, 1, 1)
+HASTA = datetime(2026, 1, 1)
+REPETICIONES = 3
+
+
+def medir(clinica, procesos):
+    mejor = None
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        reporte = reporte_utilizacion(clinica, DESDE, HASTA, DURACION_TURNO, procesos)
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor, reporte.obtener_por_medico()
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    configuracion = configuracion_para(cantidad)
+    configuracion["recetas"] = 0
+    clinica = DatosSinteticos(**configuracion).poblar(Clinica())
+    print(f"{cantidad} turnos de {configuracion['medicos']} médicos, {os.cpu_count()} núcleos")
+
+    en_serie, esperado = medir(clinica, 1)
+    print(f"{'en serie':<12} {en_serie:>8.2f} s")
+    for procesos in [2, 4, 8]:
+        segundos, obtenido = medir(clinica, procesos)
+        assert obtenido == esperado
+        print(f"{procesos:>2} procesos  {segundos:>8.2f} s  {en_serie / segundos:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Datos sintéticos reproducibles para los benchmarks: pacientes, médicos, turnos y recetas.
+
+Con la misma semilla se generan siempre los mismos datos, así las mediciones de distintos
+commits son comparables. Todas las solicitudes de turno son válidas (el médico atiende esa
+especialidad ese día y ni el médico ni el paciente tienen otro turno a esa hora).
+"""
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad, DIAS_SEMANA
+
+# Lunes: los turnos se reparten desde esta semana en adelante
+INICIO = datetime(2025, 1, 6)
+# 40 turnos de 15 minutos por día, de 8 a 18 h
+TURNOS_POR_DIA = 40
+DURACION_TURNO = timedelta(minutes=15)
+MEDICAMENTOS = ["Ibuprofeno 400mg", "Paracetamol 500mg", "Amoxicilina 500mg", "Omeprazol 20mg",
+                "Loratadina 10mg", "Enalapril 10mg", "Metformina 850mg", "Atorvastatina 20mg"]
+
+
+def configuracion_para(cantidad_turnos: int) -> Dict[str, int]:
+    """Cantidades de cada entidad para una escala dada (la cantidad de turnos)."""
+    return {
+        "medicos": max(10, cantidad_turnos // 1000),
+        "especialidades": 20,
+        "pacientes": max(100, cantidad_turnos // 10),
+        "turnos": cantidad_turnos,
+        "recetas": cantidad_turnos // 10,
+    }
+
+
+class DatosSinteticos:
+
+    def __init__(self, medicos: int, especialidades: int, pacientes: int, turnos: int, recetas: int, semilla: int = 42):
+        azar = random.Random(semilla)
+        nombres_especialidad = [f"Especialidad {i}" for i in range(especialidades)]
+        self.__pacientes__: List[Paciente] = [
+            Paciente(f"{i:08}", f"Paciente {i}", f"{azar.randint(1, 28):02}/{azar.randint(1, 12):02}/{azar.randint(1940, 2020)}")
+            for i in range(pacientes)]
+        self.__medicos__: List[Medico] = []
+        # Por médico: sus días de atención y, para cada día, una especialidad que atiende ese día
+        horarios: List[List[Tuple[int, str]]] = []
+        for i in range(medicos):
+            dias = sorted(azar.sample(range(7), azar.randint(2, 5)))
+            elegidas = azar.sample(nombres_especialidad, min(len(nombres_especialidad), azar.randint(1, 2)))
+            # Cada especialidad atiende en una parte de los días del médico
+            especialidades_medico = [Especialidad(nombre, [DIAS_SEMANA[d] for d in dias[n::len(elegidas)]])
+                                     for n, nombre in enumerate(elegidas)]
+            self.__medicos__.append(Medico(f"M-{i}", f"Médico {i}", especialidades_medico))
+            horarios.append([(d, elegidas[n % len(elegidas)]) for n, d in enumerate(dias)])
+        self.__solicitudes_turnos__ = self._generar_turnos(turnos, horarios)
+        self.__solicitudes_recetas__ = [
+            (self.__pacientes__[azar.randrange(pacientes)].obtener_dni(), f"M-{azar.randrange(medicos)}",
+             azar.sample(MEDICAMENTOS, azar.randint(1, 3)), INICIO + timedelta(minutes=azar.randrange(525_600)))
+            for _ in range(recetas)]
+
+    def _generar_turnos(self, cantidad: int, horarios: List[List[Tuple[int, str]]]) -> List[Tuple[str, str, str, datetime]]:
+        # El turno i es del médico i % M y ocupa el siguiente horario libre de su agenda
+        medicos = len(horarios)
+        pacientes = len(self.__pacientes__)
+        ocupados = set()
+        solicitudes = []
+        for i in range(cantidad):
+            medico, numero = i % medicos, i // medicos
+            dia, especialidad = self._dia_de_atencion(horarios[medico], numero // TURNOS_POR_DIA)
+            fecha_hora = dia + timedelta(hours=8) + DURACION_TURNO * (numero % TURNOS_POR_DIA)
+            # Si el paciente ya tiene un turno a esa hora (con otro médico), se usa el siguiente
+            paciente = i % pacientes
+            while (paciente, fecha_hora) in ocupados:
+                paciente = (paciente + 1) % pacientes
+            ocupados.add((paciente, fecha_hora))
+            solicitudes.append((self.__pacientes__[paciente].obtener_dni(), f"M-{medico}", especialidad, fecha_hora))
+        return solicitudes
+
+    @staticmethod
+    def _dia_de_atencion(horario: List[Tuple[int, str]], numero: int) -> Tuple[datetime, str]:
+        """Fecha del día de atención número `numero` de un médico y la especialidad de ese día."""
+        semana, posicion = divmod(numero, len(horario))
+        dia_semana, especialidad = horario[posicion]
+        return INICIO + timedelta(days=7 * semana + dia_semana), especialidad
+
+    def obtener_pacientes(self) -> List[Paciente]:
+        return self.__pacientes__
+
+    def obtener_medicos(self) -> List[Medico]:
+        return self.__medicos__
+
+    def obtener_solicitudes_turnos(self) -> List[Tuple[str, str, str, datetime]]:
+        """(dni, matricula, especialidad, fecha_hora) de cada turno, en orden de generación."""
+        return self.__solicitudes_turnos__
+
+    def obtener_solicitudes_recetas(self) -> List[Tuple[str, str, List[str], datetime]]:
+        """(dni, matricula, medicamentos, fecha) de cada receta."""
+        return self.__solicitudes_recetas__
+
+    def poblar(self, clinica: Clinica) -> Clinica:
+        """Registra todos los datos en la clínica (sin medir nada)."""
+        for paciente in self.__pacientes__:
+            clinica.agregar_paciente(paciente)
+        for medico in self.__medicos__:
+            clinica.agregar_medico(medico)
+        for dni, matricula, especialidad, fecha_hora in self.__solicitudes_turnos__:
+            clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+        for dni, matricula, medicamentos, fecha in self.__solicitudes_recetas__:
+            clinica.emitir_receta(dni, matricula, medicamentos, fecha)
+        return clinica
@@ -0,0 +1,206 @@
+"""Suite de benchmarks de las operaciones principales de la clínica, de 10^3 a 10^6 turnos.
+
+Para cada escala genera datos sintéticos (benchmarks/generador.py, siempre los mismos) y mide:
+agregar pacientes y médicos, agendar_turno, emitir_receta, obtener_historiales_por_dni,
+Medico.obtener_especialidad_para_dia y los listados. También mide con tracemalloc la memoria
+de la clínica cargada. Los resultados se guardan en JSON junto con el commit, para comparar
+dos corridas:
+
+Uso: python benchmarks/suite.py [--escalas 1000 10000 ...] [--salida resultados.json] [--sin-memoria]
+     python benchmarks/suite.py --comparar base.json nuevo.json [--umbral 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clinica import Clinica
+from src.especialidad import DIAS_SEMANA
+from generador import DatosSinteticos, configuracion_para
+
+ESCALAS = [1_000, 10_000, 100_000, 1_000_000]
+# Las consultas se repiten sobre una muestra de este tamaño (o menos, si la escala es chica)
+MUESTRA = 10_000
+REPETICIONES = 5
+# Como en timeit, las consultas rápidas se repiten hasta que cada medición dure al menos esto
+TIEMPO_MINIMO = 0.1
+
+
+def obtener_commit():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        return salida.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def medir_una_vez(funcion, veces=1):
+    inicio = time.perf_counter()
+    for _ in range(veces):
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def medir_mejor(funcion, repeticiones=REPETICIONES):
+    """Mejor tiempo por ejecución de varias repeticiones; solo para operaciones que no modifican la clínica."""
+    gc.collect()
+    veces = 1
+    while medir_una_vez(funcion, veces) < TIEMPO_MINIMO:
+        veces *= 2
+    return min(medir_una_vez(funcion, veces) for _ in range(repeticiones)) / veces
+
+
+def resultado(operacion, escala, llamadas, segundos):
+    return {"operacion": operacion, "escala": escala, "llamadas": llamadas, "segundos": segundos,
+            "por_segundo": llamadas / segundos if segundos > 0 else None,
+            "us_por_llamada": segundos / llamadas * 1e6 if llamadas else None}
+
+
+def medir_escala(escala):
+    datos = DatosSinteticos(**configuracion_para(escala))
+    pacientes, medicos = datos.obtener_pacientes(), datos.obtener_medicos()
+    turnos, recetas = datos.obtener_solicitudes_turnos(), datos.obtener_solicitudes_recetas()
+    clinica = Clinica()
+    resultados = []
+
+    def cargar():
+        for paciente in pacientes:
+            clinica.agregar_paciente(paciente)
+        for medico in medicos:
+            clinica.agregar_medico(medico)
+    gc.collect()
+    resultados.append(resultado("agregar_paciente_y_medico", escala, len(pacientes) + len(medicos), medir_una_vez(cargar)))
+
+    def agendar():
+        agendar_turno = clinica.agendar_turno
+        for dni, matricula, especialidad, fecha_hora in turnos:
+            agendar_turno(dni, matricula, especialidad, fecha_hora)
+    resultados.append(resultado("agendar_turno", escala, len(turnos), medir_una_vez(agendar)))
+
+    def emitir():
+        emitir_receta = clinica.emitir_receta
+        for dni, matricula, medicamentos, fecha in recetas:
+            emitir_receta(dni, matricula, medicamentos, fecha)
+    resultados.append(resultado("emitir_receta", escala, len(recetas), medir_una_vez(emitir)))
+
+    # Consultas sobre una muestra fija de pacientes y médicos
+    dnis = [pacientes[i * len(pacientes) // MUESTRA].obtener_dni() for i in range(min(MUESTRA, len(pacientes)))]
+    muestra_medicos = [medicos[i % len(medicos)] for i in range(min(MUESTRA, escala))]
+    matriculas = [m.obtener_matricula() for m in muestra_medicos]
+    consultas = [
+        ("obtener_historiales_por_dni", len(dnis),
+         lambda: [clinica.obtener_historiales_por_dni(dni) for dni in dnis]),
+        ("historia_renderizar_pagina", len(dnis),
+         lambda: [list(clinica.obtener_historiales_por_dni(dni).renderizar(por_pagina=20)) for dni in dnis]),
+        ("obtener_especialidad_para_dia", len(muestra_medicos) * 7,
+         lambda: [m.obtener_especialidad_para_dia(dia) for m in muestra_medicos for dia in DIAS_SEMANA]),
+        ("obtener_medicos_por_especialidad_y_dia", 7 * 20,
+         lambda: [clinica.obtener_medicos_por_especialidad_y_dia(f"Especialidad {e}", dia)
+                  for e in range(20) for dia in DIAS_SEMANA]),
+        ("obtener_turnos_de_medico_semana", len(matriculas),
+         lambda: [clinica.obtener_turnos_de_medico(mat, datetime(2025, 1, 13), datetime(2025, 1, 20)) for mat in matriculas]),
+        ("obtener_pacientes", 1, clinica.obtener_pacientes),
+        ("obtener_medicos", 1, clinica.obtener_medicos),
+        ("obtener_turnos", 1, clinica.obtener_turnos),
+        ("iterar_turnos_pagina_20", 100,
+         lambda: [list(clinica.iterar_turnos(offset=n * escala // 100, limite=20)) for n in range(100)]),
+        ("iterar_pacientes_pagina_20", 100,
+         lambda: [list(clinica.iterar_pacientes(offset=n * len(pacientes) // 100, limite=20)) for n in range(100)]),
+    ]
+    for operacion, llamadas, consulta in consultas:
+        resultados.append(resultado(operacion, escala, llamadas, medir_mejor(consulta)))
+    return resultados
+
+
+def medir_memoria(escala):
+    """Bytes que ocupa una clínica cargada con los datos de la escala (sin contar los datos de entrada)."""
+    datos = DatosSinteticos(**configuracion_para(escala))
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    clinica = datos.poblar(Clinica())
+    despues, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Los objetos Paciente y Medico ya existían antes de medir; se cuentan índices, turnos y recetas
+    total = despues - antes
+    del clinica
+    return {"escala": escala, "bytes": total, "bytes_pico": pico - antes, "bytes_por_turno": total / escala}
+
+
+def correr(escalas, salida, con_memoria):
+    informe = {
+        "metadatos": {"fecha": datetime.now().isoformat(timespec="seconds"), "commit": obtener_commit(),
+                      "python": platform.python_version(), "plataforma": platform.platform(),
+                      "escalas": escalas},
+        "resultados": [],
+        "memoria": [],
+    }
+    print(f"{'operación':<40} {'escala':>9} {'llamadas':>9} {'µs/llamada':>11} {'por segundo':>12}")
+    for escala in escalas:
+        for fila in medir_escala(escala):
+            informe["resultados"].append(fila)
+            print(f"{fila['operacion']:<40} {escala:>9} {fila['llamadas']:>9} {fila['us_por_llamada']:>11.2f} {fila['por_segundo']:>12,.0f}")
+        if con_memoria:
+            memoria = medir_memoria(escala)
+            informe["memoria"].append(memoria)
+            print(f"{'memoria de la clínica':<40} {escala:>9} {memoria['bytes'] / 1024 / 1024:>17.1f} MB "
+                  f"({memoria['bytes_por_turno']:.0f} bytes por turno)")
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {salida}")
+
+
+def comparar(ruta_base, ruta_nueva, umbral):
+    """Imprime la relación de tiempos entre dos corridas; devuelve 1 si alguna operación empeoró más que el umbral."""
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(ruta_nueva, encoding="utf-8") as archivo:
+        nueva = json.load(archivo)
+    anteriores = {(r["operacion"], r["escala"]): r for r in base["resultados"]}
+    print(f"{base['metadatos']['commit']} -> {nueva['metadatos']['commit']} (tiempo nuevo / tiempo base)")
+    regresiones = 0
+    for fila in nueva["resultados"]:
+        anterior = anteriores.get((fila["operacion"], fila["escala"]))
+        if anterior is None or not anterior["us_por_llamada"]:
+            continue
+        relacion = fila["us_por_llamada"] / anterior["us_por_llamada"]
+        marca = ""
+        if relacion > 1 + umbral:
+            marca = "  REGRESIÓN"
+            regresiones += 1
+        elif relacion < 1 - umbral:
+            marca = "  mejora"
+        print(f"{fila['operacion']:<40} {fila['escala']:>9} {relacion:>7.2f}x{marca}")
+    memoria_base = {m["escala"]: m for m in base.get("memoria", [])}
+    for memoria in nueva.get("memoria", []):
+        anterior = memoria_base.get(memoria["escala"])
+        if anterior and anterior["bytes"]:
+            print(f"{'memoria de la clínica':<40} {memoria['escala']:>9} {memoria['bytes'] / anterior['bytes']:>7.2f}x")
+    print(f"{regresiones} operaciones más de {umbral:.0%} más lentas")
+    return 1 if regresiones else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de la clínica")
+    parser.add_argument("--escalas", type=int, nargs="+", default=ESCALAS, help="Cantidades de turnos a medir")
+    parser.add_argument("--salida", default="resultados_suite.json", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir la memoria (es la parte más lenta)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"), help="Comparar dos archivos de resultados")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="Diferencia que se marca como regresión (0.25 = 25%%; por debajo suele ser ruido)")
+    args = parser.parse_args()
+    if args.comparar:
+        sys.exit(comparar(args.comparar[0], args.comparar[1], args.umbral))
+    correr(args.escalas, args.salida, not args.sin_memoria)
+
+
+if __name__ == "__main__":
+    main()
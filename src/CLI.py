@@ -1,5 +1,8 @@
+import argparse
+import asyncio
 import os
 import sys
+import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.clinica import (
@@ -7,12 +10,20 @@ from src.clinica import (
     PacienteNoEncontradoException, 
     MedicoNoDisponibleException, 
     TurnoOcupadoException, 
+    TurnoNoEncontradoException,
     RecetaInvalidaException
 )
 from src.paciente import Paciente
 from src.medico import Medico
 from src.especialidad import Especialidad
-from datetime import datetime
+from src.importador import Importador, parsear_fecha
+from src.exportador import Exportador
+from src.reportes import reporte_utilizacion
+from src.almacenamiento_sqlite import AlmacenamientoSQLite
+from src.almacenamiento_journal import AlmacenamientoJournal
+from src.almacenamiento_binario import AlmacenamientoBinario, escribir_snapshot_binario
+from src.servidor import HOST, PUERTO, servir
+from datetime import datetime, timedelta
 
 
 def limpiar_pantalla():
@@ -21,9 +32,41 @@ def limpiar_pantalla():
 def pausar():
     input("\nPresione ENTER para continuar...")
 
+def leer_fecha_opcional(mensaje):
+    texto = input(mensaje).strip()
+    if not texto:
+        return None
+    try:
+        return datetime.strptime(texto, "%d/%m/%Y")
+    except ValueError:
+        raise ValueError("Formato de fecha inválido. Usá el formato dd/mm/aaaa.")
+
+# Cantidad de líneas que se muestran antes de preguntar si seguir
+POR_PAGINA = 20
+
+def mostrar_paginas(lineas, por_pagina=POR_PAGINA):
+    """Imprime las líneas de a por_pagina, preguntando antes de seguir. Devuelve cuántas imprimió.
+
+    Las líneas se consumen de a una, así que puede recibir un generador sin cargar todo en memoria.
+    """
+    lineas = iter(lineas)
+    impresas = 0
+    siguiente = next(lineas, None)
+    while siguiente is not None:
+        print(siguiente)
+        impresas += 1
+        siguiente = next(lineas, None)
+        if siguiente is not None and impresas % por_pagina == 0:
+            respuesta = input(f"-- {impresas} mostrados. ENTER para ver más, 'q' para terminar: ")
+            if respuesta.strip().lower() == "q":
+                break
+    return impresas
+
 class CLI:
-    def __init__(self):
-        self.clinica = Clinica()
+    def __init__(self, clinica=None, archivo_metricas=None):
+        self.clinica = clinica if clinica is not None else Clinica()
+        # Archivo donde se exportan las métricas (formato de Prometheus)
+        self.archivo_metricas = archivo_metricas
 
     def mostrar_menu(self):
         print("\n" + "="*40)
@@ -38,6 +81,14 @@ class CLI:
         print("7) Ver todos los turnos")
         print("8) Ver todos los pacientes")
         print("9) Ver todos los médicos")
+        print("10) Buscar médicos por especialidad y día")
+        print("11) Buscar próximo turno disponible")
+        print("12) Ver métricas de operaciones")
+        print("13) Buscar recetas por medicamento")
+        print("14) Medicamentos más recetados")
+        print("15) Buscar paciente por nombre")
+        print("16) Agendar turnos recurrentes")
+        print("17) Cancelar o reprogramar turno")
         print("0) Salir")
         print("="*40)
 
@@ -65,6 +116,22 @@ class CLI:
                     self.ver_pacientes()
                 elif opc == "9":
                     self.ver_medicos()
+                elif opc == "10":
+                    self.buscar_medicos()
+                elif opc == "11":
+                    self.buscar_proximo_turno()
+                elif opc == "12":
+                    self.ver_metricas()
+                elif opc == "13":
+                    self.buscar_recetas_por_medicamento()
+                elif opc == "14":
+                    self.ver_medicamentos_mas_recetados()
+                elif opc == "15":
+                    self.buscar_paciente_por_nombre()
+                elif opc == "16":
+                    self.agendar_serie()
+                elif opc == "17":
+                    self.cancelar_o_reprogramar_turno()
                 elif opc == "0":
                     print("¡Hasta luego! Muchas gracias por usar el sistema.")
                     break
@@ -74,6 +141,7 @@ class CLI:
                     PacienteNoEncontradoException,
                     MedicoNoDisponibleException,
                     TurnoOcupadoException,
+                    TurnoNoEncontradoException,
                     RecetaInvalidaException) as e:
                 print(f"Error: {e}")
             pausar()
@@ -103,7 +171,7 @@ class CLI:
         mat = input("Matrícula del médico: ").strip()
         medico = self.clinica.obtener_medico_por_matricula(mat)
         tipo = input("Tipo de especialidad: ").strip()
-        dias = [d.strip() for d in input("Días (separados por coma): ").split(",")]
+        dias = [d.strip() for d in input("Días (separados por coma): ").split(",") if d.strip()]
         esp = Especialidad(tipo, dias)
         medico.agregar_especialidad(esp)
         print("Especialidad agregada.")
@@ -124,6 +192,56 @@ class CLI:
         self.clinica.agendar_turno(dni, mat, esp,dt)
         print("Turno agendado.")
 
+    def agendar_serie(self):
+        dni = input("DNI paciente: ").strip()
+        mat = input("Matrícula médico: ").strip()
+        fecha = input("Primera fecha (dd/mm/aaaa): ").strip()
+        hora = input("Hora (HH:MM): ").strip()
+        try:
+            dt = datetime.strptime(f"{fecha} {hora}", "%d/%m/%Y %H:%M")
+        except ValueError:
+            print("Fecha u hora inválida. Usá el formato dd/mm/aaaa y HH:MM.")
+            return
+        esp = input("Especialidad: ").strip()
+        semanas = input("Cada cuántas semanas (ENTER para 1, 2 para quincenal): ").strip()
+        fin = input("Cantidad de turnos o fecha final (dd/mm/aaaa): ").strip()
+        if "/" in fin:
+            hasta = datetime.strptime(fin, "%d/%m/%Y").date()
+            resultado = self.clinica.agendar_serie(dni, mat, esp, dt, hasta=hasta, cada_semanas=int(semanas or 1))
+        else:
+            resultado = self.clinica.agendar_serie(dni, mat, esp, dt, cantidad=int(fin), cada_semanas=int(semanas or 1))
+        if resultado.fue_agendada():
+            print(resultado.obtener_serie())
+            return
+        print("No se agendó la serie: estas fechas ya están ocupadas.")
+        for fecha_hora, error in resultado.obtener_conflictos():
+            print(f"{fecha_hora:%d/%m/%Y %H:%M}: {error}")
+
+    def cancelar_o_reprogramar_turno(self):
+        mat = input("Matrícula médico: ").strip()
+        fecha = input("Fecha del turno (dd/mm/aaaa): ").strip()
+        hora = input("Hora del turno (HH:MM): ").strip()
+        try:
+            dt = datetime.strptime(f"{fecha} {hora}", "%d/%m/%Y %H:%M")
+        except ValueError:
+            print("Fecha u hora inválida. Usá el formato dd/mm/aaaa y HH:MM.")
+            return
+        turno = self.clinica.buscar_turno(mat, dt)
+        print(turno)
+        nueva = input("Nueva fecha y hora (dd/mm/aaaa HH:MM, ENTER para cancelar el turno): ").strip()
+        if not nueva:
+            if input("¿Cancelar el turno? (s/n): ").strip().lower() == "s":
+                self.clinica.cancelar_turno(turno.obtener_id())
+                print("Turno cancelado.")
+            return
+        try:
+            nueva_dt = datetime.strptime(nueva, "%d/%m/%Y %H:%M")
+        except ValueError:
+            print("Fecha u hora inválida. Usá el formato dd/mm/aaaa HH:MM.")
+            return
+        self.clinica.reprogramar_turno(turno.obtener_id(), nueva_dt)
+        print("Turno reprogramado.")
+
     def emitir_receta(self):
         dni = input("DNI paciente: ").strip()
         mat = input("Matrícula médico: ").strip()
@@ -134,31 +252,236 @@ class CLI:
     def ver_historia(self):
         dni = input("DNI paciente: ").strip()
         historia = self.clinica.obtener_historiales_por_dni(dni)
-        print(historia)
+        desde = leer_fecha_opcional("Desde (dd/mm/aaaa, ENTER sin límite): ")
+        hasta = leer_fecha_opcional("Hasta (dd/mm/aaaa, ENTER sin límite): ")
+        if hasta is not None:
+            hasta += timedelta(days=1)
+        print(historia.obtener_paciente())
+        # De lo más reciente a lo más antiguo; cada línea se arma recién cuando se va a mostrar
+        if mostrar_paginas(historia.renderizar(desde, hasta)) == 0:
+            print("No hay turnos ni recetas registrados.")
 
     def ver_turnos(self):
-        turnos = self.clinica.obtener_turnos()
-        if not turnos:
+        mat = input("Matrícula del médico (ENTER para ver todos): ").strip()
+        desde = leer_fecha_opcional("Desde (dd/mm/aaaa, ENTER sin límite): ")
+        hasta = leer_fecha_opcional("Hasta (dd/mm/aaaa, ENTER sin límite): ")
+        if hasta is not None:
+            hasta += timedelta(days=1)
+        turnos = self.clinica.iterar_turnos(desde=desde, hasta=hasta, matricula=mat or None)
+        if mostrar_paginas(map(str, turnos)) == 0:
             print("No hay turnos agendados.")
-        else:
-            for t in turnos:
-                print(t)
 
     def ver_pacientes(self):
-        pacientes = self.clinica.obtener_pacientes()
-        if not pacientes:
+        if mostrar_paginas(map(str, self.clinica.iterar_pacientes())) == 0:
             print("No hay pacientes registrados.")
-        else:
-            for p in pacientes:
-                print(p)
 
     def ver_medicos(self):
-        medicos = self.clinica.obtener_medicos()
-        if not medicos:
+        esp = input("Especialidad (ENTER para ver todas): ").strip()
+        if mostrar_paginas(map(str, self.clinica.iterar_medicos(especialidad=esp or None))) == 0:
             print("No hay médicos registrados.")
+
+    def buscar_medicos(self):
+        esp = input("Especialidad: ").strip()
+        dia = input("Día: ").strip()
+        medicos = self.clinica.obtener_medicos_por_especialidad_y_dia(esp, dia)
+        if not medicos:
+            print("No hay médicos que atiendan esa especialidad ese día.")
         else:
             for m in medicos:
                 print(m)
 
+    def buscar_proximo_turno(self):
+        esp = input("Especialidad: ").strip()
+        desde = leer_fecha_opcional("Desde (dd/mm/aaaa, ENTER para ahora): ") or datetime.now()
+        minutos = input("Duración en minutos (ENTER para 30): ").strip()
+        cantidad = input("Cantidad de turnos a mostrar (ENTER para 5): ").strip()
+        duracion = timedelta(minutes=int(minutos) if minutos else 30)
+        turnos = self.clinica.buscar_proximo_turno(esp, desde, duracion, int(cantidad) if cantidad else 5)
+        if not turnos:
+            print("No hay turnos disponibles para esa especialidad.")
+        else:
+            for fecha_hora, medico in turnos:
+                print(f"{fecha_hora.strftime('%d/%m/%Y %H:%M')} - {medico}")
+
+    def buscar_recetas_por_medicamento(self):
+        medicamento = input("Medicamento: ").strip()
+        desde = leer_fecha_opcional("Desde (dd/mm/aaaa, ENTER sin límite): ")
+        hasta = leer_fecha_opcional("Hasta (dd/mm/aaaa, ENTER sin límite): ")
+        if hasta is not None:
+            hasta += timedelta(days=1)
+        recetas = self.clinica.obtener_recetas_por_medicamento(medicamento, desde, hasta)
+        pacientes = {r.obtener_paciente().obtener_dni() for r in recetas}
+        print(f"{len(recetas)} recetas para {len(pacientes)} pacientes.")
+        lineas = (f"{r.obtener_fecha().strftime('%d/%m/%Y %H:%M')} - {r.obtener_paciente().obtener_nombre()} "
+                  f"(DNI: {r.obtener_paciente().obtener_dni()}) - {r.obtener_medico().obtener_nombre()}: "
+                  f"{', '.join(r.obtener_medicamentos())}" for r in reversed(recetas))
+        if mostrar_paginas(lineas) == 0:
+            print("No hay recetas con ese medicamento.")
+
+    def ver_medicamentos_mas_recetados(self):
+        mat = input("Matrícula del médico (ENTER para toda la clínica): ").strip()
+        cantidad = input("Cantidad a mostrar (ENTER para 10): ").strip()
+        ranking = self.clinica.obtener_medicamentos_mas_recetados(mat or None, int(cantidad) if cantidad else 10)
+        if not ranking:
+            print("No hay recetas emitidas.")
+        for posicion, (medicamento, veces) in enumerate(ranking, start=1):
+            print(f"{posicion}. {medicamento}: {veces} recetas")
+
+    def buscar_paciente_por_nombre(self):
+        texto = input("Nombre o comienzo del nombre (p. ej. 'mar gar'): ").strip()
+        cantidad = input("Cantidad a mostrar (ENTER para 10): ").strip()
+        cantidad = int(cantidad) if cantidad else 10
+        pacientes = self.clinica.buscar_pacientes_por_nombre(texto, cantidad)
+        if pacientes:
+            for p in pacientes:
+                print(p)
+            return
+        # Sin coincidencias exactas: puede haber un error de tipeo
+        aproximados = self.clinica.buscar_pacientes_aproximado(texto, cantidad)
+        if not aproximados:
+            print("No se encontraron pacientes con ese nombre.")
+            return
+        print("Sin coincidencias exactas; resultados aproximados:")
+        for p, errores in aproximados:
+            print(f"{p} ({errores} {'error' if errores == 1 else 'errores'})")
+
+    def ver_metricas(self):
+        metricas = self.clinica.obtener_metricas()
+        if metricas is None:
+            if input("Las métricas no están activas. ¿Activarlas? (s/n): ").strip().lower() == "s":
+                self.clinica.activar_metricas()
+                print("Métricas activadas: se miden las operaciones desde ahora.")
+            return
+        lineas = metricas.resumen()
+        if mostrar_paginas(lineas) == 0:
+            print("Todavía no se midió ninguna operación.")
+        ruta = input(f"Exportar en formato Prometheus a (ENTER para {self.archivo_metricas or 'no exportar'}): ").strip()
+        ruta = ruta or self.archivo_metricas
+        if ruta:
+            metricas.guardar(ruta)
+            print(f"Métricas guardadas en {ruta}.")
+
+    def importar(self, pacientes=None, medicos=None, especialidades=None):
+        importador = Importador(self.clinica)
+        # Los médicos van antes que sus especialidades
+        cargas = [(pacientes, importador.importar_pacientes),
+                  (medicos, importador.importar_medicos),
+                  (especialidades, importador.importar_especialidades)]
+        for ruta, importar in cargas:
+            if ruta:
+                resultado = importar(ruta)
+                print(resultado)
+                for linea, mensaje in resultado.obtener_errores()[:10]:
+                    print(f"  línea {linea}: {mensaje}")
+                if resultado.obtener_cantidad_errores() > 10:
+                    print(f"  ... y {resultado.obtener_cantidad_errores() - 10} errores más")
+
+    def exportar(self, que, ruta, desde=None, hasta=None, matricula=None, especialidad=None):
+        """Exporta turnos o recetas; desde y hasta son fechas dd/mm/aaaa o aaaa-mm-dd, ambas incluidas."""
+        exportador = Exportador(self.clinica)
+        try:
+            desde = parsear_fecha(desde) if desde else None
+            hasta = parsear_fecha(hasta) + timedelta(days=1) if hasta else None
+            if que == "turnos":
+                resultado = exportador.exportar_turnos(ruta, desde, hasta, matricula, especialidad)
+            elif especialidad:
+                raise ValueError("Las recetas no se filtran por especialidad")
+            else:
+                resultado = exportador.exportar_recetas(ruta, desde, hasta, matricula)
+        except (ValueError, MedicoNoDisponibleException) as e:
+            print(f"Error: {e}")
+            return None
+        print(resultado)
+        return resultado
+
+    def escribir_snapshot(self, ruta):
+        """Escribe todos los datos de la clínica en un snapshot binario (para abrir con --binario)."""
+        inicio = time.perf_counter()
+        tamanio = escribir_snapshot_binario(self.clinica, ruta)
+        print(f"{ruta}: {tamanio / 1e6:.1f} MB escritos en {time.perf_counter() - inicio:.2f} s")
+        return tamanio
+
+    def reporte_utilizacion(self, desde, hasta, duracion=30, procesos=None):
+        """Imprime horas reservadas contra disponibles por mes; desde y hasta son fechas incluidas."""
+        try:
+            desde = parsear_fecha(desde)
+            hasta = parsear_fecha(hasta) + timedelta(days=1)
+            inicio = time.perf_counter()
+            reporte = reporte_utilizacion(self.clinica, desde, hasta, timedelta(minutes=duracion), procesos)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return None
+        segundos = time.perf_counter() - inicio
+        for linea in reporte.lineas():
+            print(linea)
+        procesos_usados = reporte.obtener_procesos()
+        print(f"\nCalculado en {segundos:.2f} s con {procesos_usados} proceso{'s' if procesos_usados > 1 else ''}")
+        return reporte
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de gestión de clínica. Sin subcomando abre el menú interactivo.")
+    almacenamiento = parser.add_mutually_exclusive_group()
+    almacenamiento.add_argument("--db", help="Archivo SQLite donde se guardan los datos (sin esta opción se pierden al salir)")
+    almacenamiento.add_argument("--journal", help="Carpeta donde se guardan los datos como journal con snapshots")
+    almacenamiento.add_argument("--binario", help="Snapshot binario a abrir (solo lectura: lo que se agregue se pierde al salir)")
+    parser.add_argument("--metricas", metavar="ARCHIVO",
+                        help="Medir las operaciones y exportar las métricas (formato de Prometheus) a este archivo al salir")
+    subcomandos = parser.add_subparsers(dest="comando")
+    importar = subcomandos.add_parser("importar", help="Carga masiva de datos desde archivos CSV o JSONL")
+    importar.add_argument("--pacientes", help="Archivo con columnas dni, nombre, fecha_nacimiento")
+    importar.add_argument("--medicos", help="Archivo con columnas matricula, nombre")
+    importar.add_argument("--especialidades", help="Archivo con columnas matricula, especialidad, dias")
+    exportar = subcomandos.add_parser("exportar", help="Exporta turnos o recetas a CSV o JSONL (con .gz se comprime)")
+    exportar.add_argument("que", choices=["turnos", "recetas"])
+    exportar.add_argument("archivo", help="Archivo de salida: .csv, .jsonl, .csv.gz o .jsonl.gz")
+    exportar.add_argument("--desde", help="Primer día incluido (dd/mm/aaaa o aaaa-mm-dd)")
+    exportar.add_argument("--hasta", help="Último día incluido (dd/mm/aaaa o aaaa-mm-dd)")
+    exportar.add_argument("--matricula", help="Solo los de este médico")
+    exportar.add_argument("--especialidad", help="Solo los turnos de esta especialidad")
+    utilizacion = subcomandos.add_parser("utilizacion", help="Horas reservadas contra disponibles por mes, médico y especialidad")
+    utilizacion.add_argument("--desde", required=True, help="Primer día incluido (dd/mm/aaaa o aaaa-mm-dd)")
+    utilizacion.add_argument("--hasta", required=True, help="Último día incluido (dd/mm/aaaa o aaaa-mm-dd)")
+    utilizacion.add_argument("--duracion", type=int, default=30, help="Minutos de cada turno (por defecto 30)")
+    utilizacion.add_argument("--procesos", type=int, help="Procesos para calcular (por defecto uno por núcleo; 1 lo calcula sin procesos extra)")
+    snapshot = subcomandos.add_parser("snapshot", help="Escribe todos los datos en un snapshot binario (se abre con --binario)")
+    snapshot.add_argument("archivo", help="Archivo de salida")
+    servidor = subcomandos.add_parser("servidor", help="Atiende clientes por TCP (un objeto JSON por línea)")
+    servidor.add_argument("--host", default=HOST, help=f"Dirección donde escuchar (por defecto {HOST})")
+    servidor.add_argument("--puerto", type=int, default=PUERTO, help=f"Puerto donde escuchar (por defecto {PUERTO}; 0 elige uno libre)")
+    servidor.add_argument("--hilos", type=int, help="Hilos para atender las operaciones de la clínica")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        clinica = Clinica(AlmacenamientoSQLite(args.db))
+    elif args.journal:
+        clinica = Clinica(AlmacenamientoJournal(args.journal))
+    elif args.binario:
+        clinica = Clinica(AlmacenamientoBinario(args.binario))
+    else:
+        clinica = Clinica()
+    if args.metricas:
+        clinica.activar_metricas()
+    cli = CLI(clinica, args.metricas)
+    try:
+        if args.comando == "importar":
+            cli.importar(args.pacientes, args.medicos, args.especialidades)
+        elif args.comando == "utilizacion":
+            cli.reporte_utilizacion(args.desde, args.hasta, args.duracion, args.procesos)
+        elif args.comando == "exportar":
+            cli.exportar(args.que, args.archivo, args.desde, args.hasta, args.matricula, args.especialidad)
+        elif args.comando == "snapshot":
+            cli.escribir_snapshot(args.archivo)
+        elif args.comando == "servidor":
+            try:
+                asyncio.run(servir(clinica, args.host, args.puerto, args.hilos))
+            except KeyboardInterrupt:
+                pass
+        else:
+            cli.ejecutar()
+    finally:
+        if args.metricas:
+            clinica.obtener_metricas().guardar(args.metricas)
+        clinica.cerrar()
+
 if __name__ == "__main__":
-    CLI().ejecutar()
\ No newline at end of file
+    main()
\ No newline at end of file
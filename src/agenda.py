@@ -0,0 +1,182 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.turno import Turno
+
+# Turnos por bloque al armar la agenda; un bloque se parte en dos al llegar al doble
+CAPACIDAD_BLOQUE = 512
+
+class Agenda:
+    """Calendario de un médico: turnos ordenados por fecha y hora.
+
+    Los turnos están en bloques ordenados (listas paralelas de fechas y turnos) de hasta
+    2 * CAPACIDAD_BLOQUE elementos, y __maximos__ tiene la última fecha de cada bloque. Agregar
+    o quitar un turno busca el bloque y la posición con bisect y solo corre los elementos de ese
+    bloque: el costo no crece con la cantidad de turnos del médico, como sí pasaría insertando
+    o borrando en una única lista.
+    """
+
+    def __init__(self):
+        self.__fechas__: List[List[datetime]] = []
+        self.__turnos__: List[List[Turno]] = []
+        self.__maximos__: List[datetime] = []
+        self.__cantidad__ = 0
+
+    def agregar_turno(self, turno: Turno):
+        fecha_hora = turno.obtener_fecha_hora()
+        maximos = self.__maximos__
+        if not maximos:
+            self.__fechas__.append([fecha_hora])
+            self.__turnos__.append([turno])
+            maximos.append(fecha_hora)
+            self.__cantidad__ = 1
+            return
+        # Primer bloque cuya última fecha es mayor; si no hay, va al final del último
+        bloque = min(bisect_right(maximos, fecha_hora), len(maximos) - 1)
+        fechas = self.__fechas__[bloque]
+        posicion = bisect_right(fechas, fecha_hora)
+        fechas.insert(posicion, fecha_hora)
+        self.__turnos__[bloque].insert(posicion, turno)
+        maximos[bloque] = fechas[-1]
+        self.__cantidad__ += 1
+        if len(fechas) > 2 * CAPACIDAD_BLOQUE:
+            self._partir(bloque)
+
+    def _partir(self, bloque: int):
+        fechas = self.__fechas__[bloque]
+        turnos = self.__turnos__[bloque]
+        mitad = len(fechas) // 2
+        self.__fechas__[bloque:bloque + 1] = [fechas[:mitad], fechas[mitad:]]
+        self.__turnos__[bloque:bloque + 1] = [turnos[:mitad], turnos[mitad:]]
+        self.__maximos__[bloque:bloque + 1] = [fechas[mitad - 1], fechas[-1]]
+
+    def agregar_turnos(self, turnos: List[Turno]):
+        """Agrega muchos turnos de una vez.
+
+        Con la agenda vacía, o con un lote al menos tan grande como ella, se ordena todo junto y se
+        arman los bloques de nuevo. Si no, el lote ordenado se reparte entre los bloques donde cae
+        y solo esos bloques se mezclan: el costo depende del lote y de los bloques que toca, no de
+        la cantidad de turnos del médico.
+        """
+        if not turnos:
+            return
+        # sorted es estable: con la misma fecha, los turnos quedan en el orden en que llegaron
+        nuevos = sorted(zip([t.obtener_fecha_hora() for t in turnos], turnos), key=itemgetter(0))
+        if len(turnos) >= self.__cantidad__:
+            fechas = [fecha_hora for bloque in self.__fechas__ for fecha_hora in bloque]
+            actuales = [turno for bloque in self.__turnos__ for turno in bloque]
+            # Los actuales van primero: con la misma fecha, el turno nuevo queda después, como en
+            # agregar_turno. Son dos tramos ordenados, que Timsort mezcla en tiempo lineal
+            combinados = sorted(list(zip(fechas, actuales)) + nuevos, key=itemgetter(0))
+            self._armar_bloques([fecha_hora for fecha_hora, _ in combinados], [turno for _, turno in combinados])
+            return
+        maximos = self.__maximos__
+        ultimo = len(maximos) - 1
+        por_bloque: Dict[int, List[Tuple[datetime, Turno]]] = {}
+        for nuevo in nuevos:
+            por_bloque.setdefault(min(bisect_right(maximos, nuevo[0]), ultimo), []).append(nuevo)
+        # De atrás hacia adelante: partir un bloque no corre la posición de los anteriores
+        for bloque in reversed(list(por_bloque)):
+            self._mezclar(bloque, por_bloque[bloque])
+        self.__cantidad__ += len(turnos)
+
+    def _mezclar(self, bloque: int, nuevos: List[Tuple[datetime, Turno]]):
+        """Mezcla en el bloque turnos nuevos ya ordenados y lo parte en bloques de CAPACIDAD_BLOQUE si se pasa del doble."""
+        fechas = self.__fechas__[bloque]
+        turnos = self.__turnos__[bloque]
+        if len(nuevos) < 8:
+            for fecha_hora, turno in nuevos:
+                posicion = bisect_right(fechas, fecha_hora)
+                fechas.insert(posicion, fecha_hora)
+                turnos.insert(posicion, turno)
+        else:
+            combinados = sorted(list(zip(fechas, turnos)) + nuevos, key=itemgetter(0))
+            fechas = [fecha_hora for fecha_hora, _ in combinados]
+            turnos = [turno for _, turno in combinados]
+        if len(fechas) <= 2 * CAPACIDAD_BLOQUE:
+            self.__fechas__[bloque] = fechas
+            self.__turnos__[bloque] = turnos
+            self.__maximos__[bloque] = fechas[-1]
+            return
+        partes = range(0, len(fechas), CAPACIDAD_BLOQUE)
+        self.__fechas__[bloque:bloque + 1] = [fechas[i:i + CAPACIDAD_BLOQUE] for i in partes]
+        self.__turnos__[bloque:bloque + 1] = [turnos[i:i + CAPACIDAD_BLOQUE] for i in partes]
+        self.__maximos__[bloque:bloque + 1] = [fechas[min(i + CAPACIDAD_BLOQUE, len(fechas)) - 1] for i in partes]
+
+    def _armar_bloques(self, fechas: List[datetime], turnos: List[Turno]):
+        self.__fechas__ = [fechas[i:i + CAPACIDAD_BLOQUE] for i in range(0, len(fechas), CAPACIDAD_BLOQUE)]
+        self.__turnos__ = [turnos[i:i + CAPACIDAD_BLOQUE] for i in range(0, len(turnos), CAPACIDAD_BLOQUE)]
+        self.__maximos__ = [bloque[-1] for bloque in self.__fechas__]
+        self.__cantidad__ = len(fechas)
+
+    def quitar_turno(self, turno: Turno) -> bool:
+        """Quita el turno (el mismo objeto); devuelve False si no estaba."""
+        fecha_hora = turno.obtener_fecha_hora()
+        bloque = bisect_left(self.__maximos__, fecha_hora)
+        # Turnos con la misma fecha pueden seguir en el bloque siguiente
+        while bloque < len(self.__maximos__):
+            fechas = self.__fechas__[bloque]
+            turnos = self.__turnos__[bloque]
+            posicion = bisect_left(fechas, fecha_hora)
+            while posicion < len(fechas) and fechas[posicion] == fecha_hora:
+                if turnos[posicion] is turno:
+                    del fechas[posicion]
+                    del turnos[posicion]
+                    if fechas:
+                        self.__maximos__[bloque] = fechas[-1]
+                    else:
+                        del self.__fechas__[bloque], self.__turnos__[bloque], self.__maximos__[bloque]
+                    self.__cantidad__ -= 1
+                    return True
+                posicion += 1
+            if posicion < len(fechas):
+                return False
+            bloque += 1
+        return False
+
+    def _posicion(self, fecha_hora: datetime, mayor: bool = False) -> Tuple[int, int]:
+        """(bloque, posición) del primer turno con fecha_hora mayor o igual (o solo mayor, con mayor=True)."""
+        buscar = bisect_right if mayor else bisect_left
+        bloque = buscar(self.__maximos__, fecha_hora)
+        if bloque == len(self.__maximos__):
+            return bloque, 0
+        return bloque, buscar(self.__fechas__[bloque], fecha_hora)
+
+    def _tramos(self, desde: Optional[datetime], hasta: Optional[datetime],
+                excluir_desde: bool = False) -> Iterator[Tuple[List[Turno], int, int]]:
+        """(bloque, inicio, fin) de cada porción de bloque con desde <= fecha_hora < hasta, en orden."""
+        inicio = (0, 0) if desde is None else self._posicion(desde, excluir_desde)
+        fin = (len(self.__maximos__), 0) if hasta is None else self._posicion(hasta)
+        if fin <= inicio:
+            return
+        (bloque_inicio, posicion_inicio), (bloque_fin, posicion_fin) = inicio, fin
+        for bloque in range(bloque_inicio, min(bloque_fin + 1, len(self.__turnos__))):
+            turnos = self.__turnos__[bloque]
+            desde_posicion = posicion_inicio if bloque == bloque_inicio else 0
+            hasta_posicion = posicion_fin if bloque == bloque_fin else len(turnos)
+            yield turnos, desde_posicion, hasta_posicion
+
+    def obtener_turnos(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Turno]:
+        """Devuelve los turnos con desde <= fecha_hora < hasta, en orden cronológico."""
+        turnos: List[Turno] = []
+        for bloque, inicio, fin in self._tramos(desde, hasta):
+            turnos += bloque[inicio:fin]
+        return turnos
+
+    def obtener_pagina(self, desde: Optional[datetime], hasta: Optional[datetime], cantidad: int,
+                       excluir_desde: bool = False) -> List[Turno]:
+        """Los primeros `cantidad` turnos de obtener_turnos(desde, hasta); con excluir_desde, solo los posteriores a desde.
+
+        Para recorrer un rango de a páginas, cada página empieza después de la última fecha_hora
+        de la anterior. Solo se copian los turnos de la página.
+        """
+        turnos: List[Turno] = []
+        for bloque, inicio, fin in self._tramos(desde, hasta, excluir_desde):
+            turnos += bloque[inicio:min(fin, inicio + cantidad - len(turnos))]
+            if len(turnos) >= cantidad:
+                break
+        return turnos
+
+    def __len__(self) -> int:
+        return self.__cantidad__
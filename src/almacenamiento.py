@@ -0,0 +1,95 @@
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.turno import Turno
+from src.receta import Receta
+from src.serie_turnos import SerieTurnos
+
+# Contexto vacío que devuelve operacion() cuando el almacenamiento no necesita saber cuándo termina cada cambio
+SIN_OPERACION = nullcontext()
+
+class Almacenamiento:
+    """Almacenamiento en memoria, el que usa Clinica por defecto: no persiste nada.
+
+    Los almacenamientos persistentes redefinen estos métodos. Clinica llama a restaurar() al
+    crearse, a guardar_* después de cada alta, y a cargar_* cuando busca un paciente o los
+    turnos de un médico que todavía no tiene en memoria.
+    """
+
+    def restaurar(self, clinica):
+        """Carga en la clínica los datos que deban estar en memoria desde el inicio."""
+        pass
+
+    def operacion(self):
+        """Contexto que envuelve guardar un cambio y aplicarlo en memoria.
+
+        Clinica lo abre con los cerrojos de la operación ya tomados, y adentro no toma otros
+        cerrojos de médicos ni pacientes. El journal lo usa para escribir snapshots solo cuando
+        no hay cambios guardados sin aplicar.
+        """
+        return SIN_OPERACION
+
+    def guardar_paciente(self, paciente: Paciente):
+        pass
+
+    def guardar_medico(self, medico: Medico):
+        """Guarda el médico junto con las especialidades que ya tenga."""
+        pass
+
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        pass
+
+    def guardar_turno(self, turno: Turno):
+        pass
+
+    def guardar_turnos(self, turnos: List[Turno]):
+        for turno in turnos:
+            self.guardar_turno(turno)
+
+    def guardar_serie(self, serie: SerieTurnos):
+        """Guarda la definición de una serie de turnos recurrentes (primera fecha, frecuencia y cantidad), no sus turnos."""
+        pass
+
+    def guardar_turnos_de_serie(self, serie: SerieTurnos, turnos: List[Turno]):
+        """La clínica creó los turnos de la serie: desde ahora se guardan como turnos sueltos, que se pueden cancelar o reprogramar."""
+        pass
+
+    def cancelar_turno(self, turno: Turno):
+        """Borra un turno guardado (el turno es único por matrícula y fecha_hora)."""
+        pass
+
+    def reprogramar_turno(self, anterior: Turno, nuevo: Turno):
+        """Cambia la fecha_hora de un turno guardado: `nuevo` es el mismo turno en la fecha nueva."""
+        pass
+
+    def guardar_receta(self, receta: Receta):
+        pass
+
+    def cargar_paciente(self, dni: str) -> Optional[Paciente]:
+        return None
+
+    def cargar_turnos_de_paciente(self, dni: str) -> List[Tuple[str, datetime, str]]:
+        """Turnos guardados del paciente como (matrícula, fecha_hora, especialidad)."""
+        return []
+
+    def cargar_recetas_de_paciente(self, dni: str) -> List[Tuple[str, List[str], datetime]]:
+        """Recetas guardadas del paciente como (matrícula, medicamentos, fecha)."""
+        return []
+
+    def cargar_turnos_de_medico(self, matricula: str) -> List[Tuple[str, datetime, str]]:
+        """Turnos guardados del médico como (DNI, fecha_hora, especialidad)."""
+        return []
+
+    def cargar_series(self) -> List[Tuple[str, str, str, datetime, int, int]]:
+        """Series guardadas cuyos turnos todavía no se crearon, como (DNI, matrícula, especialidad, primera, cantidad, cada_semanas)."""
+        return []
+
+    def listar_dnis(self) -> Iterator[str]:
+        """DNI de todos los pacientes guardados."""
+        return iter(())
+
+    def cerrar(self):
+        pass
@@ -0,0 +1,319 @@
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.almacenamiento import Almacenamiento
+from src.almacenamiento_journal import fsync_directorio
+from src.almacenamiento_sqlite import dias_de_mascara
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+MAGIA = b"CLNB"
+VERSION = 1
+
+# Todos los números en little-endian. La cabecera tiene la cantidad de elementos de cada sección;
+# las secciones van una detrás de otra en este orden, así su posición se calcula sin leerlas
+CABECERA = struct.Struct("<4sI8I")
+# matrícula, nombre (índices en la tabla de textos), primera especialidad, cantidad,
+# primera posición en turnos_por_medico, cantidad
+MEDICO = struct.Struct("<6I")
+# tipo (texto), máscara de días
+ESPECIALIDAD = struct.Struct("<2I")
+# dni, nombre, fecha de nacimiento (textos), tipo de fecha, primer turno, cantidad, primera receta, cantidad
+PACIENTE = struct.Struct("<8I")
+# paciente, médico (números de registro), fecha_hora en microsegundos desde EPOCA, especialidad (texto)
+TURNO = struct.Struct("<IIqI")
+# médico, fecha en microsegundos desde EPOCA, primer medicamento, cantidad
+RECETA = struct.Struct("<IqII")
+NUMERO = struct.Struct("<I")
+# Comienzo y fin de un texto dentro del bloque de textos
+POSICION_TEXTO = struct.Struct("<Q")
+
+EPOCA = datetime(1970, 1, 1)
+UN_MICROSEGUNDO = timedelta(microseconds=1)
+
+# Cómo se guardó la fecha de nacimiento (Paciente acepta texto o datetime)
+FECHA_TEXTO, FECHA_DATETIME, FECHA_NINGUNA = 0, 1, 2
+
+def a_microsegundos(fecha: datetime) -> int:
+    return (fecha - EPOCA) // UN_MICROSEGUNDO
+
+def de_microsegundos(microsegundos: int) -> datetime:
+    return EPOCA + timedelta(microseconds=microsegundos)
+
+class TablaDeTextos:
+    """Textos distintos del snapshot, cada uno guardado una sola vez y referido por su número."""
+
+    def __init__(self):
+        self.__numeros__: Dict[str, int] = {}
+
+    def numero(self, texto: str) -> int:
+        numero = self.__numeros__.get(texto)
+        if numero is None:
+            numero = self.__numeros__[texto] = len(self.__numeros__)
+        return numero
+
+    def __len__(self) -> int:
+        return len(self.__numeros__)
+
+    def codificar(self) -> Tuple[bytes, bytes]:
+        """Posiciones (cantidad + 1, la última es el largo total) y bloque con los textos en UTF-8."""
+        codificados = [texto.encode("utf-8") for texto in self.__numeros__]
+        posiciones = bytearray()
+        posicion = 0
+        for codificado in codificados:
+            posiciones += POSICION_TEXTO.pack(posicion)
+            posicion += len(codificado)
+        posiciones += POSICION_TEXTO.pack(posicion)
+        return bytes(posiciones), b"".join(codificados)
+
+def escribir_snapshot_binario(clinica, ruta: str) -> int:
+    """Escribe todos los datos de la clínica en un snapshot binario y devuelve su tamaño en bytes.
+
+    Los turnos y recetas de cada paciente quedan contiguos, así abrir una historia lee un solo
+    tramo del archivo. Se escribe en un archivo temporal que reemplaza al destino al terminar.
+    """
+    textos = TablaDeTextos()
+    medicos, especialidades = bytearray(), bytearray()
+    numero_de_medico: Dict[int, int] = {}
+    lista_medicos = clinica.obtener_medicos()
+    for numero, medico in enumerate(lista_medicos):
+        numero_de_medico[id(medico)] = numero
+    pacientes, turnos, recetas, medicamentos = bytearray(), bytearray(), bytearray(), bytearray()
+    dnis: List[bytes] = []
+    turnos_de_medico: List[List[int]] = [[] for _ in lista_medicos]
+    cantidad_turnos = cantidad_recetas = cantidad_medicamentos = 0
+    for numero_paciente, paciente in enumerate(clinica.obtener_pacientes()):
+        dni = paciente.obtener_dni()
+        historia = clinica.obtener_historiales_por_dni(dni)
+        primer_turno, primera_receta = cantidad_turnos, cantidad_recetas
+        for turno in historia.iterar_turnos():
+            medico = numero_de_medico[id(turno.obtener_medico())]
+            turnos += TURNO.pack(numero_paciente, medico, a_microsegundos(turno.obtener_fecha_hora()),
+                                 textos.numero(turno.obtener_especialidad()))
+            turnos_de_medico[medico].append(cantidad_turnos)
+            cantidad_turnos += 1
+        for receta in historia.obtener_recetas():
+            nombres = receta.obtener_medicamentos()
+            recetas += RECETA.pack(numero_de_medico[id(receta.obtener_medico())], a_microsegundos(receta.obtener_fecha()),
+                                   cantidad_medicamentos, len(nombres))
+            for nombre in nombres:
+                medicamentos += NUMERO.pack(textos.numero(nombre))
+            cantidad_medicamentos += len(nombres)
+            cantidad_recetas += 1
+        fecha = paciente.obtener_fecha_nacimiento()
+        if fecha is None:
+            tipo_fecha, fecha = FECHA_NINGUNA, ""
+        elif isinstance(fecha, datetime):
+            tipo_fecha, fecha = FECHA_DATETIME, fecha.isoformat()
+        else:
+            tipo_fecha = FECHA_TEXTO
+        pacientes += PACIENTE.pack(textos.numero(dni), textos.numero(paciente.obtener_nombre()), textos.numero(fecha),
+                                   tipo_fecha, primer_turno, cantidad_turnos - primer_turno,
+                                   primera_receta, cantidad_recetas - primera_receta)
+        dnis.append(dni.encode("utf-8"))
+    # Índice por DNI: números de paciente ordenados por los bytes del DNI, como compara la búsqueda
+    indice_dni = struct.pack(f"<{len(dnis)}I", *sorted(range(len(dnis)), key=dnis.__getitem__))
+    turnos_por_medico = bytearray()
+    cantidad_especialidades = 0
+    for numero, medico in enumerate(lista_medicos):
+        propias = medico.obtener_especialidades()
+        for especialidad in propias:
+            especialidades += ESPECIALIDAD.pack(textos.numero(especialidad.obtener_especialidad()),
+                                                especialidad.obtener_mascara_dias())
+        medicos += MEDICO.pack(textos.numero(medico.obtener_matricula()), textos.numero(medico.obtener_nombre()),
+                               cantidad_especialidades, len(propias),
+                               len(turnos_por_medico) // NUMERO.size, len(turnos_de_medico[numero]))
+        cantidad_especialidades += len(propias)
+        turnos_por_medico += struct.pack(f"<{len(turnos_de_medico[numero])}I", *turnos_de_medico[numero])
+    posiciones_textos, bloque_textos = textos.codificar()
+    cabecera = CABECERA.pack(MAGIA, VERSION, len(textos), len(lista_medicos), cantidad_especialidades,
+                             len(dnis), cantidad_turnos, cantidad_recetas, cantidad_medicamentos, len(bloque_textos))
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, "wb") as archivo:
+            for seccion in (cabecera, medicos, especialidades, pacientes, indice_dni, turnos, turnos_por_medico,
+                            recetas, medicamentos, posiciones_textos, bloque_textos):
+                archivo.write(seccion)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    fsync_directorio(os.path.dirname(os.path.abspath(ruta)))
+    return os.path.getsize(ruta)
+
+class AlmacenamientoBinario(Almacenamiento):
+    """Abre un snapshot binario (ver escribir_snapshot_binario) con mmap, sin leerlo entero.
+
+    El archivo tiene registros de ancho fijo para médicos, pacientes, turnos y recetas, una tabla
+    con cada texto una sola vez y un índice de pacientes ordenado por DNI. Al abrir solo se leen la
+    cabecera y los médicos, así que el tiempo de apertura no depende de la cantidad de historias;
+    un paciente con sus turnos y recetas se arma cuando la clínica lo pide (búsqueda binaria en el
+    índice y un tramo contiguo de cada sección), y las páginas del archivo las trae el sistema
+    operativo recién al leerlas.
+
+    Es de solo lectura: lo que se agrega a la clínica queda en memoria hasta que se escribe otro
+    snapshot. Las fechas deben ser sin zona horaria.
+    """
+
+    def __init__(self, ruta: str):
+        with open(ruta, "rb") as archivo:
+            try:
+                self.__datos__ = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"El archivo {ruta} está vacío")
+        try:
+            self._leer_cabecera(ruta)
+        except ValueError:
+            self.__datos__.close()
+            raise
+        # Especialidades y medicamentos ya decodificados: son pocos y se repiten en muchos registros.
+        # DNIs, nombres y fechas no se guardan acá, porque si no la caché crecería hasta tener el archivo entero
+        self.__vocabulario__: Dict[int, str] = {}
+        self.__matriculas__: List[str] = []
+        self.__numero_de_matricula__: Dict[str, int] = {}
+        # Último paciente buscado: la clínica pide paciente, turnos y recetas del mismo DNI seguidos
+        self.__ultimo__: Tuple[Optional[str], Optional[tuple]] = (None, None)
+
+    def _leer_cabecera(self, ruta: str):
+        datos = self.__datos__
+        if len(datos) < CABECERA.size:
+            raise ValueError(f"El archivo {ruta} no es un snapshot binario")
+        (magia, version, textos, medicos, especialidades, pacientes,
+         turnos, recetas, medicamentos, largo_textos) = CABECERA.unpack_from(datos, 0)
+        if magia != MAGIA:
+            raise ValueError(f"El archivo {ruta} no es un snapshot binario")
+        if version != VERSION:
+            raise ValueError(f"Versión de snapshot binario no soportada: {version}")
+        self.__cantidad_pacientes__ = pacientes
+        posicion = CABECERA.size
+        self.__inicio_medicos__, posicion = posicion, posicion + medicos * MEDICO.size
+        self.__inicio_especialidades__, posicion = posicion, posicion + especialidades * ESPECIALIDAD.size
+        self.__inicio_pacientes__, posicion = posicion, posicion + pacientes * PACIENTE.size
+        self.__inicio_indice_dni__, posicion = posicion, posicion + pacientes * NUMERO.size
+        self.__inicio_turnos__, posicion = posicion, posicion + turnos * TURNO.size
+        self.__inicio_turnos_por_medico__, posicion = posicion, posicion + turnos * NUMERO.size
+        self.__inicio_recetas__, posicion = posicion, posicion + recetas * RECETA.size
+        self.__inicio_medicamentos__, posicion = posicion, posicion + medicamentos * NUMERO.size
+        self.__inicio_textos__, posicion = posicion, posicion + (textos + 1) * POSICION_TEXTO.size
+        self.__inicio_bloque__ = posicion
+        if len(datos) != posicion + largo_textos:
+            raise ValueError(f"El archivo {ruta} está dañado o incompleto")
+        self.__cantidad_medicos__ = medicos
+
+    def _bytes_texto(self, numero: int) -> bytes:
+        posicion = self.__inicio_textos__ + numero * POSICION_TEXTO.size
+        inicio, fin = struct.unpack_from("<QQ", self.__datos__, posicion)
+        return self.__datos__[self.__inicio_bloque__ + inicio:self.__inicio_bloque__ + fin]
+
+    def _texto(self, numero: int) -> str:
+        return self._bytes_texto(numero).decode("utf-8")
+
+    def _texto_vocabulario(self, numero: int) -> str:
+        """Como _texto, pero guarda el resultado; solo para especialidades y medicamentos."""
+        texto = self.__vocabulario__.get(numero)
+        if texto is None:
+            texto = self.__vocabulario__[numero] = self._texto(numero)
+        return texto
+
+    def restaurar(self, clinica):
+        datos = self.__datos__
+        for numero in range(self.__cantidad_medicos__):
+            matricula, nombre, primera, cantidad, _, _ = MEDICO.unpack_from(datos, self.__inicio_medicos__ + numero * MEDICO.size)
+            especialidades = []
+            for indice in range(primera, primera + cantidad):
+                tipo, mascara = ESPECIALIDAD.unpack_from(datos, self.__inicio_especialidades__ + indice * ESPECIALIDAD.size)
+                especialidades.append(Especialidad(self._texto_vocabulario(tipo), dias_de_mascara(mascara)))
+            medico = Medico(self._texto(matricula), self._texto(nombre), especialidades)
+            self.__matriculas__.append(medico.obtener_matricula())
+            self.__numero_de_matricula__[medico.obtener_matricula()] = numero
+            clinica.agregar_medico(medico)
+
+    def _registro_paciente(self, dni: str) -> Optional[tuple]:
+        """Registro del paciente con ese DNI (búsqueda binaria en el índice por DNI) o None."""
+        ultimo_dni, ultimo_registro = self.__ultimo__
+        if ultimo_dni == dni:
+            return ultimo_registro
+        buscado = dni.encode("utf-8")
+        datos = self.__datos__
+        bajo, alto = 0, self.__cantidad_pacientes__
+        registro = None
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            (numero,) = NUMERO.unpack_from(datos, self.__inicio_indice_dni__ + medio * NUMERO.size)
+            candidato = PACIENTE.unpack_from(datos, self.__inicio_pacientes__ + numero * PACIENTE.size)
+            encontrado = self._bytes_texto(candidato[0])
+            if encontrado < buscado:
+                bajo = medio + 1
+            elif encontrado > buscado:
+                alto = medio
+            else:
+                registro = candidato
+                break
+        self.__ultimo__ = (dni, registro)
+        return registro
+
+    def cargar_paciente(self, dni: str) -> Optional[Paciente]:
+        registro = self._registro_paciente(dni)
+        if registro is None:
+            return None
+        numero_dni, nombre, fecha, tipo_fecha = registro[:4]
+        if tipo_fecha == FECHA_NINGUNA:
+            fecha = None
+        elif tipo_fecha == FECHA_DATETIME:
+            fecha = datetime.fromisoformat(self._texto(fecha))
+        else:
+            fecha = self._texto(fecha)
+        return Paciente(self._texto(numero_dni), self._texto(nombre), fecha)
+
+    def _turnos(self, primero: int, cantidad: int) -> Iterator[Tuple[int, int, int, int]]:
+        inicio = self.__inicio_turnos__ + primero * TURNO.size
+        return TURNO.iter_unpack(self.__datos__[inicio:inicio + cantidad * TURNO.size])
+
+    def cargar_turnos_de_paciente(self, dni: str) -> List[Tuple[str, datetime, str]]:
+        registro = self._registro_paciente(dni)
+        if registro is None:
+            return []
+        matriculas, texto = self.__matriculas__, self._texto_vocabulario
+        return [(matriculas[medico], de_microsegundos(microsegundos), texto(especialidad))
+                for _, medico, microsegundos, especialidad in self._turnos(registro[4], registro[5])]
+
+    def cargar_recetas_de_paciente(self, dni: str) -> List[Tuple[str, List[str], datetime]]:
+        registro = self._registro_paciente(dni)
+        if registro is None:
+            return []
+        primera, cantidad = registro[6], registro[7]
+        inicio = self.__inicio_recetas__ + primera * RECETA.size
+        recetas = []
+        for medico, microsegundos, primer_medicamento, medicamentos in RECETA.iter_unpack(
+                self.__datos__[inicio:inicio + cantidad * RECETA.size]):
+            numeros = struct.unpack_from(f"<{medicamentos}I", self.__datos__,
+                                         self.__inicio_medicamentos__ + primer_medicamento * NUMERO.size)
+            recetas.append((self.__matriculas__[medico], [self._texto_vocabulario(n) for n in numeros], de_microsegundos(microsegundos)))
+        return recetas
+
+    def cargar_turnos_de_medico(self, matricula: str) -> List[Tuple[str, datetime, str]]:
+        numero = self.__numero_de_matricula__.get(matricula)
+        if numero is None:
+            return []
+        datos = self.__datos__
+        primero, cantidad = MEDICO.unpack_from(datos, self.__inicio_medicos__ + numero * MEDICO.size)[4:]
+        turnos = []
+        for numero_turno in struct.unpack_from(f"<{cantidad}I", datos, self.__inicio_turnos_por_medico__ + primero * NUMERO.size):
+            paciente, _, microsegundos, especialidad = TURNO.unpack_from(datos, self.__inicio_turnos__ + numero_turno * TURNO.size)
+            (dni,) = NUMERO.unpack_from(datos, self.__inicio_pacientes__ + paciente * PACIENTE.size)
+            turnos.append((self._texto(dni), de_microsegundos(microsegundos), self._texto_vocabulario(especialidad)))
+        return turnos
+
+    def listar_dnis(self) -> Iterator[str]:
+        for numero in range(self.__cantidad_pacientes__):
+            (dni,) = NUMERO.unpack_from(self.__datos__, self.__inicio_pacientes__ + numero * PACIENTE.size)
+            yield self._texto(dni)
+
+    def cerrar(self):
+        self.__datos__.close()
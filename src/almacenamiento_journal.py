@@ -0,0 +1,345 @@
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from src.almacenamiento import Almacenamiento
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.turno import Turno
+from src.receta import Receta
+from src.serie_turnos import SerieTurnos
+
+NOMBRE_JOURNAL = "journal.log"
+NOMBRE_SNAPSHOT = "snapshot.log"
+
+def codificar_registro(registro: Dict) -> bytes:
+    """Una línea por registro: CRC32 del JSON en hexadecimal, un espacio y el JSON."""
+    datos = json.dumps(registro, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(datos), datos)
+
+def decodificar_registro(linea: bytes) -> Optional[Dict]:
+    """Devuelve el registro, o None si la línea está incompleta o dañada."""
+    if not linea.endswith(b"\n") or len(linea) < 10 or linea[8:9] != b" ":
+        return None
+    datos = linea[9:-1]
+    try:
+        if int(linea[:8], 16) != zlib.crc32(datos):
+            return None
+        return json.loads(datos)
+    except ValueError:
+        return None
+
+def fsync_directorio(directorio: str):
+    # Hace durable el os.replace del snapshot; Windows no permite abrir directorios
+    if hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+def registro_paciente(paciente: Paciente) -> Dict:
+    fecha = paciente.obtener_fecha_nacimiento()
+    es_datetime = isinstance(fecha, datetime)
+    return {"op": "paciente", "dni": paciente.obtener_dni(), "nombre": paciente.obtener_nombre(),
+            "fecha_nacimiento": fecha.isoformat() if es_datetime else fecha, "es_datetime": es_datetime}
+
+def registro_medico(medico: Medico) -> Dict:
+    return {"op": "medico", "matricula": medico.obtener_matricula(), "nombre": medico.obtener_nombre(),
+            "especialidades": [[e.obtener_especialidad(), e.obtener_dias()] for e in medico.obtener_especialidades()]}
+
+def registro_turnos(turnos: List[Turno]) -> Dict:
+    return {"op": "turnos", "turnos": [[t.obtener_paciente().obtener_dni(), t.obtener_medico().obtener_matricula(),
+                                        t.obtener_fecha_hora().isoformat(), t.obtener_especialidad()] for t in turnos]}
+
+def registro_serie(serie: SerieTurnos) -> Dict:
+    return {"op": "serie", "dni": serie.obtener_paciente().obtener_dni(), "matricula": serie.obtener_medico().obtener_matricula(),
+            "especialidad": serie.obtener_especialidad(), "primera": serie.obtener_primera().isoformat(),
+            "cantidad": len(serie), "cada_semanas": serie.obtener_cada_semanas()}
+
+def registro_receta(receta: Receta) -> Dict:
+    return {"op": "receta", "dni": receta.obtener_paciente().obtener_dni(),
+            "matricula": receta.obtener_medico().obtener_matricula(),
+            "medicamentos": receta.obtener_medicamentos(), "fecha": receta.obtener_fecha().isoformat()}
+
+class OperacionJournal:
+    """Contexto que devuelve AlmacenamientoJournal.operacion(): cuenta los cambios en curso."""
+    __slots__ = ("__journal__",)
+
+    def __init__(self, journal: "AlmacenamientoJournal"):
+        self.__journal__ = journal
+
+    def __enter__(self):
+        self.__journal__._empezar_operacion()
+
+    def __exit__(self, *excepcion):
+        self.__journal__._terminar_operacion()
+
+class AlmacenamientoJournal(Almacenamiento):
+    """Persistencia con un journal de solo agregado más snapshots periódicos.
+
+    Cada alta se agrega al journal como una línea con CRC; el fsync se hace cada `fsync_cada`
+    registros o, como mucho, `intervalo_fsync` segundos después del primer registro sin
+    sincronizar (un temporizador lo hace aunque no llegue otro registro), y al cerrar. Así cada
+    operación solo paga una escritura al buffer. Cada `snapshot_cada` registros se escribe un snapshot compacto del
+    estado completo y se vacía el journal, por lo que al reiniciar solo se reproduce la cola.
+    Una línea final incompleta o dañada (p. ej. por una caída a mitad de escritura) se descarta.
+    Las escrituras toman el cerrojo del almacenamiento, así se puede usar desde varios hilos.
+
+    Una serie se guarda como un registro con su definición y al recuperar vuelve a quedar
+    pendiente. Crear sus turnos no se registra: al reproducir una cancelación o
+    reprogramación, buscar_turno los vuelve a crear. El snapshot guarda las series pendientes
+    como series y las que ya tienen sus turnos creados como turnos.
+
+    Un registro se escribe antes de que la clínica aplique el cambio en memoria. Para que el
+    snapshot no marque como incluido un registro que todavía no se aplicó, se escribe cuando no
+    hay ninguna operación en curso (ver operacion()): las que empiezan mientras hay uno pendiente
+    esperan a que se escriba.
+    """
+
+    def __init__(self, directorio: str, fsync_cada: int = 100, intervalo_fsync: float = 0.1,
+                 snapshot_cada: Optional[int] = 10_000):
+        os.makedirs(directorio, exist_ok=True)
+        self.__directorio__ = directorio
+        self.__ruta_journal__ = os.path.join(directorio, NOMBRE_JOURNAL)
+        self.__ruta_snapshot__ = os.path.join(directorio, NOMBRE_SNAPSHOT)
+        self.__fsync_cada__ = fsync_cada
+        self.__intervalo_fsync__ = intervalo_fsync
+        self.__snapshot_cada__ = snapshot_cada
+        self.__clinica__ = None
+        self.__archivo__ = None
+        # Número del último registro escrito; el snapshot guarda hasta cuál incluye
+        self.__secuencia__ = 0
+        self.__registros_en_journal__ = 0
+        self.__sin_fsync__ = 0
+        self.__ultimo_fsync__ = time.monotonic()
+        # Temporizador que sincroniza los registros pendientes si no llega otro antes de intervalo_fsync
+        self.__temporizador__: Optional[threading.Timer] = None
+        self.__snapshot_pendiente__ = False
+        self.__cerrojo__ = threading.RLock()
+        # Operaciones de la clínica entre guardar un cambio y terminar de aplicarlo en memoria
+        self.__en_curso__ = 0
+        self.__sin_operaciones__ = threading.Condition(self.__cerrojo__)
+        # Profundidad de operaciones anidadas de cada hilo (una operación puede llamar a otra)
+        self.__hilo__ = threading.local()
+        self.__operacion__ = OperacionJournal(self)
+
+    def restaurar(self, clinica):
+        self.__clinica__ = clinica
+        incluidos = 0
+        for registro in self._leer(self.__ruta_snapshot__, truncar=False):
+            if registro["op"] == "snapshot":
+                incluidos = registro["secuencia"]
+            else:
+                self._aplicar(registro)
+        self.__secuencia__ = incluidos
+        for registro in self._leer(self.__ruta_journal__, truncar=True):
+            # Si hubo una caída entre escribir el snapshot y vaciar el journal, lo ya incluido se saltea
+            if registro["n"] > incluidos:
+                self._aplicar(registro)
+                self.__secuencia__ = registro["n"]
+                self.__registros_en_journal__ += 1
+        # Con el journal todo queda en memoria: así la clínica no vuelve a pedir pacientes al almacenamiento
+        clinica.obtener_pacientes()
+        self.__archivo__ = open(self.__ruta_journal__, "ab")
+
+    def _leer(self, ruta: str, truncar: bool) -> Iterator[Dict]:
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, "r+b") as archivo:
+            posicion = 0
+            for linea in archivo:
+                registro = decodificar_registro(linea)
+                if registro is None:
+                    if not truncar:
+                        raise ValueError(f"El archivo {ruta} está dañado")
+                    # Registro cortado a mitad: se descarta junto con lo que le siga
+                    archivo.truncate(posicion)
+                    return
+                posicion += len(linea)
+                yield registro
+
+    def _aplicar(self, registro: Dict):
+        clinica = self.__clinica__
+        op = registro["op"]
+        if op == "paciente":
+            fecha = registro["fecha_nacimiento"]
+            if registro["es_datetime"]:
+                fecha = datetime.fromisoformat(fecha)
+            clinica.agregar_paciente(Paciente(registro["dni"], registro["nombre"], fecha))
+        elif op == "medico":
+            especialidades = [Especialidad(tipo, dias) for tipo, dias in registro["especialidades"]]
+            clinica.agregar_medico(Medico(registro["matricula"], registro["nombre"], especialidades))
+        elif op == "especialidad":
+            clinica.agregar_especialidad_a_medico(registro["matricula"], Especialidad(registro["tipo"], registro["dias"]))
+        elif op == "turnos":
+            solicitudes = [(dni, matricula, especialidad, datetime.fromisoformat(fecha_hora))
+                           for dni, matricula, fecha_hora, especialidad in registro["turnos"]]
+            for resultado in clinica.agendar_turnos(solicitudes):
+                if resultado.obtener_error() is not None:
+                    raise resultado.obtener_error()
+        elif op == "serie":
+            resultado = clinica.agendar_serie(registro["dni"], registro["matricula"], registro["especialidad"],
+                                              datetime.fromisoformat(registro["primera"]), cantidad=registro["cantidad"],
+                                              cada_semanas=registro["cada_semanas"])
+            if not resultado.fue_agendada():
+                raise resultado.obtener_conflictos()[0][1]
+        elif op in ("cancelar", "reprogramar"):
+            turno = clinica.buscar_turno(registro["matricula"], datetime.fromisoformat(registro["fecha_hora"]))
+            if op == "cancelar":
+                clinica.cancelar_turno(turno.obtener_id())
+            else:
+                clinica.reprogramar_turno(turno.obtener_id(), datetime.fromisoformat(registro["nueva_fecha_hora"]))
+        elif op == "receta":
+            clinica.emitir_receta(registro["dni"], registro["matricula"], registro["medicamentos"],
+                                  datetime.fromisoformat(registro["fecha"]))
+        else:
+            raise ValueError(f"Registro desconocido en el journal: {op}")
+
+    def _agregar(self, registro: Dict):
+        with self.__cerrojo__:
+            self._agregar_registro(registro)
+
+    def operacion(self) -> OperacionJournal:
+        return self.__operacion__
+
+    def _empezar_operacion(self):
+        hilo = self.__hilo__
+        profundidad = getattr(hilo, "profundidad", 0)
+        if not profundidad:
+            with self.__sin_operaciones__:
+                self._escribir_snapshot_pendiente()
+                self.__en_curso__ += 1
+        hilo.profundidad = profundidad + 1
+
+    def _terminar_operacion(self):
+        hilo = self.__hilo__
+        hilo.profundidad -= 1
+        if not hilo.profundidad:
+            with self.__sin_operaciones__:
+                self.__en_curso__ -= 1
+                self._escribir_snapshot_pendiente()
+
+    def _escribir_snapshot_pendiente(self):
+        """Con el cerrojo tomado: si hay un snapshot pendiente, espera a que no haya operaciones en curso y lo escribe."""
+        while self.__snapshot_pendiente__:
+            if self.__en_curso__:
+                self.__sin_operaciones__.wait()
+                continue
+            try:
+                self._escribir_snapshot()
+            finally:
+                self.__sin_operaciones__.notify_all()
+
+    def _agregar_registro(self, registro: Dict):
+        self.__secuencia__ += 1
+        registro["n"] = self.__secuencia__
+        self.__archivo__.write(codificar_registro(registro))
+        self.__registros_en_journal__ += 1
+        self.__sin_fsync__ += 1
+        if self.__sin_fsync__ >= self.__fsync_cada__ or time.monotonic() - self.__ultimo_fsync__ >= self.__intervalo_fsync__:
+            self.sincronizar()
+        elif self.__temporizador__ is None:
+            self.__temporizador__ = threading.Timer(self.__intervalo_fsync__, self._sincronizar_vencido)
+            self.__temporizador__.daemon = True
+            self.__temporizador__.start()
+        if self.__snapshot_cada__ is not None and self.__registros_en_journal__ >= self.__snapshot_cada__:
+            self.__snapshot_pendiente__ = True
+
+    def _sincronizar_vencido(self):
+        with self.__cerrojo__:
+            self.__temporizador__ = None
+            if self.__archivo__ is not None and self.__sin_fsync__:
+                self.sincronizar()
+
+    def sincronizar(self):
+        """Baja a disco todo lo escrito en el journal."""
+        with self.__cerrojo__:
+            self.__archivo__.flush()
+            os.fsync(self.__archivo__.fileno())
+            self.__sin_fsync__ = 0
+            self.__ultimo_fsync__ = time.monotonic()
+
+    def escribir_snapshot(self):
+        """Escribe el estado completo de la clínica y vacía el journal, cuando no haya operaciones en curso."""
+        if getattr(self.__hilo__, "profundidad", 0):
+            raise RuntimeError("No se puede escribir un snapshot desde adentro de una operación")
+        with self.__sin_operaciones__:
+            self.__snapshot_pendiente__ = True
+            self._escribir_snapshot_pendiente()
+
+    def _escribir_snapshot(self):
+        self.__snapshot_pendiente__ = False
+        clinica = self.__clinica__
+        temporal = self.__ruta_snapshot__ + ".tmp"
+        # Sin operaciones en curso todo lo escrito en el journal ya está en memoria. El hilo que lo
+        # escribe puede tener tomados los cerrojos de su operación: el estado se lee con
+        # recorrer_estado, que no toma cerrojos ni crea turnos de series
+        medicos, pacientes, turnos, series, recetas = clinica.recorrer_estado()
+        with open(temporal, "wb") as archivo:
+            archivo.write(codificar_registro({"op": "snapshot", "secuencia": self.__secuencia__}))
+            for medico in medicos:
+                archivo.write(codificar_registro(registro_medico(medico)))
+            for paciente in pacientes:
+                archivo.write(codificar_registro(registro_paciente(paciente)))
+            for inicio in range(0, len(turnos), 1000):
+                archivo.write(codificar_registro(registro_turnos(turnos[inicio:inicio + 1000])))
+            for serie in series:
+                archivo.write(codificar_registro(registro_serie(serie)))
+            for receta in recetas:
+                archivo.write(codificar_registro(registro_receta(receta)))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.__ruta_snapshot__)
+        fsync_directorio(self.__directorio__)
+        # Recién con el snapshot en disco se vacía el journal
+        self.__archivo__.close()
+        self.__archivo__ = open(self.__ruta_journal__, "wb")
+        self.__registros_en_journal__ = 0
+        self.sincronizar()
+
+    def guardar_paciente(self, paciente: Paciente):
+        self._agregar(registro_paciente(paciente))
+
+    def guardar_medico(self, medico: Medico):
+        self._agregar(registro_medico(medico))
+
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        self._agregar({"op": "especialidad", "matricula": matricula, "tipo": especialidad.obtener_especialidad(),
+                       "dias": especialidad.obtener_dias()})
+
+    def guardar_turno(self, turno: Turno):
+        self.guardar_turnos([turno])
+
+    def guardar_turnos(self, turnos: List[Turno]):
+        # Un lote es un único registro: al recuperar se aplica entero o no se aplica
+        self._agregar(registro_turnos(turnos))
+
+    def guardar_serie(self, serie: SerieTurnos):
+        self._agregar(registro_serie(serie))
+
+    def cancelar_turno(self, turno: Turno):
+        self._agregar({"op": "cancelar", "matricula": turno.obtener_medico().obtener_matricula(),
+                       "fecha_hora": turno.obtener_fecha_hora().isoformat()})
+
+    def reprogramar_turno(self, anterior: Turno, nuevo: Turno):
+        self._agregar({"op": "reprogramar", "matricula": anterior.obtener_medico().obtener_matricula(),
+                       "fecha_hora": anterior.obtener_fecha_hora().isoformat(),
+                       "nueva_fecha_hora": nuevo.obtener_fecha_hora().isoformat()})
+
+    def guardar_receta(self, receta: Receta):
+        self._agregar(registro_receta(receta))
+
+    def cerrar(self):
+        with self.__cerrojo__:
+            if self.__temporizador__ is not None:
+                self.__temporizador__.cancel()
+                self.__temporizador__ = None
+            if self.__archivo__ is not None:
+                self.sincronizar()
+                self.__archivo__.close()
+                self.__archivo__ = None
@@ -0,0 +1,223 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from src.almacenamiento import Almacenamiento
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import DIAS_SEMANA, Especialidad
+from src.turno import Turno
+from src.receta import Receta
+from src.serie_turnos import SerieTurnos
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pacientes (
+    dni TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    fecha_nacimiento TEXT,
+    fecha_es_datetime INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS medicos (
+    matricula TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS especialidades (
+    id INTEGER PRIMARY KEY,
+    matricula TEXT NOT NULL REFERENCES medicos(matricula),
+    tipo TEXT NOT NULL,
+    mascara_dias INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_especialidades_matricula ON especialidades(matricula);
+CREATE TABLE IF NOT EXISTS turnos (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL REFERENCES pacientes(dni),
+    matricula TEXT NOT NULL REFERENCES medicos(matricula),
+    fecha_hora TEXT NOT NULL,
+    especialidad TEXT NOT NULL,
+    UNIQUE (matricula, fecha_hora)
+);
+CREATE INDEX IF NOT EXISTS idx_turnos_dni_fecha ON turnos(dni, fecha_hora);
+CREATE INDEX IF NOT EXISTS idx_turnos_fecha ON turnos(fecha_hora);
+CREATE TABLE IF NOT EXISTS recetas (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL REFERENCES pacientes(dni),
+    matricula TEXT NOT NULL REFERENCES medicos(matricula),
+    medicamentos TEXT NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recetas_dni ON recetas(dni);
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL REFERENCES pacientes(dni),
+    matricula TEXT NOT NULL REFERENCES medicos(matricula),
+    especialidad TEXT NOT NULL,
+    primera TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    cada_semanas INTEGER NOT NULL,
+    UNIQUE (matricula, primera)
+);
+"""
+
+# Las sentencias son constantes: sqlite3 guarda cada una compilada en su caché de sentencias
+# preparadas y las reutiliza en cada llamada, solo cambian los parámetros
+INSERTAR_PACIENTE = "INSERT INTO pacientes (dni, nombre, fecha_nacimiento, fecha_es_datetime) VALUES (?, ?, ?, ?)"
+INSERTAR_MEDICO = "INSERT INTO medicos (matricula, nombre) VALUES (?, ?)"
+INSERTAR_ESPECIALIDAD = "INSERT INTO especialidades (matricula, tipo, mascara_dias) VALUES (?, ?, ?)"
+INSERTAR_TURNO = "INSERT INTO turnos (dni, matricula, fecha_hora, especialidad) VALUES (?, ?, ?, ?)"
+INSERTAR_RECETA = "INSERT INTO recetas (dni, matricula, medicamentos, fecha) VALUES (?, ?, ?, ?)"
+INSERTAR_SERIE = "INSERT INTO series (dni, matricula, especialidad, primera, cantidad, cada_semanas) VALUES (?, ?, ?, ?, ?, ?)"
+BORRAR_SERIE = "DELETE FROM series WHERE matricula = ? AND primera = ?"
+BORRAR_TURNO = "DELETE FROM turnos WHERE matricula = ? AND fecha_hora = ?"
+REPROGRAMAR_TURNO = "UPDATE turnos SET fecha_hora = ? WHERE matricula = ? AND fecha_hora = ?"
+SELECCIONAR_PACIENTE = "SELECT dni, nombre, fecha_nacimiento, fecha_es_datetime FROM pacientes WHERE dni = ?"
+SELECCIONAR_MEDICOS = """
+SELECT m.matricula, m.nombre, e.tipo, e.mascara_dias
+FROM medicos m LEFT JOIN especialidades e ON e.matricula = m.matricula
+ORDER BY m.rowid, e.id
+"""
+SELECCIONAR_TURNOS_PACIENTE = "SELECT matricula, fecha_hora, especialidad FROM turnos WHERE dni = ? ORDER BY id"
+SELECCIONAR_TURNOS_MEDICO = "SELECT dni, fecha_hora, especialidad FROM turnos WHERE matricula = ? ORDER BY id"
+SELECCIONAR_RECETAS_PACIENTE = "SELECT matricula, medicamentos, fecha FROM recetas WHERE dni = ? ORDER BY id"
+SELECCIONAR_SERIES = "SELECT dni, matricula, especialidad, primera, cantidad, cada_semanas FROM series ORDER BY id"
+SELECCIONAR_DNIS = "SELECT dni FROM pacientes ORDER BY rowid"
+
+def dias_de_mascara(mascara: int) -> List[str]:
+    return [dia for indice, dia in enumerate(DIAS_SEMANA) if mascara >> indice & 1]
+
+def fecha_a_texto(fecha: datetime) -> str:
+    return fecha.isoformat(sep=" ")
+
+class AlmacenamientoSQLite(Almacenamiento):
+    """Persistencia en SQLite (modo WAL).
+
+    Al iniciar solo se cargan los médicos con sus especialidades; pacientes, historias clínicas y
+    agendas se leen con consultas indexadas cuando la clínica los necesita. Una serie se guarda
+    como una fila (primera fecha, cantidad y frecuencia) y al abrir vuelve a ser una serie
+    pendiente; recién cuando la clínica crea sus turnos la fila se reemplaza por ellos. La conexión se
+    comparte entre hilos, por eso cada operación toma el cerrojo del almacenamiento.
+    """
+
+    def __init__(self, ruta: str):
+        self.__conexion__ = sqlite3.connect(ruta, check_same_thread=False)
+        self.__cerrojo__ = threading.Lock()
+        self.__conexion__.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL solo sincroniza en los checkpoints y sigue siendo seguro ante caídas del proceso
+        self.__conexion__.execute("PRAGMA synchronous=NORMAL")
+        self.__conexion__.execute("PRAGMA foreign_keys=ON")
+        self.__conexion__.executescript(ESQUEMA)
+        self.__conexion__.commit()
+
+    def restaurar(self, clinica):
+        medicos = {}
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_MEDICOS).fetchall()
+        for matricula, nombre, tipo, mascara in filas:
+            medico = medicos.get(matricula)
+            if medico is None:
+                medico = medicos[matricula] = Medico(matricula, nombre)
+            if tipo is not None:
+                medico.agregar_especialidad(Especialidad(tipo, dias_de_mascara(mascara)))
+        for medico in medicos.values():
+            clinica.agregar_medico(medico)
+
+    def guardar_paciente(self, paciente: Paciente):
+        fecha = paciente.obtener_fecha_nacimiento()
+        es_datetime = isinstance(fecha, datetime)
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(INSERTAR_PACIENTE, (paciente.obtener_dni(), paciente.obtener_nombre(),
+                                                          fecha_a_texto(fecha) if es_datetime else fecha, int(es_datetime)))
+
+    def guardar_medico(self, medico: Medico):
+        matricula = medico.obtener_matricula()
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(INSERTAR_MEDICO, (matricula, medico.obtener_nombre()))
+            self.__conexion__.executemany(INSERTAR_ESPECIALIDAD, [
+                (matricula, esp.obtener_especialidad(), esp.obtener_mascara_dias()) for esp in medico.obtener_especialidades()])
+
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(INSERTAR_ESPECIALIDAD, (matricula, especialidad.obtener_especialidad(), especialidad.obtener_mascara_dias()))
+
+    def guardar_turno(self, turno: Turno):
+        self.guardar_turnos([turno])
+
+    def guardar_turnos(self, turnos: List[Turno]):
+        # Un lote de turnos se guarda en una sola transacción
+        with self.__cerrojo__, self.__conexion__:
+            self._insertar_turnos(turnos)
+
+    def _insertar_turnos(self, turnos: List[Turno]):
+        self.__conexion__.executemany(INSERTAR_TURNO, [
+            (t.obtener_paciente().obtener_dni(), t.obtener_medico().obtener_matricula(),
+             fecha_a_texto(t.obtener_fecha_hora()), t.obtener_especialidad()) for t in turnos])
+
+    def guardar_serie(self, serie: SerieTurnos):
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(INSERTAR_SERIE, (
+                serie.obtener_paciente().obtener_dni(), serie.obtener_medico().obtener_matricula(), serie.obtener_especialidad(),
+                fecha_a_texto(serie.obtener_primera()), len(serie), serie.obtener_cada_semanas()))
+
+    def guardar_turnos_de_serie(self, serie: SerieTurnos, turnos: List[Turno]):
+        # En la misma transacción: nunca quedan guardados la serie y sus turnos a la vez
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(BORRAR_SERIE, (serie.obtener_medico().obtener_matricula(),
+                                                     fecha_a_texto(serie.obtener_primera())))
+            self._insertar_turnos(turnos)
+
+    def cancelar_turno(self, turno: Turno):
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(BORRAR_TURNO, (turno.obtener_medico().obtener_matricula(),
+                                                     fecha_a_texto(turno.obtener_fecha_hora())))
+
+    def reprogramar_turno(self, anterior: Turno, nuevo: Turno):
+        # La fila conserva su id, así el turno sigue en su lugar al cargar la historia
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(REPROGRAMAR_TURNO, (fecha_a_texto(nuevo.obtener_fecha_hora()),
+                                                          anterior.obtener_medico().obtener_matricula(),
+                                                          fecha_a_texto(anterior.obtener_fecha_hora())))
+
+    def guardar_receta(self, receta: Receta):
+        with self.__cerrojo__, self.__conexion__:
+            self.__conexion__.execute(INSERTAR_RECETA, (
+                receta.obtener_paciente().obtener_dni(), receta.obtener_medico().obtener_matricula(),
+                json.dumps(receta.obtener_medicamentos(), ensure_ascii=False), fecha_a_texto(receta.obtener_fecha())))
+
+    def cargar_paciente(self, dni: str) -> Optional[Paciente]:
+        with self.__cerrojo__:
+            fila = self.__conexion__.execute(SELECCIONAR_PACIENTE, (dni,)).fetchone()
+        if fila is None:
+            return None
+        dni, nombre, fecha, es_datetime = fila
+        return Paciente(dni, nombre, datetime.fromisoformat(fecha) if es_datetime else fecha)
+
+    def cargar_turnos_de_paciente(self, dni: str) -> List[Tuple[str, datetime, str]]:
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_TURNOS_PACIENTE, (dni,)).fetchall()
+        return [(matricula, datetime.fromisoformat(fecha_hora), especialidad) for matricula, fecha_hora, especialidad in filas]
+
+    def cargar_recetas_de_paciente(self, dni: str) -> List[Tuple[str, List[str], datetime]]:
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_RECETAS_PACIENTE, (dni,)).fetchall()
+        return [(matricula, json.loads(medicamentos), datetime.fromisoformat(fecha)) for matricula, medicamentos, fecha in filas]
+
+    def cargar_turnos_de_medico(self, matricula: str) -> List[Tuple[str, datetime, str]]:
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_TURNOS_MEDICO, (matricula,)).fetchall()
+        return [(dni, datetime.fromisoformat(fecha_hora), especialidad) for dni, fecha_hora, especialidad in filas]
+
+    def cargar_series(self) -> List[Tuple[str, str, str, datetime, int, int]]:
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_SERIES).fetchall()
+        return [(dni, matricula, especialidad, datetime.fromisoformat(primera), cantidad, cada_semanas)
+                for dni, matricula, especialidad, primera, cantidad, cada_semanas in filas]
+
+    def listar_dnis(self) -> Iterator[str]:
+        with self.__cerrojo__:
+            filas = self.__conexion__.execute(SELECCIONAR_DNIS).fetchall()
+        for (dni,) in filas:
+            yield dni
+
+    def cerrar(self):
+        with self.__cerrojo__:
+            self.__conexion__.close()
@@ -1,10 +1,22 @@
-from datetime import datetime
-from typing import List, Dict
+import threading
+from collections import Counter
+from contextlib import ExitStack
+from itertools import count, islice
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Iterable, Iterator, Tuple, Optional, Set
 from src.paciente import Paciente
 from src.medico import Medico
 from src.historiaclinica import HistoriaClinica
 from src.turno import Turno
 from src.receta import Receta
+from src.agenda import Agenda
+from src.especialidad import DIAS_SEMANA, Especialidad, indice_dia
+from src.almacenamiento import Almacenamiento
+from src.turnos_columnares import TurnosColumnares
+from src.metricas import Metricas
+from src.indice_medicamentos import IndiceMedicamentos
+from src.indice_nombres import IndiceNombres
+from src.serie_turnos import SerieTurnos, SeriesPendientes
 
 class PacienteNoEncontradoException(Exception):
     pass
@@ -12,59 +24,729 @@ class MedicoNoDisponibleException(Exception):
     pass
 class TurnoOcupadoException(Exception):
     pass
+class TurnoNoEncontradoException(Exception):
+    pass
 class RecetaInvalidaException(Exception):
     pass
 
+class ResultadoTurno:
+    """Resultado de una solicitud de Clinica.agendar_turnos: el turno agendado o el error de validación."""
+
+    def __init__(self, turno: Optional[Turno] = None, error: Optional[Exception] = None):
+        self.__turno__ = turno
+        self.__error__ = error
+
+    def obtener_turno(self) -> Optional[Turno]:
+        return self.__turno__
+
+    def obtener_error(self) -> Optional[Exception]:
+        return self.__error__
+
+    def fue_agendado(self) -> bool:
+        return self.__turno__ is not None
+
+class ResultadoSerie:
+    """Resultado de Clinica.agendar_serie: la serie agendada o las fechas que chocan con otros turnos."""
+
+    def __init__(self, serie: Optional[SerieTurnos] = None, conflictos: Optional[List[Tuple[datetime, Exception]]] = None):
+        self.__serie__ = serie
+        self.__conflictos__ = conflictos if conflictos is not None else []
+
+    def obtener_serie(self) -> Optional[SerieTurnos]:
+        return self.__serie__
+
+    def obtener_conflictos(self) -> List[Tuple[datetime, Exception]]:
+        """(fecha_hora, error) de cada fecha que no se pudo agendar, en orden."""
+        return self.__conflictos__
+
+    def fue_agendada(self) -> bool:
+        return self.__serie__ is not None
+
+def paginar(elementos: Iterable, offset: int = 0, limite: Optional[int] = None) -> Iterator:
+    """Devuelve un iterador sobre elementos[offset:offset + limite] sin copiar los elementos."""
+    if offset < 0 or (limite is not None and limite < 0):
+        raise ValueError("offset y limite no pueden ser negativos")
+    fin = None if limite is None else offset + limite
+    if isinstance(elementos, list):
+        # En una lista se salta directo al offset
+        return (elementos[i] for i in range(offset, len(elementos) if fin is None else min(fin, len(elementos))))
+    return islice(elementos, offset, fin)
+
+# Turnos que iterar_turnos copia de la Agenda de un médico cada vez que toma su cerrojo
+TURNOS_POR_COPIA = 256
+
 class Clinica:
 
-    def __init__(self):
+    # Horario de atención usado para generar los turnos candidatos
+    HORA_APERTURA = 8
+    HORA_CIERRE = 18
+
+    # Métodos públicos que se miden con activar_metricas (los iterar_* devuelven generadores y no se miden)
+    OPERACIONES_MEDIDAS = (
+        "agregar_paciente", "agregar_medico", "agregar_especialidad_a_medico",
+        "agendar_turno", "agendar_turnos", "agendar_serie", "obtener_turno", "buscar_turno", "cancelar_turno",
+        "reprogramar_turno", "emitir_receta",
+        "obtener_historiales_por_dni", "renderizar_historia",
+        "obtener_pacientes", "obtener_medicos", "obtener_turnos", "obtener_turnos_de_medico",
+        "obtener_medico_por_matricula", "obtener_medicos_por_especialidad_y_dia", "buscar_proximo_turno",
+        "contar_turnos", "contar_turnos_por_medico", "contar_turnos_por_especialidad",
+        "contar_turnos_por_dia", "histograma_ocupacion",
+        "obtener_recetas_por_medicamento", "obtener_pacientes_por_medicamento", "obtener_medicamentos_mas_recetados",
+        "buscar_pacientes_por_nombre", "buscar_pacientes_aproximado",
+    )
+
+    def __init__(self, almacenamiento: Optional[Almacenamiento] = None, columnar: bool = False,
+                 metricas: Optional[Metricas] = None):
         self.__paciente__: Dict[str, Paciente] = {}
         self.__medico__: Dict[str, Medico] = {}
         self.__historias_clinicas__: Dict[str, HistoriaClinica] = {}
-        self.__turnos__: List[Turno] = []
+        # Las mismas historias en orden de registro: nunca se quitan, así que se recorren por posición
+        self.__historias_en_orden__: List[HistoriaClinica] = []
+        # Id -> Turno, en orden de registro: cancelar un turno lo quita sin recorrer la lista
+        self.__turnos__: Dict[int, Turno] = {}
+        self.__ids_turnos__ = count(1)
+        # Índices de ocupación: (matrícula, fecha_hora) y (DNI, fecha_hora) -> Turno
+        self.__ocupacion_medico__: Dict[Tuple[str, datetime], Turno] = {}
+        self.__ocupacion_paciente__: Dict[Tuple[str, datetime], Turno] = {}
+        # Calendario ordenado por fecha_hora de cada médico
+        self.__agendas__: Dict[str, Agenda] = {}
+        # Índice invertido: (especialidad normalizada, número de día) -> matrículas
+        self.__medicos_por_especialidad_dia__: Dict[Tuple[str, int], Set[str]] = {}
+        # Con un almacenamiento persistente los pacientes (con su historia) y los turnos de cada
+        # médico se traen recién cuando se necesitan; esto registra qué ya está en memoria
+        self.__agendas_cargadas__: Set[str] = set()
+        self.__pacientes_cargados__ = False
+        # Con columnar=True los turnos también se copian a columnas de NumPy para las estadísticas
+        self.__columnas__: Optional[TurnosColumnares] = TurnosColumnares() if columnar else None
+        # Índice invertido: medicamento normalizado -> recetas por fecha, y conteos por médico
+        self.__indice_medicamentos__ = IndiceMedicamentos()
+        # Palabras de los nombres de los pacientes, para buscar por prefijo o con errores de tipeo
+        self.__indice_nombres__ = IndiceNombres()
+        # Series de turnos recurrentes cuyos turnos todavía no se crearon (ver agendar_serie)
+        self.__series_pendientes__ = SeriesPendientes()
+        # Cerrojos para usar la clínica desde varios hilos. Orden para tomarlos (evita interbloqueos):
+        # registro -> médicos (por matrícula) -> pacientes (por DNI) -> columnas, medicamentos, nombres o series.
+        # El de registro protege altas de pacientes y médicos, especialidades y la carga diferida;
+        # el de cada médico, su agenda y su ocupación; el de cada paciente, su historia y su ocupación.
+        # Los almacenamientos persistentes tienen su propio cerrojo.
+        self.__cerrojo_registro__ = threading.RLock()
+        self.__cerrojos_medico__: Dict[str, threading.Lock] = {}
+        self.__cerrojos_paciente__: Dict[str, threading.Lock] = {}
+        self.__cerrojo_columnas__ = threading.Lock()
+        self.__cerrojo_medicamentos__ = threading.Lock()
+        self.__cerrojo_nombres__ = threading.Lock()
+        self.__cerrojo_series__ = threading.Lock()
+        # Mientras se restauran los datos guardados se usa el almacenamiento en memoria,
+        # así lo restaurado no se vuelve a guardar
+        self.__almacenamiento__ = Almacenamiento()
+        if almacenamiento is not None:
+            almacenamiento.restaurar(self)
+            self.__almacenamiento__ = almacenamiento
+            self._restaurar_series()
+        # Lo restaurado no cuenta en las métricas
+        self.__metricas__: Optional[Metricas] = None
+        if metricas is not None:
+            self.activar_metricas(metricas)
+
+    def activar_metricas(self, metricas: Optional[Metricas] = None) -> Metricas:
+        """Empieza a medir llamadas, errores y latencia de OPERACIONES_MEDIDAS y devuelve las métricas.
+
+        Cada método se reemplaza en esta instancia por uno envuelto, así que sin métricas activas
+        las llamadas no pagan ningún costo. Solo se cuenta la llamada más externa de cada hilo: las
+        llamadas entre métodos públicos (y las del almacenamiento durante una operación) no se repiten.
+        """
+        if self.__metricas__ is not None:
+            self.desactivar_metricas()
+        self.__metricas__ = metricas if metricas is not None else Metricas()
+        for nombre in self.OPERACIONES_MEDIDAS:
+            setattr(self, nombre, self.__metricas__.medir(nombre, getattr(self, nombre)))
+        return self.__metricas__
+
+    def desactivar_metricas(self):
+        """Deja de medir (vuelven los métodos originales); las métricas juntadas se conservan en su objeto."""
+        if self.__metricas__ is None:
+            return
+        for nombre in self.OPERACIONES_MEDIDAS:
+            delattr(self, nombre)
+        self.__metricas__ = None
+
+    def obtener_metricas(self) -> Optional[Metricas]:
+        return self.__metricas__
+
+    def cerrar(self):
+        self.__almacenamiento__.cerrar()
 
     def agregar_paciente(self, paciente : Paciente):
         
             dni = paciente.obtener_dni()
-            if dni in self.__paciente__:
-                raise ValueError(f"El paciente con DNI {dni} ya está registrado")
-            self.__paciente__[dni] = paciente
-            self.__historias_clinicas__[dni] = HistoriaClinica(paciente)
+            with self.__cerrojo_registro__:
+                if self._buscar_paciente(dni) is not None:
+                    raise ValueError(f"El paciente con DNI {dni} ya está registrado")
+                with self.__almacenamiento__.operacion():
+                    self.__almacenamiento__.guardar_paciente(paciente)
+                    self._registrar_paciente(paciente)
+
+    def _registrar_paciente(self, paciente: Paciente):
+        dni = paciente.obtener_dni()
+        self.__cerrojos_paciente__[dni] = threading.Lock()
+        historia = self.__historias_clinicas__[dni] = HistoriaClinica(paciente)
+        self.__historias_en_orden__.append(historia)
+        with self.__cerrojo_nombres__:
+            self.__indice_nombres__.agregar_paciente(paciente)
+        # El paciente se publica al final, cuando su historia y su cerrojo ya existen
+        self.__paciente__[dni] = paciente
+
+    def _buscar_paciente(self, dni: str) -> Optional[Paciente]:
+        """Devuelve el paciente (trayéndolo del almacenamiento con su historia si hace falta) o None."""
+        paciente = self.__paciente__.get(dni)
+        if paciente is None and not self.__pacientes_cargados__:
+            with self.__cerrojo_registro__:
+                # Otro hilo pudo haberlo traído mientras se esperaba el cerrojo
+                paciente = self.__paciente__.get(dni)
+                if paciente is None:
+                    paciente = self.__almacenamiento__.cargar_paciente(dni)
+                    if paciente is not None:
+                        self._registrar_paciente(paciente)
+                        self._cargar_historia(paciente)
+        return paciente
+
+    def _cargar_historia(self, paciente: Paciente):
+        dni = paciente.obtener_dni()
+        turnos = self.__almacenamiento__.cargar_turnos_de_paciente(dni)
+        recetas = self.__almacenamiento__.cargar_recetas_de_paciente(dni)
+        for matricula, fecha_hora, especialidad in turnos:
+            self._registrar_turno_cargado(Turno(paciente, self.__medico__[matricula], fecha_hora, especialidad))
+        for matricula, medicamentos, fecha in recetas:
+            self._registrar_receta(Receta(paciente, self.__medico__[matricula], medicamentos, fecha))
+
+    def _registrar_receta(self, receta: Receta):
+        self.__historias_clinicas__[receta.obtener_paciente().obtener_dni()].agregar_receta(receta)
+        with self.__cerrojo_medicamentos__:
+            self.__indice_medicamentos__.agregar_receta(receta)
+
+    def _registrar_turno_cargado(self, turno: Turno):
+        """Registra un turno traído del almacenamiento, salvo que ya esté en memoria."""
+        matricula = turno.obtener_medico().obtener_matricula()
+        with self.__cerrojos_medico__[matricula], self.__cerrojos_paciente__[turno.obtener_paciente().obtener_dni()]:
+            if (matricula, turno.obtener_fecha_hora()) not in self.__ocupacion_medico__:
+                self._registrar_turno(turno)
+
+    def _restaurar_series(self):
+        """Vuelve a dejar pendientes las series guardadas cuyos turnos todavía no se crearon (sin validarlas ni guardarlas otra vez)."""
+        for dni, matricula, especialidad, primera, cantidad, cada_semanas in self.__almacenamiento__.cargar_series():
+            serie = SerieTurnos(self._buscar_paciente(dni), self.__medico__[matricula], especialidad, primera,
+                                cantidad, cada_semanas)
+            self.__series_pendientes__.agregar(serie)
+
+    def _cargar_todos_los_turnos(self):
+        """Como _cargar_todos_los_pacientes, y además crea los turnos de todas las series pendientes.
+
+        Solo para lo que recorre todos los turnos: listar o buscar pacientes no expande las series.
+        """
+        self._cargar_todos_los_pacientes()
+        if self.__series_pendientes__:
+            self._materializar_series()
+
+    def _cargar_todos_los_pacientes(self):
+        if self.__pacientes_cargados__:
+            return
+        with self.__cerrojo_registro__:
+            if not self.__pacientes_cargados__:
+                dnis = list(self.__almacenamiento__.listar_dnis())
+                for dni in dnis:
+                    self._buscar_paciente(dni)
+                self.__pacientes_cargados__ = True
+
+    def precargar(self):
+        """Trae del almacenamiento todos los pacientes y agendas que todavía no estén en memoria.
+
+        Sirve antes de compartir la clínica con otros procesos (ver src/reportes.py), que solo
+        deben leerla y no consultar el almacenamiento.
+        """
+        self._cargar_todos_los_turnos()
+        for matricula in list(self.__medico__):
+            self._asegurar_agenda(matricula)
+
+    def _asegurar_agenda(self, matricula: str):
+        """Garantiza que todos los turnos guardados del médico estén en memoria (en su Agenda e índices)."""
+        if matricula in self.__agendas_cargadas__:
+            return
+        with self.__cerrojo_registro__:
+            if matricula in self.__agendas_cargadas__:
+                return
+            turnos = self.__almacenamiento__.cargar_turnos_de_medico(matricula)
+            for dni, fecha_hora, especialidad in turnos:
+                # Al traer al paciente se trae su historia, y con ella este turno
+                paciente = self._buscar_paciente(dni)
+                self._registrar_turno_cargado(Turno(paciente, self.__medico__[matricula], fecha_hora, especialidad))
+            self.__agendas_cargadas__.add(matricula)
 
     def agregar_medico(self, medico : Medico):
             matricula = medico.obtener_matricula()
-            if matricula in self.__medico__:
-                raise MedicoNoDisponibleException(f"El médico con matrícula {matricula} ya está registrado")
-            self.__medico__[matricula] = medico
+            with self.__cerrojo_registro__:
+                if matricula in self.__medico__:
+                    raise MedicoNoDisponibleException(f"El médico con matrícula {matricula} ya está registrado")
+                with self.__almacenamiento__.operacion():
+                    self.__almacenamiento__.guardar_medico(medico)
+                    self.__cerrojos_medico__[matricula] = threading.Lock()
+                    self.__agendas__[matricula] = Agenda()
+                    for especialidad in medico.obtener_especialidades():
+                        self._indexar_especialidad(medico, especialidad)
+                    medico.suscribir(self._al_agregar_especialidad)
+                    self.__medico__[matricula] = medico
     
     def agregar_especialidad_a_medico(self, matricula: str, especialidad):
         """Agrega una especialidad a un médico ya registrado."""
         if matricula not in self.__medico__:
             raise MedicoNoDisponibleException(f"El médico con matrícula {matricula} no está registrado")
         medico = self.__medico__[matricula]
-        medico.agregar_especialidad(especialidad)
+        with self.__cerrojo_registro__, self.__almacenamiento__.operacion():
+            medico.agregar_especialidad(especialidad)
         
 
-    def agendar_turno(self, dni:str , matricula:str , especialidad:str, fecha_hora:datetime):
+    def _al_agregar_especialidad(self, medico: Medico, especialidad: Especialidad):
+        with self.__cerrojo_registro__, self.__almacenamiento__.operacion():
+            self.__almacenamiento__.guardar_especialidad(medico.obtener_matricula(), especialidad)
+            self._indexar_especialidad(medico, especialidad)
+
+    def _indexar_especialidad(self, medico: Medico, especialidad: Especialidad):
+        clave_especialidad = especialidad.obtener_especialidad().strip().lower()
+        for indice in range(7):
+            if especialidad.verificar_indice_dia(indice):
+                clave = (clave_especialidad, indice)
+                self.__medicos_por_especialidad_dia__.setdefault(clave, set()).add(medico.obtener_matricula())
+
+    def agendar_turno(self, dni:str , matricula:str , especialidad:str, fecha_hora:datetime) -> Turno:
         self.validar_existencia_paciente(dni)
         self.validar_existencia_medico(matricula)
-        if isinstance(fecha_hora, str):
-            fecha_hora = datetime.strptime(fecha_hora, "%Y-%m-%d %H:%M:%S")
-        dia = self.obtener_dia_semana_en_espanol(fecha_hora)
+        self._asegurar_agenda(matricula)
+        fecha_hora = self._convertir_fecha_hora(fecha_hora)
+        medico = self.__medico__[matricula]
+        self._validar_especialidad_turno(medico, especialidad, fecha_hora)
+        # Verificar que esté libre y registrarlo es una sola operación para otros hilos. Los cerrojos
+        # se toman sin `with`: en este camino, que es el más usado, cuesta la mitad
+        cerrojo_medico = self.__cerrojos_medico__[matricula]
+        cerrojo_paciente = self.__cerrojos_paciente__[dni]
+        cerrojo_medico.acquire()
+        cerrojo_paciente.acquire()
+        try:
+            self.validar_turno(dni, matricula, especialidad, fecha_hora)
+            turno = Turno(self.__paciente__[dni], medico, fecha_hora, especialidad)
+            with self.__almacenamiento__.operacion():
+                self.__almacenamiento__.guardar_turno(turno)
+                self._registrar_turno(turno)
+        finally:
+            cerrojo_paciente.release()
+            cerrojo_medico.release()
+        return turno
+
+    def agendar_turnos(self, solicitudes: List[Tuple[str, str, str, datetime]]) -> List[ResultadoTurno]:
+        """Agenda una lista de solicitudes (dni, matricula, especialidad, fecha_hora) de forma atómica.
+
+        Primero se validan todas (incluidos los choques entre solicitudes del mismo lote); si alguna
+        falla no se agenda ninguna. Devuelve un ResultadoTurno por solicitud, en el mismo orden.
+        """
+        # El recolector de ciclos queda como esté: pausarlo afectaría a todos los hilos del proceso.
+        # Quien carga un lote grande sin otros hilos puede pausarlo él (ver bench_agendar_turnos.py)
+        # Lo que haya que traer del almacenamiento se trae antes de tomar los cerrojos del lote
+        pacientes = {dni: self._buscar_paciente(dni) for dni in {s[0] for s in solicitudes}}
+        matriculas = sorted({s[1] for s in solicitudes if s[1] in self.__medico__})
+        for matricula in matriculas:
+            self._asegurar_agenda(matricula)
+        # Se toman en orden (médicos y luego pacientes, cada grupo ordenado) para no interbloquearse
+        with ExitStack() as cerrojos:
+            for matricula in matriculas:
+                cerrojos.enter_context(self.__cerrojos_medico__[matricula])
+            for dni in sorted(dni for dni, paciente in pacientes.items() if paciente is not None):
+                cerrojos.enter_context(self.__cerrojos_paciente__[dni])
+            return self._agendar_turnos(solicitudes, pacientes)
+
+    def _agendar_turnos(self, solicitudes: List[Tuple[str, str, str, datetime]],
+                        pacientes: Dict[str, Optional[Paciente]]) -> List[ResultadoTurno]:
+        # Referencias locales: se evitan búsquedas de atributos y llamadas repetidas por solicitud
+        medicos = self.__medico__
+        ocupacion_medico = self.__ocupacion_medico__
+        ocupacion_paciente = self.__ocupacion_paciente__
+        hay_series = bool(self.__series_pendientes__)
+        # Las claves se reservan en los índices de ocupación a medida que se validan, así los choques
+        # dentro del mismo lote se detectan igual que contra los turnos existentes; si algo falla se liberan
+        reservados: List[Tuple[Turno, str, str]] = []
+        errores: List[Optional[Exception]] = []
+        hay_errores = False
+        for dni, matricula, especialidad, fecha_hora in solicitudes:
+            try:
+                paciente = pacientes[dni]
+                if paciente is None:
+                    raise PacienteNoEncontradoException(f"El paciente con DNI {dni} no está registrado")
+                medico = medicos.get(matricula)
+                if medico is None:
+                    raise MedicoNoDisponibleException(f"El médico con matrícula {matricula} no está registrado")
+                fecha_hora = self._convertir_fecha_hora(fecha_hora)
+                if especialidad not in medico.obtener_especialidades_por_indice_dia(fecha_hora.weekday()):
+                    self._validar_especialidad_turno(medico, especialidad, fecha_hora)
+                clave_medico = (matricula, fecha_hora)
+                clave_paciente = (dni, fecha_hora)
+                if clave_medico in ocupacion_medico or clave_paciente in ocupacion_paciente or hay_series:
+                    self.validar_turno(dni, matricula, especialidad, fecha_hora)
+            except (ValueError, PacienteNoEncontradoException, MedicoNoDisponibleException, TurnoOcupadoException) as e:
+                hay_errores = True
+                errores.append(e)
+            else:
+                turno = Turno(paciente, medico, fecha_hora, especialidad)
+                ocupacion_medico[clave_medico] = turno
+                ocupacion_paciente[clave_paciente] = turno
+                reservados.append((turno, dni, matricula))
+                errores.append(None)
+        turnos = [turno for turno, _, _ in reservados]
+        if hay_errores:
+            # Todo o nada: se liberan las reservas y las solicitudes válidas tampoco se agendan
+            self._liberar_reservas(reservados)
+            return [ResultadoTurno(error=e) for e in errores]
+        with self.__almacenamiento__.operacion():
+            try:
+                self.__almacenamiento__.guardar_turnos(turnos)
+            except Exception:
+                self._liberar_reservas(reservados)
+                raise
+            self._registrar_reservados(reservados)
+        return [ResultadoTurno(turno=turno) for turno in turnos]
+
+    def _registrar_reservados(self, reservados: List[Tuple[Turno, str, str]]):
+        """Agrega a las historias, la lista de turnos, las columnas y las agendas turnos ya reservados en los índices de ocupación."""
+        historias = self.__historias_clinicas__
+        registro = self.__turnos__
+        ids = self.__ids_turnos__
+        por_medico: Dict[str, List[Turno]] = {}
+        for turno, dni, matricula in reservados:
+            id_turno = next(ids)
+            turno.asignar_id(id_turno)
+            registro[id_turno] = turno
+            historias[dni].agregar_turno(turno)
+            por_medico.setdefault(matricula, []).append(turno)
+        turnos = [turno for turno, _, _ in reservados]
+        if self.__columnas__ is not None:
+            with self.__cerrojo_columnas__:
+                self.__columnas__.agregar_turnos(turnos)
+        # Cada Agenda recibe sus turnos en una sola inserción
+        for matricula, turnos_medico in por_medico.items():
+            self.__agendas__[matricula].agregar_turnos(turnos_medico)
+
+    def _liberar_reservas(self, reservados: List[Tuple[Turno, str, str]]):
+        for turno, dni, matricula in reservados:
+            del self.__ocupacion_medico__[(matricula, turno.obtener_fecha_hora())]
+            del self.__ocupacion_paciente__[(dni, turno.obtener_fecha_hora())]
+
+    def agendar_serie(self, dni: str, matricula: str, especialidad: str, primera: datetime, cantidad: Optional[int] = None,
+                      hasta: Optional[date] = None, cada_semanas: int = 1) -> ResultadoSerie:
+        """Agenda el mismo horario cada `cada_semanas` semanas (1 semanal, 2 quincenal): `cantidad` turnos o hasta el día `hasta` (incluido).
+
+        Todas las fechas caen el mismo día de la semana, así que la especialidad se valida una sola
+        vez; la ocupación del médico y del paciente se consulta en los índices para cada fecha. Si
+        alguna fecha choca no se agenda ninguna, y el resultado trae cada fecha en conflicto con su
+        error. La serie se guarda como un solo objeto: sus turnos se crean recién cuando se
+        consulta la historia del paciente, la agenda del médico o todos los turnos. Los
+        almacenamientos persistentes guardan también solo la serie (ver Almacenamiento.guardar_serie)
+        y al reabrir la clínica vuelve a quedar pendiente.
+        """
+        if (cantidad is None) == (hasta is None):
+            raise ValueError("Indicá la cantidad de turnos o la fecha hasta la que se repite la serie (solo una)")
+        self.validar_existencia_paciente(dni)
+        self.validar_existencia_medico(matricula)
+        self._asegurar_agenda(matricula)
+        primera = self._convertir_fecha_hora(primera)
+        if hasta is not None:
+            cantidad = SerieTurnos.cantidad_hasta(primera, hasta, cada_semanas)
         medico = self.__medico__[matricula]
-        especialidad_disponible = medico.obtener_especialidad_para_dia(dia)
-        if especialidad not in especialidad_disponible:
+        self._validar_especialidad_turno(medico, especialidad, primera)
+        serie = SerieTurnos(self.__paciente__[dni], medico, especialidad, primera, cantidad, cada_semanas)
+        ocupacion_medico = self.__ocupacion_medico__
+        ocupacion_paciente = self.__ocupacion_paciente__
+        with self.__cerrojos_medico__[matricula], self.__cerrojos_paciente__[dni]:
+            # Las otras series solo pueden chocar si son del mismo día de la semana y hora: se buscan una vez
+            with self.__cerrojo_series__:
+                candidatas = self.__series_pendientes__.en_el_mismo_horario(matricula, dni, primera)
+            conflictos: List[Tuple[datetime, Exception]] = []
+            for fecha_hora in serie.obtener_fechas():
+                if ((matricula, fecha_hora) in ocupacion_medico or (dni, fecha_hora) in ocupacion_paciente
+                        or candidatas and any(otra.contiene(fecha_hora) for otra in candidatas)):
+                    # Solo las fechas ocupadas pasan por validar_turno, que arma el error
+                    try:
+                        self.validar_turno(dni, matricula, especialidad, fecha_hora)
+                    except TurnoOcupadoException as e:
+                        conflictos.append((fecha_hora, e))
+            if conflictos:
+                return ResultadoSerie(conflictos=conflictos)
+            with self.__almacenamiento__.operacion():
+                self.__almacenamiento__.guardar_serie(serie)
+                with self.__cerrojo_series__:
+                    self.__series_pendientes__.agregar(serie)
+        return ResultadoSerie(serie=serie)
+
+    def _materializar_series(self, matricula: Optional[str] = None, dni: Optional[str] = None):
+        """Crea y registra los turnos de las series pendientes del médico, del paciente o (sin ninguno) de todas."""
+        if not self.__series_pendientes__:
+            return
+        with self.__cerrojo_series__:
+            if matricula is not None:
+                series = self.__series_pendientes__.de_medico(matricula)
+            elif dni is not None:
+                series = self.__series_pendientes__.de_paciente(dni)
+            else:
+                series = self.__series_pendientes__.todas()
+        for serie in series:
+            matricula_serie = serie.obtener_medico().obtener_matricula()
+            dni_serie = serie.obtener_paciente().obtener_dni()
+            with self.__cerrojos_medico__[matricula_serie], self.__cerrojos_paciente__[dni_serie]:
+                with self.__almacenamiento__.operacion():
+                    with self.__cerrojo_series__:
+                        if not self.__series_pendientes__.quitar(serie):
+                            # Otro hilo ya creó sus turnos
+                            continue
+                    turnos = serie.crear_turnos()
+                    # Desde ahora el almacenamiento guarda turnos sueltos en lugar de la serie
+                    self.__almacenamiento__.guardar_turnos_de_serie(serie, turnos)
+                    reservados = []
+                    for turno in turnos:
+                        self.__ocupacion_medico__[(matricula_serie, turno.obtener_fecha_hora())] = turno
+                        self.__ocupacion_paciente__[(dni_serie, turno.obtener_fecha_hora())] = turno
+                        reservados.append((turno, dni_serie, matricula_serie))
+                    self._registrar_reservados(reservados)
+
+    def obtener_turno(self, id_turno: int) -> Turno:
+        """Turno con ese id. Los ids se asignan al registrar cada turno y no cambian al reprogramarlo."""
+        turno = self.__turnos__.get(id_turno)
+        if turno is None:
+            raise TurnoNoEncontradoException(f"No hay un turno con id {id_turno}")
+        return turno
+
+    def buscar_turno(self, matricula: str, fecha_hora: datetime) -> Turno:
+        """Turno del médico en esa fecha y hora (p. ej. para conocer su id)."""
+        self.validar_existencia_medico(matricula)
+        self._asegurar_agenda(matricula)
+        self._materializar_series(matricula=matricula)
+        fecha_hora = self._convertir_fecha_hora(fecha_hora)
+        turno = self.__ocupacion_medico__.get((matricula, fecha_hora))
+        if turno is None:
+            raise TurnoNoEncontradoException(f"El médico {matricula} no tiene un turno en la fecha y hora {fecha_hora}")
+        return turno
+
+    def cancelar_turno(self, id_turno: int) -> Turno:
+        """Cancela el turno: lo borra del almacenamiento y de todos los índices. Devuelve el turno cancelado.
+
+        Ningún índice se recorre entero: los turnos de la clínica están en un diccionario por id,
+        los de la historia en un diccionario por turno, la ocupación en diccionarios por
+        (matrícula o DNI, fecha_hora) y la Agenda ubica el turno con bisect.
+        """
+        while True:
+            turno = self.obtener_turno(id_turno)
+            matricula = turno.obtener_medico().obtener_matricula()
+            dni = turno.obtener_paciente().obtener_dni()
+            # Con toda la agenda en memoria, un almacenamiento que no borra (el binario) no lo vuelve a traer
+            self._asegurar_agenda(matricula)
+            with self.__cerrojos_medico__[matricula], self.__cerrojos_paciente__[dni]:
+                # Otro hilo pudo reprogramarlo o cancelarlo mientras se esperaban los cerrojos
+                if self.__turnos__.get(id_turno) is not turno:
+                    continue
+                with self.__almacenamiento__.operacion():
+                    self.__almacenamiento__.cancelar_turno(turno)
+                    self._quitar_de_indices(turno)
+                    del self.__turnos__[id_turno]
+                return turno
+
+    def reprogramar_turno(self, id_turno: int, fecha_hora: datetime) -> Turno:
+        """Mueve el turno a otra fecha y hora, con el mismo médico, paciente y especialidad.
+
+        La fecha nueva se valida como la de un turno nuevo (especialidad del médico ese día y
+        ocupación). Devuelve el turno reprogramado: un objeto nuevo con el mismo id, que conserva
+        su lugar en el orden de registro; el anterior se quita de todos los índices.
+        """
+        fecha_hora = self._convertir_fecha_hora(fecha_hora)
+        while True:
+            turno = self.obtener_turno(id_turno)
+            medico = turno.obtener_medico()
+            matricula = medico.obtener_matricula()
+            dni = turno.obtener_paciente().obtener_dni()
+            especialidad = turno.obtener_especialidad()
+            self._validar_especialidad_turno(medico, especialidad, fecha_hora)
+            self._asegurar_agenda(matricula)
+            with self.__cerrojos_medico__[matricula], self.__cerrojos_paciente__[dni]:
+                if self.__turnos__.get(id_turno) is not turno:
+                    continue
+                if fecha_hora == turno.obtener_fecha_hora():
+                    return turno
+                self.validar_turno(dni, matricula, especialidad, fecha_hora)
+                nuevo = Turno(turno.obtener_paciente(), medico, fecha_hora, especialidad, id_turno)
+                with self.__almacenamiento__.operacion():
+                    self.__almacenamiento__.reprogramar_turno(turno, nuevo)
+                    self._quitar_de_indices(turno)
+                    self._registrar_turno(nuevo)
+                return nuevo
+
+    def _convertir_fecha_hora(self, fecha_hora) -> datetime:
+        if isinstance(fecha_hora, str):
+            return datetime.strptime(fecha_hora, "%Y-%m-%d %H:%M:%S")
+        return fecha_hora
+
+    def _validar_especialidad_turno(self, medico: Medico, especialidad: str, fecha_hora: datetime):
+        if especialidad not in medico.obtener_especialidades_por_indice_dia(fecha_hora.weekday()):
+            dia = self.obtener_dia_semana_en_espanol(fecha_hora)
             raise MedicoNoDisponibleException(f"El médico {medico.obtener_matricula()} no tiene la especialidad {especialidad} para el día {dia}")
-        self.validar_turno(dni, matricula, especialidad, fecha_hora)
-        turno = Turno(self.__paciente__[dni], medico, fecha_hora, especialidad)
-        self.__turnos__.append(turno)
+
+    def _registrar_turno(self, turno: Turno):
+        """Guarda un turno ya validado y actualiza todos los índices (con los cerrojos del médico y del paciente tomados)."""
+        dni = turno.obtener_paciente().obtener_dni()
+        matricula = turno.obtener_medico().obtener_matricula()
+        fecha_hora = turno.obtener_fecha_hora()
+        id_turno = turno.obtener_id()
+        if id_turno is None:
+            id_turno = next(self.__ids_turnos__)
+            turno.asignar_id(id_turno)
+        self.__turnos__[id_turno] = turno
+        self.__ocupacion_medico__[(matricula, fecha_hora)] = turno
+        self.__ocupacion_paciente__[(dni, fecha_hora)] = turno
+        self.__agendas__[matricula].agregar_turno(turno)
         self.__historias_clinicas__[dni].agregar_turno(turno)
-        
+        if self.__columnas__ is not None:
+            with self.__cerrojo_columnas__:
+                self.__columnas__.agregar_turno(turno)
+
+    def _quitar_de_indices(self, turno: Turno):
+        """Quita un turno de la ocupación, la Agenda, la historia y las columnas (con los cerrojos del médico y del paciente tomados)."""
+        dni = turno.obtener_paciente().obtener_dni()
+        matricula = turno.obtener_medico().obtener_matricula()
+        fecha_hora = turno.obtener_fecha_hora()
+        del self.__ocupacion_medico__[(matricula, fecha_hora)]
+        del self.__ocupacion_paciente__[(dni, fecha_hora)]
+        self.__agendas__[matricula].quitar_turno(turno)
+        self.__historias_clinicas__[dni].quitar_turno(turno)
+        if self.__columnas__ is not None:
+            with self.__cerrojo_columnas__:
+                self.__columnas__.quitar_turno(turno)
+
     def obtener_pacientes(self) -> List[Paciente]:
+        self._cargar_todos_los_pacientes()
         return list(self.__paciente__.values())
     
     def obtener_medicos(self) -> List[Medico]:
-        return list(self.__medico__.values())
+        with self.__cerrojo_registro__:
+            return list(self.__medico__.values())
+
+    def iterar_pacientes(self, offset: int = 0, limite: Optional[int] = None) -> Iterator[Paciente]:
+        """Recorre los pacientes en orden de registro, sin copiarlos a una lista.
+
+        offset y limite permiten pedir una página; el orden se mantiene entre llamadas (los
+        pacientes nuevos quedan al final). No agregar pacientes mientras se recorre.
+        """
+        self._cargar_todos_los_pacientes()
+        return paginar(self.__paciente__.values(), offset, limite)
+
+    def iterar_medicos(self, offset: int = 0, limite: Optional[int] = None, especialidad: Optional[str] = None,
+                       dia: Optional[str] = None) -> Iterator[Medico]:
+        """Recorre los médicos en orden de registro, opcionalmente solo los de una especialidad y/o día."""
+        indice = None
+        if dia is not None:
+            indice = indice_dia(dia)
+            if indice is None:
+                raise ValueError(f"El día {dia} no es un día de la semana válido")
+        medicos: Iterable[Medico] = self.__medico__.values()
+        if especialidad is not None or indice is not None:
+            medicos = (m for m in medicos if self._medico_cumple(m, especialidad, indice))
+        return paginar(medicos, offset, limite)
+
+    def _medico_cumple(self, medico: Medico, especialidad: Optional[str], indice: Optional[int]) -> bool:
+        buscada = None if especialidad is None else especialidad.strip().lower()
+        for esp in medico.obtener_especialidades():
+            if buscada is not None and esp.obtener_especialidad().strip().lower() != buscada:
+                continue
+            if indice is None or esp.verificar_indice_dia(indice):
+                return True
+        return False
+
+    def iterar_turnos(self, offset: int = 0, limite: Optional[int] = None, desde: Optional[datetime] = None,
+                      hasta: Optional[datetime] = None, matricula: Optional[str] = None, dni: Optional[str] = None,
+                      especialidad: Optional[str] = None) -> Iterator[Turno]:
+        """Recorre los turnos con desde <= fecha_hora < hasta y los demás filtros indicados, de a una página.
+
+        Con matrícula se recorre la Agenda del médico (orden cronológico, el rango se busca con
+        bisect) de a TURNOS_POR_COPIA turnos; si no, con DNI los turnos de la historia del paciente
+        y sin DNI todos los turnos, en orden de registro y sin copiarlos: no agendar ni cancelar
+        turnos mientras se recorre.
+        """
+        if matricula is not None:
+            self.validar_existencia_medico(matricula)
+            self._asegurar_agenda(matricula)
+            self._materializar_series(matricula=matricula)
+            turnos: Iterable[Turno] = self._iterar_agenda(matricula, desde, hasta)
+            desde = hasta = None
+        elif dni is not None:
+            self.validar_existencia_paciente(dni)
+            self._materializar_series(dni=dni)
+            turnos = self.__historias_clinicas__[dni].iterar_turnos()
+        else:
+            self._cargar_todos_los_turnos()
+            turnos = self.__turnos__.values()
+        if desde is not None or hasta is not None or dni is not None or especialidad is not None:
+            # La matrícula ya quedó aplicada al elegir la Agenda
+            turnos = self._filtrar_turnos(desde, hasta, especialidad=especialidad, turnos=turnos)
+        return paginar(turnos, offset, limite)
+
+    def _iterar_agenda(self, matricula: str, desde: Optional[datetime], hasta: Optional[datetime]) -> Iterator[Turno]:
+        """Recorre el rango de la Agenda copiando una página por vez con el cerrojo del médico tomado, por si se agenda en paralelo."""
+        agenda = self.__agendas__[matricula]
+        cerrojo = self.__cerrojos_medico__[matricula]
+        excluir_desde = False
+        while True:
+            with cerrojo:
+                pagina = agenda.obtener_pagina(desde, hasta, TURNOS_POR_COPIA, excluir_desde)
+            yield from pagina
+            if len(pagina) < TURNOS_POR_COPIA:
+                return
+            # Un médico no tiene dos turnos a la misma hora: la página siguiente empieza después de la última
+            desde, excluir_desde = pagina[-1].obtener_fecha_hora(), True
+
+    def iterar_recetas(self, offset: int = 0, limite: Optional[int] = None, desde: Optional[datetime] = None,
+                       hasta: Optional[datetime] = None, matricula: Optional[str] = None,
+                       dni: Optional[str] = None) -> Iterator[Receta]:
+        """Recorre las recetas con desde <= fecha < hasta, opcionalmente de un médico o paciente, de a una página.
+
+        Van paciente por paciente (en orden de registro) y en el orden en que se emitieron. Las
+        historias se copian de a TURNOS_POR_COPIA con el cerrojo de registro tomado, así que se
+        pueden agregar pacientes y emitir recetas mientras se recorre.
+        """
+        if matricula is not None:
+            self.validar_existencia_medico(matricula)
+        if dni is not None:
+            self.validar_existencia_paciente(dni)
+            historias: Iterable[HistoriaClinica] = [self.__historias_clinicas__[dni]]
+        else:
+            self._cargar_todos_los_pacientes()
+            historias = self._iterar_historias()
+        recetas = (receta for historia in historias for receta in historia.obtener_recetas())
+        if desde is not None or hasta is not None or matricula is not None:
+            recetas = self._filtrar_recetas(recetas, desde, hasta, matricula)
+        return paginar(recetas, offset, limite)
+
+    def _iterar_historias(self) -> Iterator[HistoriaClinica]:
+        """Recorre las historias en orden de registro copiando una página por vez con el cerrojo de registro tomado."""
+        inicio = 0
+        while True:
+            with self.__cerrojo_registro__:
+                pagina = self.__historias_en_orden__[inicio:inicio + TURNOS_POR_COPIA]
+            yield from pagina
+            if len(pagina) < TURNOS_POR_COPIA:
+                return
+            inicio += TURNOS_POR_COPIA
+
+    @staticmethod
+    def _filtrar_recetas(recetas: Iterable[Receta], desde: Optional[datetime], hasta: Optional[datetime],
+                         matricula: Optional[str]) -> Iterator[Receta]:
+        for receta in recetas:
+            fecha = receta.obtener_fecha()
+            if desde is not None and fecha < desde or hasta is not None and fecha >= hasta:
+                continue
+            if matricula is not None and receta.obtener_medico().obtener_matricula() != matricula:
+                continue
+            yield receta
 
     def obtener_medico_por_matricula(self, matricula: str) -> Medico:
         medico = self.__medico__.get(matricula)
@@ -72,29 +754,236 @@ class Clinica:
             raise MedicoNoDisponibleException(f"El médico con matrícula {matricula} no está registrado")
         return medico
     
+    def obtener_medicos_por_especialidad_y_dia(self, especialidad: str, dia: str) -> List[Medico]:
+        """Devuelve los médicos que atienden la especialidad el día indicado, ordenados por matrícula."""
+        indice = indice_dia(dia)
+        if indice is None:
+            raise ValueError(f"El día {dia} no es un día de la semana válido")
+        matriculas = self.__medicos_por_especialidad_dia__.get((especialidad.strip().lower(), indice), ())
+        return [self.__medico__[matricula] for matricula in sorted(matriculas)]
+
+    def buscar_proximo_turno(self, especialidad: str, desde: datetime, duracion: timedelta = timedelta(minutes=30),
+                             cantidad: int = 1, dias_maximos: int = 365) -> List[Tuple[datetime, Medico]]:
+        """Devuelve los primeros `cantidad` turnos libres (fecha_hora, médico) de la especialidad a partir de `desde`.
+
+        Los candidatos salen del índice (especialidad, día), así que solo se revisan los médicos que
+        atienden ese día, y la ocupación de cada médico se consulta una vez por día en su Agenda.
+        """
+        apertura = timedelta(hours=self.HORA_APERTURA)
+        cierre = timedelta(hours=self.HORA_CIERRE)
+        if duracion <= timedelta(0) or duracion > cierre - apertura:
+            raise ValueError("La duración del turno debe ser positiva y entrar en el horario de atención")
+        clave_especialidad = especialidad.strip().lower()
+        if not any((clave_especialidad, indice) in self.__medicos_por_especialidad_dia__ for indice in range(7)):
+            return []
+        cantidad_turnos_dia = (cierre - apertura) // duracion
+        encontrados = []
+        dia = datetime(desde.year, desde.month, desde.day)
+        for _ in range(dias_maximos):
+            matriculas = self.__medicos_por_especialidad_dia__.get((clave_especialidad, dia.weekday()))
+            if matriculas:
+                matriculas = sorted(matriculas)
+                ocupados_por_medico: Dict[str, Set[int]] = {}
+                for numero_turno in range(cantidad_turnos_dia):
+                    inicio = dia + apertura + numero_turno * duracion
+                    if inicio < desde:
+                        continue
+                    for matricula in matriculas:
+                        ocupados = ocupados_por_medico.get(matricula)
+                        if ocupados is None:
+                            ocupados = self._turnos_ocupados_en_dia(matricula, dia + apertura, duracion, cantidad_turnos_dia)
+                            ocupados_por_medico[matricula] = ocupados
+                        if numero_turno not in ocupados:
+                            encontrados.append((inicio, self.__medico__[matricula]))
+                            if len(encontrados) == cantidad:
+                                return encontrados
+            dia += timedelta(days=1)
+        return encontrados
+
+    def _turnos_ocupados_en_dia(self, matricula: str, apertura: datetime, duracion: timedelta, cantidad_turnos_dia: int) -> Set[int]:
+        # Número de turno (dentro del día) de cada turno agendado del médico en ese horario
+        self._asegurar_agenda(matricula)
+        with self.__cerrojos_medico__[matricula]:
+            turnos = self.__agendas__[matricula].obtener_turnos(apertura, apertura + cantidad_turnos_dia * duracion)
+        ocupados = {(turno.obtener_fecha_hora() - apertura) // duracion for turno in turnos}
+        if self.__series_pendientes__:
+            # Las series pendientes se consultan sin crear sus turnos
+            with self.__cerrojo_series__:
+                series = self.__series_pendientes__.de_medico(matricula)
+            for serie in series:
+                fecha_hora = serie.fecha_en_dia(apertura.date())
+                if fecha_hora is not None and apertura <= fecha_hora < apertura + cantidad_turnos_dia * duracion:
+                    ocupados.add((fecha_hora - apertura) // duracion)
+        return ocupados
+
+    def recorrer_estado(self) -> Tuple[List[Medico], List[Paciente], List[Turno], List[SerieTurnos], List[Receta]]:
+        """Médicos, pacientes, turnos, series pendientes y recetas que ya están en memoria, para que un almacenamiento los guarde enteros.
+
+        No toma los cerrojos de médicos ni pacientes ni trae nada del almacenamiento: el journal la
+        llama mientras el hilo que escribe tiene tomados los cerrojos de su operación, cuando
+        ninguna otra está dentro de almacenamiento.operacion(). Las series pendientes se
+        devuelven como series, sin crear sus turnos.
+        """
+        turnos = list(self.__turnos__.values())
+        with self.__cerrojo_series__:
+            series = self.__series_pendientes__.todas()
+        recetas = [receta for historia in list(self.__historias_clinicas__.values()) for receta in historia.obtener_recetas()]
+        return list(self.__medico__.values()), list(self.__paciente__.values()), turnos, series, recetas
+
     def obtener_turnos(self) -> List[Turno]:
-        return self.__turnos__
+        # Cada paciente se trae con todos sus turnos
+        self._cargar_todos_los_turnos()
+        return list(self.__turnos__.values())
+
+    def obtener_turnos_de_medico(self, matricula: str, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Turno]:
+        """Devuelve los turnos del médico con desde <= fecha_hora < hasta, ordenados cronológicamente."""
+        self.validar_existencia_medico(matricula)
+        self._asegurar_agenda(matricula)
+        self._materializar_series(matricula=matricula)
+        with self.__cerrojos_medico__[matricula]:
+            return self.__agendas__[matricula].obtener_turnos(desde, hasta)
     
-    def emitir_receta(self, dni:str, matricula: str, medicamentos: List[str]):
+    def _filtrar_turnos(self, desde: Optional[datetime], hasta: Optional[datetime], matricula: Optional[str] = None,
+                        especialidad: Optional[str] = None, turnos: Optional[Iterable[Turno]] = None) -> Iterator[Turno]:
+        """Recorre objeto por objeto los turnos (por defecto, todos, sin copiarlos) que cumplen los filtros."""
+        if turnos is None:
+            self._cargar_todos_los_turnos()
+            turnos = self.__turnos__.values()
+        for turno in turnos:
+            fecha_hora = turno.obtener_fecha_hora()
+            if desde is not None and fecha_hora < desde or hasta is not None and fecha_hora >= hasta:
+                continue
+            if matricula is not None and turno.obtener_medico().obtener_matricula() != matricula:
+                continue
+            if especialidad is not None and turno.obtener_especialidad() != especialidad:
+                continue
+            yield turno
+
+    def contar_turnos(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                      matricula: Optional[str] = None, especialidad: Optional[str] = None) -> int:
+        """Cantidad de turnos con desde <= fecha_hora < hasta, opcionalmente de un médico o especialidad."""
+        if self.__columnas__ is not None:
+            self._cargar_todos_los_turnos()
+            return self.__columnas__.contar(desde, hasta, matricula, especialidad)
+        return sum(1 for _ in self._filtrar_turnos(desde, hasta, matricula, especialidad))
+
+    def contar_turnos_por_medico(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Dict[str, int]:
+        """Matrícula -> cantidad de turnos en el rango (solo médicos con turnos)."""
+        if self.__columnas__ is not None:
+            self._cargar_todos_los_turnos()
+            return self.__columnas__.contar_por_medico(desde, hasta)
+        return dict(Counter(t.obtener_medico().obtener_matricula() for t in self._filtrar_turnos(desde, hasta)))
+
+    def contar_turnos_por_especialidad(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Dict[str, int]:
+        """Especialidad -> cantidad de turnos en el rango."""
+        if self.__columnas__ is not None:
+            self._cargar_todos_los_turnos()
+            return self.__columnas__.contar_por_especialidad(desde, hasta)
+        return dict(Counter(t.obtener_especialidad() for t in self._filtrar_turnos(desde, hasta)))
+
+    def contar_turnos_por_dia(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                              matricula: Optional[str] = None) -> Dict[date, int]:
+        """Fecha (día calendario) -> cantidad de turnos, en orden de fecha, opcionalmente de un médico."""
+        if self.__columnas__ is not None:
+            self._cargar_todos_los_turnos()
+            return self.__columnas__.contar_por_dia(desde, hasta, matricula)
+        return dict(sorted(Counter(t.obtener_fecha_hora().date() for t in self._filtrar_turnos(desde, hasta, matricula)).items()))
+
+    def histograma_ocupacion(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                             matricula: Optional[str] = None) -> List[List[int]]:
+        """Matriz 7x24 con la cantidad de turnos por día de la semana (lunes = 0) y hora de inicio."""
+        if self.__columnas__ is not None:
+            self._cargar_todos_los_turnos()
+            return self.__columnas__.histograma_ocupacion(desde, hasta, matricula)
+        histograma = [[0] * 24 for _ in range(7)]
+        for turno in self._filtrar_turnos(desde, hasta, matricula):
+            fecha_hora = turno.obtener_fecha_hora()
+            histograma[fecha_hora.weekday()][fecha_hora.hour] += 1
+        return histograma
+
+    def emitir_receta(self, dni:str, matricula: str, medicamentos: List[str], fecha: Optional[datetime] = None) -> Receta:
+            """Emite una receta; `fecha` solo se indica al reconstruir recetas ya emitidas (por defecto, ahora)."""
             self.validar_existencia_paciente(dni)
             self.validar_existencia_medico(matricula)
             
             if not medicamentos or len(medicamentos) == 0:
                 raise RecetaInvalidaException("La lista de medicamentos no puede estar vacía")
         
-            receta = Receta(self.__paciente__[dni], self.__medico__[matricula], medicamentos)
-            self.__historias_clinicas__[dni].agregar_receta(receta)
-            
+            receta = Receta(self.__paciente__[dni], self.__medico__[matricula], medicamentos, fecha)
+            with self.__cerrojos_paciente__[dni], self.__almacenamiento__.operacion():
+                self.__almacenamiento__.guardar_receta(receta)
+                self._registrar_receta(receta)
+            return receta
+
+    def obtener_recetas_por_medicamento(self, medicamento: str, desde: Optional[datetime] = None,
+                                        hasta: Optional[datetime] = None) -> List[Receta]:
+        """Recetas que incluyen el medicamento, con desde <= fecha < hasta, en orden cronológico.
+
+        No distingue mayúsculas ni tildes, y "ibuprofeno" incluye "Ibuprofeno 400mg". Se resuelve
+        con el índice de medicamentos, sin recorrer las historias clínicas.
+        """
+        self._cargar_todos_los_pacientes()
+        with self.__cerrojo_medicamentos__:
+            return self.__indice_medicamentos__.buscar(medicamento, desde, hasta)
+
+    def obtener_pacientes_por_medicamento(self, medicamento: str, desde: Optional[datetime] = None,
+                                          hasta: Optional[datetime] = None) -> List[Paciente]:
+        """Pacientes a los que se les recetó el medicamento en el rango, sin repetir, por fecha de la primera receta."""
+        pacientes: Dict[str, Paciente] = {}
+        for receta in self.obtener_recetas_por_medicamento(medicamento, desde, hasta):
+            pacientes.setdefault(receta.obtener_paciente().obtener_dni(), receta.obtener_paciente())
+        return list(pacientes.values())
+
+    def obtener_medicamentos_mas_recetados(self, matricula: Optional[str] = None, cantidad: int = 10) -> List[Tuple[str, int]]:
+        """Los medicamentos con más recetas (de un médico, o de toda la clínica) y su cantidad, de mayor a menor."""
+        if matricula is not None:
+            self.validar_existencia_medico(matricula)
+        self._cargar_todos_los_pacientes()
+        with self.__cerrojo_medicamentos__:
+            return self.__indice_medicamentos__.mas_recetados(matricula, cantidad)
+
+    def buscar_pacientes_por_nombre(self, texto: str, cantidad: int = 10) -> List[Paciente]:
+        """Hasta `cantidad` pacientes en cuyo nombre cada palabra del texto es el comienzo de una palabra.
+
+        "mar gar" encuentra a María García; no distingue mayúsculas ni tildes.
+        """
+        self._cargar_todos_los_pacientes()
+        with self.__cerrojo_nombres__:
+            return self.__indice_nombres__.buscar_por_prefijo(texto, cantidad)
+
+    def buscar_pacientes_aproximado(self, texto: str, cantidad: int = 10) -> List[Tuple[Paciente, int]]:
+        """Hasta `cantidad` pacientes cuyo nombre se parece al texto aunque tenga errores de tipeo, con la cantidad de errores.
+
+        Se tolera un error por palabra de hasta 5 letras y dos en las más largas; los resultados
+        van de menor a mayor cantidad de errores.
+        """
+        self._cargar_todos_los_pacientes()
+        with self.__cerrojo_nombres__:
+            return self.__indice_nombres__.buscar_aproximado(texto, cantidad)
 
     def obtener_historiales_por_dni(self, dni: str) -> HistoriaClinica:
         self.validar_existencia_paciente(dni)
+        self._materializar_series(dni=dni)
         return self.__historias_clinicas__[dni]
 
+    def renderizar_historia(self, dni: str, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                            pagina: int = 1, por_pagina: Optional[int] = None) -> Tuple[int, List[str]]:
+        """Cantidad de entradas en el rango y líneas de la página pedida, leídas bajo el cerrojo del paciente.
+
+        A diferencia de HistoriaClinica.renderizar, puede usarse mientras otros hilos agendan
+        turnos o emiten recetas para el mismo paciente.
+        """
+        self.validar_existencia_paciente(dni)
+        self._materializar_series(dni=dni)
+        historia = self.__historias_clinicas__[dni]
+        with self.__cerrojos_paciente__[dni]:
+            return historia.contar_entradas(desde, hasta), list(historia.renderizar(desde, hasta, pagina, por_pagina))
+
     #validaciones
     
     
     def validar_existencia_paciente(self, dni: str):
-        if dni not in self.__paciente__:
+        if self._buscar_paciente(dni) is None:
             raise PacienteNoEncontradoException(f"El paciente con DNI {dni} no está registrado")
 
 
@@ -104,13 +993,21 @@ class Clinica:
 
 
     def validar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime):
-       turno = Turno(self.__paciente__[dni], self.__medico__[matricula], fecha_hora, especialidad)
-       if turno in self.__turnos__:
-            if turno.obtener_medico().obtener_matricula() == matricula and turno.obtener_fecha_hora() == fecha_hora:
-                raise TurnoOcupadoException(f"Ya existe un turno agendado para el paciente {dni} con el médico {matricula} en la fecha y hora {fecha_hora}")
+        if (matricula, fecha_hora) in self.__ocupacion_medico__:
+            raise TurnoOcupadoException(f"El médico {matricula} ya tiene un turno agendado en la fecha y hora {fecha_hora}")
+        if (dni, fecha_hora) in self.__ocupacion_paciente__:
+            raise TurnoOcupadoException(f"El paciente {dni} ya tiene un turno agendado en la fecha y hora {fecha_hora}")
+        if self.__series_pendientes__:
+            with self.__cerrojo_series__:
+                serie_medico = self.__series_pendientes__.en_horario_de_medico(matricula, fecha_hora)
+                serie_paciente = self.__series_pendientes__.en_horario_de_paciente(dni, fecha_hora)
+            if serie_medico is not None:
+                raise TurnoOcupadoException(f"El médico {matricula} ya tiene un turno agendado en la fecha y hora {fecha_hora} (turno recurrente)")
+            if serie_paciente is not None:
+                raise TurnoOcupadoException(f"El paciente {dni} ya tiene un turno agendado en la fecha y hora {fecha_hora} (turno recurrente)")
+
     def obtener_dia_semana_en_espanol(self, fecha_hora: datetime) -> str:
-        dias = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado","domingo"]
-        return dias[fecha_hora.weekday()]
+        return DIAS_SEMANA[fecha_hora.weekday()]
     
     def obtener_especialidad_disponible(self, medico: Medico, dia: str) -> str:
         return medico.obtener_especialidad_para_dia(dia)
@@ -1,29 +1,56 @@
 from datetime import datetime
 from typing import List
+from src.simbolos import internar
+
+DIAS_SEMANA = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+# Nombre del día (en minúsculas, con o sin tilde) -> número de día (lunes = 0, como datetime.weekday())
+INDICE_DIA = {dia: indice for indice, dia in enumerate(DIAS_SEMANA)}
+INDICE_DIA["miercoles"] = 2
+INDICE_DIA["sabado"] = 5
+
+def indice_dia(dia: str):
+    """Devuelve el número de día (0-6) para un nombre de día, o None si no es un día válido."""
+    if not isinstance(dia, str):
+        return None
+    return INDICE_DIA.get(dia.strip().lower())
 
 class Especialidad:
+    __slots__ = ("__tipo__", "__mascara_dias__")
+
     def __init__(self, tipo_especialidad: str, dias: List[str]):
-        self.__tipo__: str = tipo_especialidad
-        # Convertir todos los días a minúsculas y eliminar duplicados manteniendo el orden
-        self.__dias__: List[str] = []
+        self.__tipo__: str = internar(tipo_especialidad)
+        # Los días se guardan como una máscara de 7 bits (bit 0 = lunes ... bit 6 = domingo),
+        # lo que elimina duplicados y hace que verificar un día sea una operación constante
+        self.__mascara_dias__: int = 0
         for dia in dias:
-            dia_lower = dia.lower()
-            if dia_lower not in self.__dias__:
-                self.__dias__.append(dia_lower)
-    
+            if not isinstance(dia, str):
+                raise ValueError(f"Los días deben ser nombres de día, no {dia!r}")
+            indice = indice_dia(dia)
+            if indice is None:
+                raise ValueError(f"El día {dia} no es un día de la semana válido")
+            self.__mascara_dias__ |= 1 << indice
+
     def obtener_especialidad(self) -> str:
         return self.__tipo__
-    
+
     def obtener_dias(self) -> List[str]:
-        return self.__dias__
-    
+        """Devuelve los días de atención en el orden de la semana (lunes primero), sin repetir y
+        escritos como en DIAS_SEMANA (en minúsculas y con tilde), sin importar cómo se ingresaron."""
+        return [dia for indice, dia in enumerate(DIAS_SEMANA) if self.__mascara_dias__ >> indice & 1]
+
+    def obtener_mascara_dias(self) -> int:
+        return self.__mascara_dias__
+
     def verificar_dia(self, dia: str) -> bool:
-        if not self.__dias__:
+        # La comparación no distingue mayúsculas/minúsculas
+        indice = indice_dia(dia)
+        if indice is None:
             return False
-        # Convertir el día a verificar a minúsculas para comparación case insensitive
-        dia_lower = dia.lower()
-        return dia_lower in self.__dias__
-    
+        return self.verificar_indice_dia(indice)
+
+    def verificar_indice_dia(self, indice: int) -> bool:
+        return bool(self.__mascara_dias__ >> indice & 1)
+
     def __str__(self) -> str:
-        dias_str = ", ".join(self.__dias__)
-        return f"{self.__tipo__} (Días: {dias_str})"
\ No newline at end of file
+        dias_str = ", ".join(self.obtener_dias())
+        return f"{self.__tipo__} (Días: {dias_str})"
@@ -1,30 +1,107 @@
+from bisect import bisect_left
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from src.paciente import Paciente
 from src.turno import Turno
 from src.receta import Receta
 
+FORMATO_FECHA = "%d/%m/%Y %H:%M"
+
 class HistoriaClinica:
+    __slots__ = ("__paciente__", "__turnos__", "__recetas__", "__linea_de_tiempo__")
 
     def __init__(self, paciente: Paciente):
         self.__paciente__ = paciente
-        self.__turnos__ : List[Turno] = []
+        # Los turnos son las claves, en orden de registro: Turno no define __eq__ ni __hash__, así
+        # que cada turno es su propia clave y quitarlo no recorre los demás
+        self.__turnos__ : Dict[Turno, None] = {}
         self.__recetas__ : List[Receta] = []
+        # Turnos y recetas ordenados por fecha; se arma al renderizar y se descarta al agregar
+        self.__linea_de_tiempo__: Optional[Tuple[List[datetime], List[Union[Turno, Receta]]]] = None
 
     def agregar_turno(self, turno: Turno):
-        self.__turnos__.append(turno)
-    
+        self.__turnos__[turno] = None
+        self.__linea_de_tiempo__ = None
+
+    def quitar_turno(self, turno: Turno) -> bool:
+        """Quita el turno (el mismo objeto); devuelve False si no estaba."""
+        try:
+            del self.__turnos__[turno]
+        except KeyError:
+            return False
+        self.__linea_de_tiempo__ = None
+        return True
+
     def agregar_receta(self, receta: Receta):
         self.__recetas__.append(receta)
+        self.__linea_de_tiempo__ = None
 
     def obtener_turnos(self) -> List[Turno]:
-        return self.__turnos__
-    
+        """Copia de los turnos en orden de registro; para solo recorrerlos, iterar_turnos no copia."""
+        return list(self.__turnos__)
+
+    def iterar_turnos(self) -> Iterator[Turno]:
+        """Recorre los turnos en orden de registro sin copiarlos: no agregar ni quitar turnos mientras se recorre."""
+        return iter(self.__turnos__)
+
     def obtener_recetas(self) -> List[Receta]:
         return self.__recetas__
     def obtener_paciente(self) -> Paciente:
         return self.__paciente__
+
+    def _linea_de_tiempo(self) -> Tuple[List[datetime], List[Union[Turno, Receta]]]:
+        if self.__linea_de_tiempo__ is None:
+            turnos = list(self.__turnos__)
+            entradas = [(t.obtener_fecha_hora(), 0, i) for i, t in enumerate(turnos)]
+            entradas += [(r.obtener_fecha(), 1, i) for i, r in enumerate(self.__recetas__)]
+            # Timsort: las listas ya vienen casi ordenadas por fecha
+            entradas.sort()
+            origen = (turnos, self.__recetas__)
+            self.__linea_de_tiempo__ = ([fecha for fecha, _, _ in entradas],
+                                        [origen[tipo][i] for _, tipo, i in entradas])
+        return self.__linea_de_tiempo__
+
+    def _rango(self, desde: Optional[datetime], hasta: Optional[datetime]) -> Tuple[int, int]:
+        fechas, _ = self._linea_de_tiempo()
+        inicio = 0 if desde is None else bisect_left(fechas, desde)
+        fin = len(fechas) if hasta is None else bisect_left(fechas, hasta)
+        return inicio, max(inicio, fin)
+
+    def contar_entradas(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> int:
+        """Cantidad de turnos y recetas con desde <= fecha < hasta."""
+        inicio, fin = self._rango(desde, hasta)
+        return fin - inicio
+
+    def renderizar(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                   pagina: int = 1, por_pagina: Optional[int] = None, ultimos: Optional[int] = None) -> Iterator[str]:
+        """Genera una línea por turno o receta con desde <= fecha < hasta, de la más reciente a la más antigua.
+
+        Con por_pagina se devuelve solo la página indicada (la 1 es la más reciente); ultimos=N
+        equivale a la primera página de N entradas. Las líneas se arman recién al pedirlas y el
+        texto de cada médico se arma una sola vez.
+        """
+        if ultimos is not None:
+            pagina, por_pagina = 1, ultimos
+        if pagina < 1 or (por_pagina is not None and por_pagina < 1):
+            raise ValueError("La página y la cantidad por página deben ser mayores a cero")
+        inicio, fin = self._rango(desde, hasta)
+        if por_pagina is not None:
+            fin -= (pagina - 1) * por_pagina
+            inicio = max(inicio, fin - por_pagina)
+        _, entradas = self._linea_de_tiempo()
+        medicos: Dict[str, str] = {}
+        for posicion in range(fin - 1, inicio - 1, -1):
+            entrada = entradas[posicion]
+            medico = entrada.obtener_medico()
+            texto_medico = medicos.get(medico.obtener_matricula())
+            if texto_medico is None:
+                texto_medico = medicos[medico.obtener_matricula()] = f"{medico.obtener_nombre()} (Matrícula: {medico.obtener_matricula()})"
+            if isinstance(entrada, Turno):
+                yield f"{entrada.obtener_fecha_hora().strftime(FORMATO_FECHA)} - Turno de {entrada.obtener_especialidad()} con {texto_medico}"
+            else:
+                yield f"{entrada.obtener_fecha().strftime(FORMATO_FECHA)} - Receta de {texto_medico}: {', '.join(entrada.obtener_medicamentos())}"
+
     def __str__(self) -> str:
         turnos_str = "\n".join(str(turno) for turno in self.__turnos__)
         recetas_str = "\n".join(str(receta) for receta in self.__recetas__)
-        return f"HistoriaClinica(Paciente({self.__paciente__}), [{turnos_str}], [{recetas_str}])"
\ No newline at end of file
+        return f"HistoriaClinica(Paciente({self.__paciente__}), [{turnos_str}], [{recetas_str}])"
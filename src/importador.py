@@ -0,0 +1,165 @@
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple, Union
+from src.clinica import (
+    Clinica,
+    PacienteNoEncontradoException,
+    MedicoNoDisponibleException,
+    TurnoOcupadoException,
+    RecetaInvalidaException
+)
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+# Máximo de errores que se guardan con detalle; el resto solo se cuentan
+MAX_ERRORES_GUARDADOS = 1000
+
+ERRORES_POR_FILA = (
+    ValueError,
+    PacienteNoEncontradoException,
+    MedicoNoDisponibleException,
+    TurnoOcupadoException,
+    RecetaInvalidaException
+)
+
+def parsear_fecha(texto: str) -> datetime:
+    """Convierte 'dd/mm/aaaa' o 'aaaa-mm-dd' en datetime sin pasar por strptime."""
+    texto = texto.strip()
+    if len(texto) == 10:
+        if texto[2] == "/" and texto[5] == "/":
+            dia, mes, anio = texto[0:2], texto[3:5], texto[6:10]
+        elif texto[4] == "-" and texto[7] == "-":
+            anio, mes, dia = texto[0:4], texto[5:7], texto[8:10]
+        else:
+            dia = mes = anio = ""
+        if dia.isdigit() and mes.isdigit() and anio.isdigit():
+            try:
+                # datetime() valida que la fecha exista (p. ej. 31/02 falla)
+                return datetime(int(anio), int(mes), int(dia))
+            except ValueError:
+                pass
+    raise ValueError(f"Fecha inválida: {texto!r}. Usá el formato dd/mm/aaaa o aaaa-mm-dd.")
+
+def leer_registros(ruta: str) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Recorre un archivo CSV (con encabezado) o JSONL fila por fila, sin cargarlo entero en memoria.
+
+    Las filas CSV se devuelven como dict; las líneas JSONL como texto, para que un JSON
+    mal formado se informe como error de esa fila sin cortar la lectura.
+    """
+    if ruta.endswith(".csv"):
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            for numero, fila in enumerate(csv.DictReader(archivo), start=2):
+                yield numero, fila
+    elif ruta.endswith(".jsonl") or ruta.endswith(".json"):
+        with open(ruta, encoding="utf-8") as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                if linea.strip():
+                    yield numero, linea
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {ruta}. Usá .csv o .jsonl")
+
+def obtener_campo(fila: Dict, nombre: str) -> str:
+    valor = fila.get(nombre)
+    if valor is None or str(valor).strip() == "":
+        raise ValueError(f"Falta el campo {nombre}")
+    return str(valor).strip()
+
+class ResultadoImportacion:
+
+    def __init__(self, ruta: str):
+        self.__ruta__ = ruta
+        self.__filas__ = 0
+        self.__importadas__ = 0
+        self.__cantidad_errores__ = 0
+        self.__errores__: List[Tuple[int, str]] = []
+        self.__segundos__ = 0.0
+
+    def registrar_importada(self):
+        self.__filas__ += 1
+        self.__importadas__ += 1
+
+    def registrar_error(self, linea: int, mensaje: str):
+        self.__filas__ += 1
+        self.__cantidad_errores__ += 1
+        if len(self.__errores__) < MAX_ERRORES_GUARDADOS:
+            self.__errores__.append((linea, mensaje))
+
+    def finalizar(self, segundos: float):
+        self.__segundos__ = segundos
+
+    def obtener_filas(self) -> int:
+        return self.__filas__
+
+    def obtener_importadas(self) -> int:
+        return self.__importadas__
+
+    def obtener_cantidad_errores(self) -> int:
+        return self.__cantidad_errores__
+
+    def obtener_errores(self) -> List[Tuple[int, str]]:
+        return self.__errores__
+
+    def filas_por_segundo(self) -> float:
+        return self.__filas__ / self.__segundos__ if self.__segundos__ > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.__ruta__}: {self.__importadas__}/{self.__filas__} filas importadas, "
+                f"{self.__cantidad_errores__} errores, {self.filas_por_segundo():.0f} filas/s")
+
+class Importador:
+    """Carga masiva de pacientes, médicos y especialidades en una Clinica desde CSV o JSONL.
+
+    Las filas con errores se informan en el resultado y no cortan la importación.
+    """
+
+    def __init__(self, clinica: Clinica):
+        self.__clinica__ = clinica
+
+    def importar_pacientes(self, ruta: str) -> ResultadoImportacion:
+        # Columnas: dni, nombre, fecha_nacimiento
+        return self._importar(ruta, self._importar_paciente)
+
+    def importar_medicos(self, ruta: str) -> ResultadoImportacion:
+        # Columnas: matricula, nombre
+        return self._importar(ruta, self._importar_medico)
+
+    def importar_especialidades(self, ruta: str) -> ResultadoImportacion:
+        # Columnas: matricula, especialidad, dias (separados por coma o punto y coma; lista en JSONL)
+        return self._importar(ruta, self._importar_especialidad)
+
+    def _importar(self, ruta: str, importar_fila) -> ResultadoImportacion:
+        resultado = ResultadoImportacion(ruta)
+        inicio = time.perf_counter()
+        for numero, fila in leer_registros(ruta):
+            try:
+                if isinstance(fila, str):
+                    fila = json.loads(fila)
+                    if not isinstance(fila, dict):
+                        raise ValueError("La línea no es un objeto JSON")
+                importar_fila(fila)
+            except ERRORES_POR_FILA as e:
+                resultado.registrar_error(numero, str(e))
+            else:
+                resultado.registrar_importada()
+        resultado.finalizar(time.perf_counter() - inicio)
+        return resultado
+
+    def _importar_paciente(self, fila: Dict):
+        fecha_nacimiento = parsear_fecha(obtener_campo(fila, "fecha_nacimiento"))
+        paciente = Paciente(obtener_campo(fila, "dni"), obtener_campo(fila, "nombre"), fecha_nacimiento)
+        self.__clinica__.agregar_paciente(paciente)
+
+    def _importar_medico(self, fila: Dict):
+        self.__clinica__.agregar_medico(Medico(obtener_campo(fila, "matricula"), obtener_campo(fila, "nombre")))
+
+    def _importar_especialidad(self, fila: Dict):
+        dias = fila.get("dias")
+        if not isinstance(dias, list):
+            dias = [dia for dia in obtener_campo(fila, "dias").replace(";", ",").split(",") if dia.strip()]
+        especialidad = Especialidad(obtener_campo(fila, "especialidad"), dias)
+        if not especialidad.obtener_mascara_dias():
+            raise ValueError(f"La especialidad no tiene días de atención válidos: {dias}")
+        self.__clinica__.agregar_especialidad_a_medico(obtener_campo(fila, "matricula"), especialidad)
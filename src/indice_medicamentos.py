@@ -0,0 +1,116 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from src.receta import Receta
+from src.texto import normalizar_texto
+
+def normalizar_medicamento(nombre: str) -> str:
+    """Clave de búsqueda de un medicamento: minúsculas, sin tildes y con los espacios simplificados."""
+    return normalizar_texto(nombre)
+
+class IndiceMedicamentos:
+    """Índice invertido medicamento -> recetas, ordenadas por fecha, y conteos por médico.
+
+    Las claves son los nombres normalizados tal como se recetaron (p. ej. "ibuprofeno 400mg");
+    al buscar "ibuprofeno" se incluyen todas las claves que empiezan con esa palabra. Las recetas
+    de cada clave están en listas paralelas ordenadas por fecha, como en Agenda, así un rango de
+    fechas se busca con bisect. Las recetas que llegan fuera de orden (p. ej. al restaurar desde
+    un almacenamiento) quedan pendientes y se ordenan todas juntas en la siguiente búsqueda.
+    """
+
+    def __init__(self):
+        # Claves ordenadas alfabéticamente, para encontrar las que empiezan con un nombre
+        self.__claves__: List[str] = []
+        # Nombre con el que se recetó por primera vez cada clave (para mostrar)
+        self.__nombres__: Dict[str, str] = {}
+        self.__fechas__: Dict[str, List[datetime]] = {}
+        self.__recetas__: Dict[str, List[Receta]] = {}
+        # Clave -> recetas con fecha anterior a la última de la clave, todavía sin ordenar
+        self.__pendientes__: Dict[str, List[Receta]] = {}
+        # Matrícula -> cantidad de recetas por clave
+        self.__por_medico__: Dict[str, Counter] = {}
+        self.__total__: Counter = Counter()
+        # Nombre tal como se recetó -> clave; los mismos nombres se repiten en muchas recetas
+        self.__normalizados__: Dict[str, str] = {}
+
+    def agregar_receta(self, receta: Receta):
+        fecha = receta.obtener_fecha()
+        conteos = self.__por_medico__.setdefault(receta.obtener_medico().obtener_matricula(), Counter())
+        # Un medicamento repetido en la misma receta cuenta una vez
+        claves = {}
+        normalizados = self.__normalizados__
+        for nombre in receta.obtener_medicamentos():
+            clave = normalizados.get(nombre)
+            if clave is None:
+                clave = normalizados[nombre] = normalizar_medicamento(nombre)
+            claves.setdefault(clave, nombre)
+        for clave, nombre in claves.items():
+            fechas = self.__fechas__.get(clave)
+            if fechas is None:
+                fechas = self.__fechas__[clave] = []
+                self.__recetas__[clave] = []
+                self.__nombres__[clave] = nombre
+                self.__claves__.insert(bisect_left(self.__claves__, clave), clave)
+            if not fechas or fechas[-1] <= fecha:
+                # Lo habitual: las recetas se emiten en orden
+                fechas.append(fecha)
+                self.__recetas__[clave].append(receta)
+            else:
+                # Insertar en el medio costaría O(n) por receta; se ordenan al buscar
+                self.__pendientes__.setdefault(clave, []).append(receta)
+            conteos[clave] += 1
+            self.__total__[clave] += 1
+
+    def obtener_claves(self, medicamento: str) -> List[str]:
+        """Claves que coinciden con el medicamento: la misma o que empiezan con él seguido de un espacio."""
+        buscada = normalizar_medicamento(medicamento)
+        if not buscada:
+            return []
+        claves = self.__claves__
+        inicio = bisect_left(claves, buscada)
+        # Después de buscada + " " vienen las claves con más palabras; "!" es el carácter siguiente al espacio
+        fin = bisect_left(claves, buscada + "!", inicio)
+        return [clave for clave in claves[inicio:fin] if clave == buscada or clave.startswith(buscada + " ")]
+
+    def _ordenar(self, clave: str):
+        pendientes = self.__pendientes__.pop(clave, None)
+        if not pendientes:
+            return
+        fechas = self.__fechas__[clave] + [receta.obtener_fecha() for receta in pendientes]
+        recetas = self.__recetas__[clave] + pendientes
+        # Orden estable por fecha; Timsort aprovecha que la primera parte ya está ordenada
+        orden = sorted(range(len(fechas)), key=fechas.__getitem__)
+        self.__fechas__[clave] = [fechas[i] for i in orden]
+        self.__recetas__[clave] = [recetas[i] for i in orden]
+
+    def _rango(self, clave: str, desde: Optional[datetime], hasta: Optional[datetime]) -> List[Receta]:
+        self._ordenar(clave)
+        fechas = self.__fechas__[clave]
+        inicio = 0 if desde is None else bisect_left(fechas, desde)
+        fin = len(fechas) if hasta is None else bisect_left(fechas, hasta)
+        return self.__recetas__[clave][inicio:fin]
+
+    def buscar(self, medicamento: str, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Receta]:
+        """Recetas con el medicamento y desde <= fecha < hasta, en orden cronológico."""
+        rangos = [self._rango(clave, desde, hasta) for clave in self.obtener_claves(medicamento)]
+        if len(rangos) == 1:
+            return rangos[0]
+        # Varias presentaciones del mismo medicamento: se intercalan por fecha sin repetir recetas
+        vistas = set()
+        recetas = []
+        for receta in heapq.merge(*rangos, key=Receta.obtener_fecha):
+            if id(receta) not in vistas:
+                vistas.add(id(receta))
+                recetas.append(receta)
+        return recetas
+
+    def mas_recetados(self, matricula: Optional[str] = None, cantidad: int = 10) -> List[Tuple[str, int]]:
+        """Los `cantidad` medicamentos con más recetas (de un médico, o de todos), con su cantidad."""
+        conteos = self.__total__ if matricula is None else self.__por_medico__.get(matricula, Counter())
+        return [(self.__nombres__[clave], veces) for clave, veces in conteos.most_common(cantidad)]
+
+    def __len__(self) -> int:
+        """Cantidad de medicamentos distintos."""
+        return len(self.__claves__)
@@ -0,0 +1,200 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from src.paciente import Paciente
+from src.texto import normalizar_texto
+
+def distancia_edicion(a: str, b: str, maximo: int) -> int:
+    """Distancia de edición entre a y b, o maximo + 1 si es mayor que maximo (corta antes).
+
+    Cuenta como un error agregar, borrar o cambiar una letra y también intercambiar dos letras
+    vecinas ("maira" -> "maria"), el error de tipeo más común.
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    if a == b:
+        return 0
+    fuera = maximo + 1
+    # Solo importan las celdas a maximo o menos de la diagonal: las demás ya superan el máximo
+    anteanterior: List[int] = []
+    anterior = [j if j <= maximo else fuera for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        actual = [i if i <= maximo else fuera] + [fuera] * len(b)
+        for j in range(max(1, i - maximo), min(len(b), i + maximo) + 1):
+            cb = b[j - 1]
+            distancia = anterior[j - 1] + (ca != cb)
+            if anterior[j] + 1 < distancia:
+                distancia = anterior[j] + 1
+            if actual[j - 1] + 1 < distancia:
+                distancia = actual[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and anteanterior[j - 2] + 1 < distancia:
+                distancia = anteanterior[j - 2] + 1
+            actual[j] = distancia
+        if min(actual) > maximo:
+            return fuera
+        anteanterior, anterior = anterior, actual
+    return min(anterior[-1], fuera)
+
+def ngramas(palabra: str, n: int) -> Set[str]:
+    """Subcadenas de n letras de la palabra, con bordes "$" para que cuenten el principio y el final."""
+    extendida = f"${palabra}$"
+    return {extendida[i:i + n] for i in range(len(extendida) - n + 1)}
+
+def distancia_permitida(palabra: str) -> int:
+    """Errores de tipeo tolerados en una palabra: 1 hasta 5 letras, 2 en palabras más largas."""
+    return 1 if len(palabra) <= 5 else 2
+
+class IndiceNombres:
+    """Índice de pacientes por las palabras de su nombre, para buscar por prefijo o con errores de tipeo.
+
+    Cada palabra distinta (normalizada) apunta a los pacientes que la tienen. Las palabras se
+    guardan además en una lista ordenada, donde las que empiezan con un prefijo forman un
+    rango contiguo que se busca con bisect. Para tolerar errores se indexan los bigramas y
+    trigramas de cada palabra distinta (no de cada paciente: el vocabulario es mucho más chico)
+    y las candidatas se confirman con la distancia de edición.
+    """
+
+    def __init__(self):
+        self.__palabras__: List[str] = []
+        self.__pacientes__: Dict[str, List[Paciente]] = {}
+        # n -> n-grama -> palabras que lo tienen
+        self.__ngramas__: Dict[int, Dict[str, Set[str]]] = {2: {}, 3: {}}
+
+    def agregar_paciente(self, paciente: Paciente):
+        for palabra in set(normalizar_texto(paciente.obtener_nombre()).split()):
+            pacientes = self.__pacientes__.get(palabra)
+            if pacientes is None:
+                pacientes = self.__pacientes__[palabra] = []
+                self.__palabras__.insert(bisect_left(self.__palabras__, palabra), palabra)
+                for n, indice in self.__ngramas__.items():
+                    for ngrama in ngramas(palabra, n):
+                        indice.setdefault(ngrama, set()).add(palabra)
+            pacientes.append(paciente)
+
+    def _palabras_con_prefijo(self, prefijo: str) -> Iterator[str]:
+        palabras = self.__palabras__
+        for posicion in range(bisect_left(palabras, prefijo), len(palabras)):
+            if not palabras[posicion].startswith(prefijo):
+                return
+            yield palabras[posicion]
+
+    def buscar_por_prefijo(self, texto: str, cantidad: int = 10) -> List[Paciente]:
+        """Pacientes en cuyo nombre cada palabra del texto es el comienzo de alguna palabra ("mar gar" -> María García).
+
+        Se recorren las palabras del índice en orden alfabético y se corta al llegar a `cantidad`.
+        """
+        buscadas = normalizar_texto(texto).split()
+        if not buscadas or cantidad <= 0:
+            return []
+        # La palabra más larga suele ser la más selectiva: sus pacientes son los candidatos
+        guia = max(buscadas, key=len)
+        resto = list(buscadas)
+        resto.remove(guia)
+        encontrados: Dict[int, Paciente] = {}
+        for palabra in self._palabras_con_prefijo(guia):
+            for paciente in self.__pacientes__[palabra]:
+                if id(paciente) in encontrados:
+                    continue
+                if resto and not self._cumple_prefijos(paciente, resto):
+                    continue
+                encontrados[id(paciente)] = paciente
+                if len(encontrados) == cantidad:
+                    return list(encontrados.values())
+        return list(encontrados.values())
+
+    @staticmethod
+    def _cumple_prefijos(paciente: Paciente, prefijos: List[str]) -> bool:
+        palabras = normalizar_texto(paciente.obtener_nombre()).split()
+        return all(any(p.startswith(prefijo) for p in palabras) for prefijo in prefijos)
+
+    def _candidatas(self, palabra: str, maximo: int) -> Set[str]:
+        """Palabras del índice que comparten suficientes n-gramas con la dada como para estar a maximo errores."""
+        if maximo == 0:
+            return {palabra} if palabra in self.__pacientes__ else set()
+        # Agregar, borrar o cambiar una letra altera a lo sumo n n-gramas. Los trigramas son más
+        # selectivos, pero en palabras cortas (o con 2 errores) el mínimo a compartir queda en 0 o 1
+        n = 3 if len(palabra) - 3 * maximo >= 2 else 2
+        propios = ngramas(palabra, n)
+        minimo = len(propios) - n * maximo
+        if minimo <= 0:
+            # Palabras de una o dos letras: puede haber parecidas sin n-gramas en común
+            return set(self._palabras_de_largo(len(palabra) - maximo, len(palabra) + maximo))
+        compartidos: Dict[str, int] = {}
+        indice = self.__ngramas__[n]
+        for ngrama in propios:
+            for otra in indice.get(ngrama, ()):
+                compartidos[otra] = compartidos.get(otra, 0) + 1
+        return {otra for otra, cantidad in compartidos.items() if cantidad >= minimo}
+
+    def _parecidas(self, buscada: str) -> Dict[str, int]:
+        """Palabras del índice a distancia de edición permitida de la buscada, con su distancia."""
+        maximo = distancia_permitida(buscada)
+        candidatas = self._candidatas(buscada, maximo)
+        # Un intercambio de letras vecinas altera hasta n + 1 n-gramas y se escaparía del filtro:
+        # se buscan también las variantes con cada par intercambiado, con un error menos
+        for i in range(len(buscada) - 1):
+            if buscada[i] != buscada[i + 1]:
+                variante = buscada[:i] + buscada[i + 1] + buscada[i] + buscada[i + 2:]
+                candidatas |= self._candidatas(variante, maximo - 1)
+        parecidas = {}
+        for palabra in candidatas:
+            distancia = distancia_edicion(buscada, palabra, maximo)
+            if distancia <= maximo:
+                parecidas[palabra] = distancia
+        return parecidas
+
+    def _palabras_de_largo(self, minimo: int, maximo: int) -> Iterator[str]:
+        return (palabra for palabra in self.__palabras__ if minimo <= len(palabra) <= maximo)
+
+    def buscar_aproximado(self, texto: str, cantidad: int = 10) -> List[Tuple[Paciente, int]]:
+        """Pacientes cuyo nombre tiene, para cada palabra del texto, una palabra parecida (con errores de tipeo).
+
+        Devuelve hasta `cantidad` pares (paciente, errores), de menor a mayor cantidad de errores.
+        """
+        buscadas = normalizar_texto(texto).split()
+        if not buscadas or cantidad <= 0:
+            return []
+        parecidas = [self._parecidas(buscada) for buscada in buscadas]
+        if not all(parecidas):
+            return []
+        # Los candidatos salen de la palabra buscada con menos pacientes
+        guia = min(range(len(buscadas)), key=lambda i: sum(len(self.__pacientes__[p]) for p in parecidas[i]))
+        otras = [parecidas[i] for i in range(len(buscadas)) if i != guia]
+        resultados: Dict[int, Tuple[Paciente, int]] = {}
+        # Se recorre de la palabra más parecida a la menos. Ningún resultado tiene menos errores que
+        # la palabra guía que lo trajo, así que al juntar `cantidad` con ese mínimo ya no hay mejores
+        for palabra, distancia in sorted(parecidas[guia].items(), key=lambda p: (p[1], p[0])):
+            mejores = sum(1 for _, errores in resultados.values() if errores <= distancia)
+            if mejores >= cantidad:
+                break
+            for paciente in self.__pacientes__[palabra]:
+                if id(paciente) in resultados:
+                    continue
+                errores = self._errores(paciente, otras)
+                if errores is None:
+                    continue
+                resultados[id(paciente)] = (paciente, distancia + errores)
+                if errores == 0:
+                    mejores += 1
+                    if mejores >= cantidad:
+                        break
+        # sorted es estable: a igual cantidad de errores, en el orden en que se encontraron
+        return sorted(resultados.values(), key=lambda r: r[1])[:cantidad]
+
+    @staticmethod
+    def _errores(paciente: Paciente, otras: List[Dict[str, int]]) -> Optional[int]:
+        """Suma de errores de las demás palabras buscadas en el nombre del paciente, o None si alguna no aparece."""
+        if not otras:
+            return 0
+        palabras = normalizar_texto(paciente.obtener_nombre()).split()
+        total = 0
+        for parecidas in otras:
+            distancias = [parecidas[p] for p in palabras if p in parecidas]
+            if not distancias:
+                return None
+            total += min(distancias)
+        return total
+
+    def __len__(self) -> int:
+        """Cantidad de palabras distintas."""
+        return len(self.__palabras__)
@@ -1,40 +1,61 @@
-from typing import List
-from src.especialidad import Especialidad
+from typing import Callable, List, Tuple
+from src.especialidad import Especialidad, indice_dia
 
 class Medico:
+    __slots__ = ("__matricula__", "__medico__", "__especialidad__", "__especialidades_por_dia__", "__observadores__")
 
     def __init__(self, matricula_medico :str , nombre_medico :str , especialidad :List[Especialidad] = None):
         self.__matricula__  = matricula_medico
         self.__medico__  = nombre_medico
-        self.__especialidad__ = especialidad if especialidad else []
-        
+        self.__especialidad__ = []
+        # Tabla precalculada: número de día (0-6) -> nombres de especialidad que atiende ese día
+        self.__especialidades_por_dia__: List[Tuple[str, ...]] = [() for _ in range(7)]
+        # Funciones a notificar cuando se agrega una especialidad (p. ej. índices de la clínica)
+        self.__observadores__: List[Callable] = []
+        for esp in especialidad if especialidad else []:
+            self.agregar_especialidad(esp)
+
     def agregar_especialidad(self, especialidad : Especialidad):
         self.__especialidad__.append(especialidad)
-        
+        esp_name = especialidad.obtener_especialidad()
+        for indice in range(7):
+            ya_agregada = esp_name in self.__especialidades_por_dia__[indice]
+            if especialidad.verificar_indice_dia(indice) and not ya_agregada:
+                self.__especialidades_por_dia__[indice] += (esp_name,)
+        for observador in self.__observadores__:
+            observador(self, especialidad)
+
+    def suscribir(self, observador: Callable):
+        """Registra observador(medico, especialidad), llamado en cada agregar_especialidad."""
+        self.__observadores__.append(observador)
+
     def obtener_matricula(self) -> str:
         return self.__matricula__
-        
+
+    def obtener_nombre(self) -> str:
+        return self.__medico__
+
+    def obtener_especialidades(self) -> List[Especialidad]:
+        return self.__especialidad__
+
+    def obtener_especialidades_por_indice_dia(self, indice: int) -> Tuple[str, ...]:
+        """Especialidades que atiende el día indicado (0 = lunes, como datetime.weekday())."""
+        return self.__especialidades_por_dia__[indice]
+
     def obtener_especialidad_para_dia(self, dia: str) -> List[str]:
         if not dia or dia.strip() == "":
             return []
         especialidades_encontradas = []
-        dias_lista = [d.strip() for d in dia.split(",")]
-        for dia_individual in dias_lista:
-            for especialidad in self.__especialidad__:
-                if especialidad.verificar_dia(dia_individual):
-                        esp_name = especialidad.obtener_especialidad()
-                        if esp_name not in especialidades_encontradas:
-                            especialidades_encontradas.append(esp_name)
-        else:
-            # Día único
-            for especialidad in self.__especialidad__:
-                if especialidad.verificar_dia(dia):
-                    esp_name = especialidad.obtener_especialidad()
-                    if esp_name not in especialidades_encontradas:
-                        especialidades_encontradas.append(esp_name)
-        
+        # Acepta un día o varios separados por coma
+        for dia_individual in dia.split(","):
+            indice = indice_dia(dia_individual)
+            if indice is None:
+                continue
+            for esp_name in self.__especialidades_por_dia__[indice]:
+                if esp_name not in especialidades_encontradas:
+                    especialidades_encontradas.append(esp_name)
         return especialidades_encontradas
-     
+
     def __str__(self) -> str:
             especialidades_str = ",\n".join([str(esp) for esp in self.__especialidad__])
-            return f"{self.__medico__}, {self.__matricula__}, [{especialidades_str}]"
\ No newline at end of file
+            return f"{self.__medico__}, {self.__matricula__}, [{especialidades_str}]"
@@ -0,0 +1,174 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Límites superiores (en segundos) de los intervalos del histograma de latencia
+LIMITES_LATENCIA = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                    0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class MetricasOperacion:
+    """Llamadas, errores por tipo de excepción e histograma de latencia de una operación."""
+
+    def __init__(self, nombre: str):
+        self.__nombre__ = nombre
+        self.__cerrojo__ = threading.Lock()
+        self.__llamadas__ = 0
+        self.__errores__: Dict[str, int] = {}
+        # Un contador por intervalo de LIMITES_LATENCIA, más uno final para lo que los supera
+        self.__intervalos__: List[int] = [0] * (len(LIMITES_LATENCIA) + 1)
+        self.__segundos__ = 0.0
+        self.__maximo__ = 0.0
+
+    def registrar(self, segundos: float, error: Optional[str] = None):
+        intervalo = bisect_left(LIMITES_LATENCIA, segundos)
+        # Sin `with`: se llama en cada operación medida y así cuesta bastante menos
+        self.__cerrojo__.acquire()
+        try:
+            self.__llamadas__ += 1
+            self.__intervalos__[intervalo] += 1
+            self.__segundos__ += segundos
+            if segundos > self.__maximo__:
+                self.__maximo__ = segundos
+            if error is not None:
+                self.__errores__[error] = self.__errores__.get(error, 0) + 1
+        finally:
+            self.__cerrojo__.release()
+
+    def obtener_nombre(self) -> str:
+        return self.__nombre__
+
+    def obtener_llamadas(self) -> int:
+        return self.__llamadas__
+
+    def obtener_errores(self) -> Dict[str, int]:
+        """Cantidad de errores por nombre de excepción."""
+        with self.__cerrojo__:
+            return dict(self.__errores__)
+
+    def obtener_segundos(self) -> float:
+        return self.__segundos__
+
+    def obtener_maximo(self) -> float:
+        return self.__maximo__
+
+    def obtener_histograma(self) -> List[Tuple[float, int]]:
+        """(límite superior, llamadas acumuladas hasta ese límite), como los buckets de Prometheus; el último es infinito."""
+        with self.__cerrojo__:
+            intervalos = list(self.__intervalos__)
+        acumuladas = 0
+        histograma = []
+        for limite, cantidad in zip(LIMITES_LATENCIA + (float("inf"),), intervalos):
+            acumuladas += cantidad
+            histograma.append((limite, acumuladas))
+        return histograma
+
+    def percentil(self, porcentaje: float) -> float:
+        """Estimación del percentil: el límite superior del intervalo donde cae (el máximo si es el último)."""
+        histograma = self.obtener_histograma()
+        total = histograma[-1][1]
+        if total == 0:
+            return 0.0
+        for limite, acumuladas in histograma:
+            if acumuladas >= total * porcentaje / 100:
+                return min(limite, self.__maximo__)
+        return self.__maximo__
+
+class Metricas:
+    """Métricas de las operaciones de una Clinica (ver Clinica.activar_metricas).
+
+    Cada operación medida registra su latencia y, si lanza una excepción, el tipo de error. Solo se
+    mide la llamada más externa de cada hilo: si una operación medida llama a otra (cancelar_turno a
+    obtener_turno, por ejemplo), la interna no se cuenta. Las métricas se pueden exportar en el
+    formato de texto de Prometheus.
+    """
+
+    def __init__(self, prefijo: str = "clinica"):
+        self.__prefijo__ = prefijo
+        self.__cerrojo__ = threading.Lock()
+        self.__operaciones__: Dict[str, MetricasOperacion] = {}
+        # Por hilo, si ya hay una operación medida en curso (las anidadas no se registran)
+        self.__hilo__ = threading.local()
+
+    def obtener_operacion(self, nombre: str) -> MetricasOperacion:
+        operacion = self.__operaciones__.get(nombre)
+        if operacion is None:
+            with self.__cerrojo__:
+                operacion = self.__operaciones__.setdefault(nombre, MetricasOperacion(nombre))
+        return operacion
+
+    def obtener_operaciones(self) -> List[MetricasOperacion]:
+        """Las operaciones con al menos una llamada, por nombre."""
+        return sorted((o for o in list(self.__operaciones__.values()) if o.obtener_llamadas()),
+                      key=MetricasOperacion.obtener_nombre)
+
+    def medir(self, nombre: str, funcion: Callable) -> Callable:
+        """Devuelve funcion envuelta para registrar cada llamada en la operación `nombre`.
+
+        Las llamadas hechas mientras el mismo hilo ya está dentro de otra operación medida no se registran.
+        """
+        operacion = self.obtener_operacion(nombre)
+        registrar = operacion.registrar
+        reloj = time.perf_counter
+        hilo = self.__hilo__
+
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            if getattr(hilo, "midiendo", False):
+                return funcion(*args, **kwargs)
+            hilo.midiendo = True
+            inicio = reloj()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except Exception as e:
+                registrar(reloj() - inicio, type(e).__name__)
+                raise
+            finally:
+                hilo.midiendo = False
+            registrar(reloj() - inicio)
+            return resultado
+        return medida
+
+    def exportar_prometheus(self) -> str:
+        """Texto con todas las métricas en el formato de exposición de Prometheus."""
+        prefijo = self.__prefijo__
+        operaciones = self.obtener_operaciones()
+        lineas = [f"# HELP {prefijo}_llamadas_total Llamadas a cada operación de la clínica.",
+                  f"# TYPE {prefijo}_llamadas_total counter"]
+        lineas += [f'{prefijo}_llamadas_total{{operacion="{o.obtener_nombre()}"}} {o.obtener_llamadas()}' for o in operaciones]
+        lineas += [f"# HELP {prefijo}_errores_total Llamadas que terminaron en una excepción, por tipo.",
+                   f"# TYPE {prefijo}_errores_total counter"]
+        for operacion in operaciones:
+            for tipo, cantidad in sorted(operacion.obtener_errores().items()):
+                lineas.append(f'{prefijo}_errores_total{{operacion="{operacion.obtener_nombre()}",tipo="{tipo}"}} {cantidad}')
+        lineas += [f"# HELP {prefijo}_latencia_segundos Duración de cada llamada.",
+                   f"# TYPE {prefijo}_latencia_segundos histogram"]
+        for operacion in operaciones:
+            etiqueta = f'operacion="{operacion.obtener_nombre()}"'
+            histograma = operacion.obtener_histograma()
+            for limite, acumuladas in histograma:
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                lineas.append(f'{prefijo}_latencia_segundos_bucket{{{etiqueta},le="{le}"}} {acumuladas}')
+            lineas.append(f"{prefijo}_latencia_segundos_sum{{{etiqueta}}} {operacion.obtener_segundos():.9f}")
+            lineas.append(f"{prefijo}_latencia_segundos_count{{{etiqueta}}} {histograma[-1][1]}")
+        return "\n".join(lineas) + "\n"
+
+    def guardar(self, ruta: str):
+        """Escribe exportar_prometheus() en ruta, reemplazando el archivo de una vez (p. ej. para node_exporter)."""
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(self.exportar_prometheus())
+        os.replace(temporal, ruta)
+
+    def resumen(self) -> List[str]:
+        """Una línea legible por operación: llamadas, errores y latencia."""
+        lineas = []
+        for operacion in self.obtener_operaciones():
+            errores = sum(operacion.obtener_errores().values())
+            promedio = operacion.obtener_segundos() / operacion.obtener_llamadas()
+            lineas.append(f"{operacion.obtener_nombre()}: {operacion.obtener_llamadas()} llamadas, {errores} errores, "
+                          f"promedio {promedio * 1e6:.1f} µs, p50 <= {operacion.percentil(50) * 1e6:.0f} µs, "
+                          f"p99 <= {operacion.percentil(99) * 1e6:.0f} µs, máximo {operacion.obtener_maximo() * 1e6:.0f} µs")
+        return lineas
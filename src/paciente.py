@@ -1,4 +1,5 @@
 class Paciente:
+    __slots__ = ("__DNI__", "__paciente__", "__nacimiento__")
 
     def __init__(self, dni_paciente :str , nombre_paciente :str , fecha_nacimiento :str):
         self.__DNI__ = dni_paciente
@@ -7,6 +8,12 @@ class Paciente:
 
     def obtener_dni(self):
         return self.__DNI__
+
+    def obtener_nombre(self):
+        return self.__paciente__
+
+    def obtener_fecha_nacimiento(self):
+        return self.__nacimiento__
     
     def __str__(self):
         return f'Paciente: {self.__paciente__}, DNI: {self.__DNI__}, Fecha de Nacimiento: {self.__nacimiento__}'
\ No newline at end of file
@@ -3,13 +3,17 @@ from typing import List
 from src.paciente import Paciente
 from src.medico import Medico
 from src.turno import Turno
+from src.simbolos import internar_todos
 class Receta:
+    __slots__ = ("__paciente__", "__medico__", "__medicamentos__", "__fecha__")
 
-    def __init__(self, paciente :Paciente , medico :Medico, medicamentos :List[str]):
+    def __init__(self, paciente :Paciente , medico :Medico, medicamentos :List[str], fecha :datetime = None):
         self.__paciente__ = paciente     
         self.__medico__ = medico          
-        self.__medicamentos__ = medicamentos  
-        self.__fecha__ = datetime.now()
+        # Lista propia con los nombres compartidos por todas las recetas que los incluyen
+        self.__medicamentos__ = internar_todos(medicamentos)
+        # La fecha se indica al reconstruir una receta ya emitida (p. ej. desde el almacenamiento)
+        self.__fecha__ = fecha if fecha is not None else datetime.now()
     def obtener_paciente(self) -> Paciente:
         return self.__paciente__
     
@@ -0,0 +1,184 @@
+import logging
+import multiprocessing
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.clinica import Clinica
+from src.medico import Medico
+from src.turno import Turno
+
+registro = logging.getLogger(__name__)
+
+# (mes "aaaa-mm", matrícula, especialidad) -> cantidad
+Conteos = Dict[Tuple[str, str, str], int]
+
+# Partes en que se divide el trabajo por cada proceso: con varias, un proceso que termina
+# antes toma otra en lugar de quedar esperando
+PARTES_POR_PROCESO = 4
+
+# Turnos de la clínica que usan los procesos del pool. Los heredan al crearse con fork, sin
+# copiarlos por una tubería ni serializarlos (son millones de objetos)
+_turnos_del_proceso: Optional[List[Turno]] = None
+
+def _iniciar_proceso(turnos: List[Turno]):
+    global _turnos_del_proceso
+    _turnos_del_proceso = turnos
+
+def nombre_mes(fecha: datetime) -> str:
+    return f"{fecha.year:04}-{fecha.month:02}"
+
+def dias_por_mes(desde: datetime, hasta: datetime) -> Dict[str, List[int]]:
+    """Mes "aaaa-mm" -> cantidad de cada día de la semana (lunes = 0) con desde <= día (a las 0 h) < hasta."""
+    dias: Dict[str, List[int]] = {}
+    dia = desde.date() if desde.time() == datetime.min.time() else desde.date() + timedelta(days=1)
+    ultimo = hasta.date() if hasta.time() != datetime.min.time() else hasta.date() - timedelta(days=1)
+    while dia <= ultimo:
+        dias.setdefault(nombre_mes(dia), [0] * 7)[dia.weekday()] += 1
+        dia += timedelta(days=1)
+    return dias
+
+def dias_de_atencion(clinica: Clinica, desde: datetime, hasta: datetime) -> Conteos:
+    """Días de atención de cada especialidad de cada médico, por mes (solo los que tienen alguno)."""
+    dias = dias_por_mes(desde, hasta)
+    atencion: Conteos = {}
+    for medico in clinica.obtener_medicos():
+        for especialidad in medico.obtener_especialidades():
+            mascara = especialidad.obtener_mascara_dias()
+            for mes, cantidades in dias.items():
+                cantidad = sum(c for indice, c in enumerate(cantidades) if mascara >> indice & 1)
+                if cantidad:
+                    atencion[(mes, medico.obtener_matricula(), especialidad.obtener_especialidad())] = cantidad
+    return atencion
+
+def contar_turnos(turnos: Iterable[Turno], desde: datetime, hasta: datetime) -> Conteos:
+    """Turnos con desde <= fecha_hora < hasta por mes, médico y especialidad."""
+    # Mientras se cuenta la clave usa el objeto Medico y el año y mes como números, que es más
+    # rápido que armar el texto; se convierten una vez por clave al final
+    conteos: Dict[Tuple[int, int, Medico, str], int] = {}
+    for turno in turnos:
+        fecha_hora = turno.obtener_fecha_hora()
+        if desde <= fecha_hora < hasta:
+            clave = (fecha_hora.year, fecha_hora.month, turno.obtener_medico(), turno.obtener_especialidad())
+            conteos[clave] = conteos.get(clave, 0) + 1
+    return {(f"{anio:04}-{mes:02}", medico.obtener_matricula(), especialidad): cantidad
+            for (anio, mes, medico, especialidad), cantidad in conteos.items()}
+
+def _contar_parte(parte: Tuple[int, int, datetime, datetime]) -> Conteos:
+    inicio, fin, desde, hasta = parte
+    return contar_turnos(_turnos_del_proceso[inicio:fin], desde, hasta)
+
+def combinar(conteos: Iterable[Conteos]) -> Conteos:
+    """Suma los conteos parciales de cada parte."""
+    total: Conteos = {}
+    for parcial in conteos:
+        for clave, cantidad in parcial.items():
+            total[clave] = total.get(clave, 0) + cantidad
+    return total
+
+def partir(cantidad_turnos: int, partes: int) -> List[Tuple[int, int]]:
+    """Divide los índices de la lista de turnos en `partes` tramos contiguos de tamaño parecido."""
+    partes = max(1, min(partes, cantidad_turnos))
+    return [(cantidad_turnos * i // partes, cantidad_turnos * (i + 1) // partes) for i in range(partes)]
+
+class ReporteUtilizacion:
+    """Horas reservadas contra horas disponibles por mes, médico y especialidad.
+
+    Las horas disponibles salen de los días de atención de cada Especialidad del médico en el mes
+    por la jornada de la clínica (de HORA_APERTURA a HORA_CIERRE); si un médico atiende dos
+    especialidades el mismo día, la jornada cuenta para las dos. Las reservadas son la cantidad
+    de turnos por la duración de un turno.
+    """
+
+    def __init__(self, turnos: Conteos, atencion: Conteos, duracion: timedelta, jornada: timedelta, procesos: int = 1):
+        # (mes, matrícula, especialidad) -> [turnos, días de atención]
+        self.__filas__: Dict[Tuple[str, str, str], List[int]] = {clave: [0, dias] for clave, dias in atencion.items()}
+        for clave, cantidad in turnos.items():
+            self.__filas__.setdefault(clave, [0, 0])[0] = cantidad
+        self.__horas_por_turno__ = duracion / timedelta(hours=1)
+        self.__horas_por_jornada__ = jornada / timedelta(hours=1)
+        self.__procesos__ = procesos
+
+    def obtener_procesos(self) -> int:
+        """Procesos con los que se contaron los turnos (1: en el proceso que pidió el reporte)."""
+        return self.__procesos__
+
+    def obtener_por_medico(self) -> List[Tuple[str, str, str, int, float, float]]:
+        """(mes, matrícula, especialidad, turnos, horas reservadas, horas disponibles), ordenado."""
+        return [(mes, matricula, especialidad, turnos, turnos * self.__horas_por_turno__,
+                 atencion * self.__horas_por_jornada__)
+                for (mes, matricula, especialidad), (turnos, atencion) in sorted(self.__filas__.items())]
+
+    def obtener_por_especialidad(self) -> List[Tuple[str, str, int, float, float]]:
+        """(mes, especialidad, turnos, horas reservadas, horas disponibles) sumando todos los médicos."""
+        totales: Dict[Tuple[str, str], List[int]] = {}
+        for (mes, _, especialidad), (turnos, atencion) in self.__filas__.items():
+            valores = totales.setdefault((mes, especialidad), [0, 0])
+            valores[0] += turnos
+            valores[1] += atencion
+        return [(mes, especialidad, turnos, turnos * self.__horas_por_turno__, atencion * self.__horas_por_jornada__)
+                for (mes, especialidad), (turnos, atencion) in sorted(totales.items())]
+
+    @staticmethod
+    def utilizacion(reservadas: float, disponibles: float) -> float:
+        """Porcentaje de las horas disponibles que están reservadas (0 si no hay disponibles)."""
+        return 100 * reservadas / disponibles if disponibles else 0.0
+
+    def lineas(self) -> Iterator[str]:
+        """Texto del reporte: primero por especialidad y después por médico."""
+        yield f"{'mes':<8} {'especialidad':<24} {'turnos':>8} {'reservadas':>11} {'disponibles':>12} {'uso':>6}"
+        for mes, especialidad, turnos, reservadas, disponibles in self.obtener_por_especialidad():
+            yield (f"{mes:<8} {especialidad:<24} {turnos:>8} {reservadas:>10.1f}h {disponibles:>11.1f}h "
+                   f"{self.utilizacion(reservadas, disponibles):>5.1f}%")
+        yield ""
+        yield f"{'mes':<8} {'matrícula':<10} {'especialidad':<24} {'turnos':>8} {'reservadas':>11} {'disponibles':>12} {'uso':>6}"
+        for mes, matricula, especialidad, turnos, reservadas, disponibles in self.obtener_por_medico():
+            yield (f"{mes:<8} {matricula:<10} {especialidad:<24} {turnos:>8} {reservadas:>10.1f}h {disponibles:>11.1f}h "
+                   f"{self.utilizacion(reservadas, disponibles):>5.1f}%")
+
+def reporte_utilizacion(clinica: Clinica, desde: datetime, hasta: datetime,
+                        duracion: timedelta = timedelta(minutes=30), procesos: Optional[int] = None) -> ReporteUtilizacion:
+    """Calcula el reporte de utilización de [desde, hasta) repartiendo los turnos entre varios procesos.
+
+    procesos=None usa uno por núcleo; procesos=1 calcula todo en este proceso (para comparar o
+    depurar). Los procesos se crean con fork y leen la clínica que heredan, sin copiarla. Un
+    fork con otros hilos vivos (el servidor, un ThreadPoolExecutor, el temporizador del journal)
+    copia los cerrojos que esos hilos tengan tomados y el proceso hijo puede quedar bloqueado
+    para siempre. Por eso, si hay otros hilos, o donde fork no existe (Windows), se calcula en
+    este proceso: se avisa con un warning en el logger de este módulo y
+    ReporteUtilizacion.obtener_procesos() devuelve 1. Pasar los turnos a procesos creados con
+    spawn o forkserver no conviene: convertirlos a un formato que se pueda enviar cuesta tanto
+    como contarlos. No agendar turnos mientras se calcula.
+    """
+    if hasta <= desde:
+        raise ValueError("El final del período debe ser posterior al comienzo")
+    if duracion <= timedelta(0):
+        raise ValueError("La duración del turno debe ser positiva")
+    jornada = timedelta(hours=clinica.HORA_CIERRE - clinica.HORA_APERTURA)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    if procesos > 1:
+        motivo = None
+        if "fork" not in multiprocessing.get_all_start_methods():
+            motivo = "este sistema no tiene fork"
+        elif threading.active_count() > 1:
+            motivo = f"hay {threading.active_count() - 1} hilos más y un fork podría bloquear a los procesos"
+        if motivo is not None:
+            registro.warning("El reporte de utilización se calcula en un solo proceso en lugar de %d: %s", procesos, motivo)
+            procesos = 1
+    # Los procesos no deben consultar el almacenamiento (la conexión no se comparte entre procesos)
+    clinica.precargar()
+    turnos = clinica.obtener_turnos()
+    if procesos <= 1 or len(turnos) < 2:
+        procesos = 1
+        conteos = contar_turnos(turnos, desde, hasta)
+    else:
+        # Tramos contiguos de la lista de turnos, no grupos de médicos: leer un objeto en otro
+        # proceso modifica su contador de referencias, y con fork eso copia la página de memoria
+        # donde está. Los turnos de un médico están repartidos por toda la memoria, los de un
+        # tramo de la lista están juntos: así cada proceso copia solo su parte
+        partes = [(inicio, fin, desde, hasta) for inicio, fin in partir(len(turnos), procesos * PARTES_POR_PROCESO)]
+        contexto = multiprocessing.get_context("fork")
+        with contexto.Pool(procesos, initializer=_iniciar_proceso, initargs=(turnos,)) as pool:
+            conteos = combinar(pool.imap_unordered(_contar_parte, partes))
+    return ReporteUtilizacion(conteos, dias_de_atencion(clinica, desde, hasta), duracion, jornada, procesos)
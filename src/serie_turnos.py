@@ -0,0 +1,170 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.paciente import Paciente
+from src.medico import Medico
+from src.turno import Turno
+from src.simbolos import internar
+
+# Tope de turnos de una serie (cinco años de turnos semanales), para que un error en la fecha
+# final no genere miles de turnos
+MAXIMO_TURNOS_SERIE = 260
+
+class SerieTurnos:
+    """Turnos de un paciente con un médico el mismo día de la semana y a la misma hora, cada `cada_semanas` semanas.
+
+    Guarda solo la primera fecha, la frecuencia y la cantidad: los Turno de cada fecha se crean
+    recién cuando la clínica los necesita (ver Clinica.agendar_serie).
+    """
+    __slots__ = ("__paciente__", "__medico__", "__especialidad__", "__primera__", "__intervalo__", "__cantidad__")
+
+    def __init__(self, paciente: Paciente, medico: Medico, especialidad: str, primera: datetime, cantidad: int,
+                 cada_semanas: int = 1):
+        if cada_semanas < 1:
+            raise ValueError("La serie debe repetirse cada una semana o más")
+        if cantidad < 1:
+            raise ValueError("La serie debe tener al menos un turno")
+        if cantidad > MAXIMO_TURNOS_SERIE:
+            raise ValueError(f"Una serie puede tener hasta {MAXIMO_TURNOS_SERIE} turnos")
+        self.__paciente__ = paciente
+        self.__medico__ = medico
+        self.__especialidad__ = internar(especialidad)
+        self.__primera__ = primera
+        self.__intervalo__ = timedelta(weeks=cada_semanas)
+        self.__cantidad__ = cantidad
+
+    @staticmethod
+    def cantidad_hasta(primera: datetime, hasta: date, cada_semanas: int = 1) -> int:
+        """Cantidad de turnos desde `primera` hasta el día `hasta` (incluido)."""
+        if isinstance(hasta, datetime):
+            hasta = hasta.date()
+        dias = (hasta - primera.date()).days
+        return dias // (7 * cada_semanas) + 1 if dias >= 0 else 0
+
+    def obtener_paciente(self) -> Paciente:
+        return self.__paciente__
+
+    def obtener_medico(self) -> Medico:
+        return self.__medico__
+
+    def obtener_especialidad(self) -> str:
+        return self.__especialidad__
+
+    def obtener_primera(self) -> datetime:
+        return self.__primera__
+
+    def obtener_ultima(self) -> datetime:
+        return self.__primera__ + (self.__cantidad__ - 1) * self.__intervalo__
+
+    def obtener_cada_semanas(self) -> int:
+        return self.__intervalo__.days // 7
+
+    def obtener_fechas(self) -> Iterator[datetime]:
+        fecha_hora = self.__primera__
+        for _ in range(self.__cantidad__):
+            yield fecha_hora
+            fecha_hora += self.__intervalo__
+
+    def contiene(self, fecha_hora: datetime) -> bool:
+        """Si la serie tiene un turno en esa fecha y hora (sin recorrer las fechas)."""
+        diferencia = fecha_hora - self.__primera__
+        if diferencia < timedelta(0):
+            return False
+        numero, resto = divmod(diferencia, self.__intervalo__)
+        return not resto and numero < self.__cantidad__
+
+    def fecha_en_dia(self, dia: date) -> Optional[datetime]:
+        """Fecha y hora del turno de la serie ese día, o None si ese día no tiene."""
+        fecha_hora = datetime.combine(dia, self.__primera__.time())
+        return fecha_hora if self.contiene(fecha_hora) else None
+
+    def crear_turnos(self) -> List[Turno]:
+        return [Turno(self.__paciente__, self.__medico__, fecha_hora, self.__especialidad__)
+                for fecha_hora in self.obtener_fechas()]
+
+    def __len__(self) -> int:
+        return self.__cantidad__
+
+    def __str__(self) -> str:
+        frecuencia = "semanal" if self.obtener_cada_semanas() == 1 else f"cada {self.obtener_cada_semanas()} semanas"
+        return (f"Serie {frecuencia} de {self.__cantidad__} turnos de {self.__especialidad__}: "
+                f"Paciente: {self.__paciente__.obtener_dni()}, Médico: {self.__medico__.obtener_matricula()}, "
+                f"del {self.__primera__:%d/%m/%Y %H:%M} al {self.obtener_ultima():%d/%m/%Y %H:%M}")
+
+class SeriesPendientes:
+    """Series agendadas cuyos turnos todavía no se crearon, por médico, por paciente y por horario semanal.
+
+    Una fecha solo puede chocar con las series del mismo día de la semana y hora, así que
+    verificar si está ocupada revisa unas pocas series y no todas sus fechas.
+    """
+
+    def __init__(self):
+        # (matrícula o DNI, día de la semana, hora) -> series en ese horario
+        self.__horarios_medico__: Dict[Tuple[str, int, time], List[SerieTurnos]] = {}
+        self.__horarios_paciente__: Dict[Tuple[str, int, time], List[SerieTurnos]] = {}
+        self.__por_medico__: Dict[str, List[SerieTurnos]] = {}
+        self.__por_paciente__: Dict[str, List[SerieTurnos]] = {}
+        self.__cantidad__ = 0
+
+    @staticmethod
+    def _claves(serie: SerieTurnos) -> Tuple[Tuple[str, int, time], Tuple[str, int, time]]:
+        primera = serie.obtener_primera()
+        horario = (primera.weekday(), primera.time())
+        return ((serie.obtener_medico().obtener_matricula(),) + horario,
+                (serie.obtener_paciente().obtener_dni(),) + horario)
+
+    def agregar(self, serie: SerieTurnos):
+        clave_medico, clave_paciente = self._claves(serie)
+        self.__horarios_medico__.setdefault(clave_medico, []).append(serie)
+        self.__horarios_paciente__.setdefault(clave_paciente, []).append(serie)
+        self.__por_medico__.setdefault(clave_medico[0], []).append(serie)
+        self.__por_paciente__.setdefault(clave_paciente[0], []).append(serie)
+        self.__cantidad__ += 1
+
+    def quitar(self, serie: SerieTurnos) -> bool:
+        """Quita la serie; devuelve False si ya no estaba (p. ej. otro hilo ya creó sus turnos)."""
+        clave_medico, clave_paciente = self._claves(serie)
+        series = self.__horarios_medico__.get(clave_medico, [])
+        if not any(s is serie for s in series):
+            return False
+        for indice, clave in ((self.__horarios_medico__, clave_medico), (self.__horarios_paciente__, clave_paciente),
+                              (self.__por_medico__, clave_medico[0]), (self.__por_paciente__, clave_paciente[0])):
+            restantes = [s for s in indice[clave] if s is not serie]
+            if restantes:
+                indice[clave] = restantes
+            else:
+                del indice[clave]
+        self.__cantidad__ -= 1
+        return True
+
+    def en_horario_de_medico(self, matricula: str, fecha_hora: datetime) -> Optional[SerieTurnos]:
+        """Serie del médico con un turno en esa fecha y hora, o None."""
+        return self._en_horario(self.__horarios_medico__, matricula, fecha_hora)
+
+    def en_horario_de_paciente(self, dni: str, fecha_hora: datetime) -> Optional[SerieTurnos]:
+        return self._en_horario(self.__horarios_paciente__, dni, fecha_hora)
+
+    def en_el_mismo_horario(self, matricula: str, dni: str, fecha_hora: datetime) -> List[SerieTurnos]:
+        """Series del médico o del paciente el mismo día de la semana y a la misma hora: las únicas que pueden chocar."""
+        horario = (fecha_hora.weekday(), fecha_hora.time())
+        return (self.__horarios_medico__.get((matricula,) + horario, []) +
+                self.__horarios_paciente__.get((dni,) + horario, []))
+
+    @staticmethod
+    def _en_horario(horarios: Dict[Tuple[str, int, time], List[SerieTurnos]], clave: str,
+                    fecha_hora: datetime) -> Optional[SerieTurnos]:
+        for serie in horarios.get((clave, fecha_hora.weekday(), fecha_hora.time()), ()):
+            if serie.contiene(fecha_hora):
+                return serie
+        return None
+
+    def de_medico(self, matricula: str) -> List[SerieTurnos]:
+        return list(self.__por_medico__.get(matricula, ()))
+
+    def de_paciente(self, dni: str) -> List[SerieTurnos]:
+        return list(self.__por_paciente__.get(dni, ()))
+
+    def todas(self) -> List[SerieTurnos]:
+        return [serie for series in self.__por_medico__.values() for serie in series]
+
+    def __len__(self) -> int:
+        return self.__cantidad__
@@ -0,0 +1,252 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from src.clinica import (
+    Clinica,
+    PacienteNoEncontradoException,
+    MedicoNoDisponibleException,
+    TurnoOcupadoException,
+    TurnoNoEncontradoException,
+    RecetaInvalidaException
+)
+from src.turno import Turno
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.historiaclinica import FORMATO_FECHA
+from src.importador import obtener_campo, parsear_fecha
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+# Largo máximo de una solicitud (una línea de JSON)
+LIMITE_LINEA = 1024 * 1024
+
+# Errores que se devuelven al cliente; cualquier otro es un error interno del servidor
+ERRORES_DE_SOLICITUD = (
+    ValueError,
+    TypeError,
+    PacienteNoEncontradoException,
+    MedicoNoDisponibleException,
+    TurnoOcupadoException,
+    TurnoNoEncontradoException,
+    RecetaInvalidaException
+)
+
+def parsear_fecha_hora(texto: Any) -> datetime:
+    """Convierte 'aaaa-mm-ddTHH:MM[:SS]' (ISO 8601) en datetime."""
+    try:
+        return datetime.fromisoformat(str(texto))
+    except ValueError:
+        raise ValueError(f"Fecha y hora inválida: {texto!r}. Usá el formato aaaa-mm-ddTHH:MM.")
+
+def fecha_hora_opcional(solicitud: Dict, nombre: str) -> Optional[datetime]:
+    valor = solicitud.get(nombre)
+    return None if valor in (None, "") else parsear_fecha_hora(valor)
+
+def obtener_lista(solicitud: Dict, nombre: str) -> list:
+    valor = solicitud.get(nombre)
+    if not isinstance(valor, list):
+        raise ValueError(f"El campo {nombre} debe ser una lista")
+    return valor
+
+def obtener_especialidad(datos: Any) -> Especialidad:
+    if not isinstance(datos, dict):
+        raise ValueError("Cada especialidad debe ser un objeto con especialidad y dias")
+    especialidad = Especialidad(obtener_campo(datos, "especialidad"), obtener_lista(datos, "dias"))
+    if not especialidad.obtener_mascara_dias():
+        raise ValueError(f"La especialidad no tiene días de atención válidos: {datos['dias']}")
+    return especialidad
+
+def obtener_id_turno(solicitud: Dict) -> int:
+    valor = solicitud.get("id_turno")
+    if not isinstance(valor, int) or isinstance(valor, bool):
+        raise ValueError("El campo id_turno debe ser un número entero")
+    return valor
+
+def datos_turno(turno: Turno) -> Dict:
+    return {"id_turno": turno.obtener_id(),
+            "dni": turno.obtener_paciente().obtener_dni(),
+            "matricula": turno.obtener_medico().obtener_matricula(),
+            "especialidad": turno.obtener_especialidad(),
+            "fecha_hora": turno.obtener_fecha_hora().isoformat()}
+
+class ServidorClinica:
+    """Expone las operaciones de una Clinica por TCP, con un objeto JSON por línea.
+
+    Cada solicitud indica la operación y sus datos, p. ej.
+    {"id": 1, "operacion": "agendar_turno", "dni": "...", "matricula": "...", "especialidad": "...",
+    "fecha_hora": "2025-01-06T08:00"}, y se responde con {"id": 1, "ok": true, "resultado": ...}
+    o {"id": 1, "ok": false, "error": "TurnoOcupadoException", "mensaje": "..."}.
+
+    El event loop solo lee, decodifica y escribe: las llamadas a la clínica (que pueden esperar
+    un cerrojo o armar una historia larga) corren en un pool de hilos, así que un cliente lento
+    no demora a los demás. Las solicitudes de una misma conexión se responden en orden.
+    """
+
+    def __init__(self, clinica: Clinica, hilos: Optional[int] = None):
+        self.__clinica__ = clinica
+        self.__executor__ = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="clinica")
+        self.__servidor__: Optional[asyncio.AbstractServer] = None
+        self.__operaciones__: Dict[str, Callable[[Dict], Any]] = {
+            "agregar_paciente": self._agregar_paciente,
+            "agregar_medico": self._agregar_medico,
+            "agregar_especialidad": self._agregar_especialidad,
+            "agendar_turno": self._agendar_turno,
+            "cancelar_turno": self._cancelar_turno,
+            "reprogramar_turno": self._reprogramar_turno,
+            "emitir_receta": self._emitir_receta,
+            "historia": self._historia,
+        }
+
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO) -> int:
+        """Empieza a aceptar conexiones y devuelve el puerto (útil con puerto=0)."""
+        self.__servidor__ = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_LINEA)
+        return self.__servidor__.sockets[0].getsockname()[1]
+
+    async def servir(self):
+        await self.__servidor__.serve_forever()
+
+    async def detener(self):
+        if self.__servidor__ is not None:
+            self.__servidor__.close()
+            await self.__servidor__.wait_closed()
+        self.__executor__.shutdown(wait=True)
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # La línea supera LIMITE_LINEA: no se puede saber dónde empieza la próxima
+                    escritor.write(self._codificar({"ok": False, "error": "ValueError",
+                                                    "mensaje": "La solicitud es demasiado larga"}))
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                escritor.write(self._codificar(await self.procesar(linea)))
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    @staticmethod
+    def _codificar(respuesta: Dict) -> bytes:
+        return json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    async def procesar(self, linea: bytes) -> Dict:
+        """Decodifica una solicitud, la ejecuta en el pool de hilos y devuelve la respuesta."""
+        try:
+            solicitud = json.loads(linea)
+        except ValueError:
+            return {"ok": False, "error": "ValueError", "mensaje": "La solicitud no es un JSON válido"}
+        if not isinstance(solicitud, dict):
+            return {"ok": False, "error": "ValueError", "mensaje": "La solicitud debe ser un objeto JSON"}
+        respuesta = {"id": solicitud.get("id")}
+        operacion = self.__operaciones__.get(solicitud.get("operacion"))
+        if operacion is None:
+            respuesta.update(ok=False, error="ValueError", mensaje=f"Operación desconocida: {solicitud.get('operacion')!r}")
+            return respuesta
+        try:
+            resultado = await asyncio.get_running_loop().run_in_executor(self.__executor__, operacion, solicitud)
+        except ERRORES_DE_SOLICITUD as e:
+            respuesta.update(ok=False, error=type(e).__name__, mensaje=str(e))
+        except Exception as e:
+            # Un error inesperado no corta la conexión ni afecta a los demás clientes
+            respuesta.update(ok=False, error="ErrorInterno", mensaje=f"{type(e).__name__}: {e}")
+        else:
+            respuesta.update(ok=True, resultado=resultado)
+        return respuesta
+
+    # Operaciones: corren en el pool de hilos y devuelven algo serializable a JSON
+
+    def _agregar_paciente(self, solicitud: Dict) -> Dict:
+        fecha_nacimiento = parsear_fecha(obtener_campo(solicitud, "fecha_nacimiento"))
+        paciente = Paciente(obtener_campo(solicitud, "dni"), obtener_campo(solicitud, "nombre"), fecha_nacimiento)
+        self.__clinica__.agregar_paciente(paciente)
+        return {"dni": paciente.obtener_dni()}
+
+    def _agregar_medico(self, solicitud: Dict) -> Dict:
+        especialidades = [obtener_especialidad(e) for e in obtener_lista(solicitud, "especialidades")] \
+            if solicitud.get("especialidades") else []
+        medico = Medico(obtener_campo(solicitud, "matricula"), obtener_campo(solicitud, "nombre"), especialidades)
+        self.__clinica__.agregar_medico(medico)
+        return {"matricula": medico.obtener_matricula()}
+
+    def _agregar_especialidad(self, solicitud: Dict) -> Dict:
+        especialidad = obtener_especialidad(solicitud)
+        self.__clinica__.agregar_especialidad_a_medico(obtener_campo(solicitud, "matricula"), especialidad)
+        return {"especialidad": especialidad.obtener_especialidad(), "dias": especialidad.obtener_dias()}
+
+    def _agendar_turno(self, solicitud: Dict) -> Dict:
+        turno = self.__clinica__.agendar_turno(obtener_campo(solicitud, "dni"), obtener_campo(solicitud, "matricula"),
+                                               obtener_campo(solicitud, "especialidad"),
+                                               parsear_fecha_hora(obtener_campo(solicitud, "fecha_hora")))
+        return datos_turno(turno)
+
+    def _cancelar_turno(self, solicitud: Dict) -> Dict:
+        return datos_turno(self.__clinica__.cancelar_turno(obtener_id_turno(solicitud)))
+
+    def _reprogramar_turno(self, solicitud: Dict) -> Dict:
+        turno = self.__clinica__.reprogramar_turno(obtener_id_turno(solicitud),
+                                                   parsear_fecha_hora(obtener_campo(solicitud, "fecha_hora")))
+        return datos_turno(turno)
+
+    def _emitir_receta(self, solicitud: Dict) -> Dict:
+        medicamentos = [str(m).strip() for m in obtener_lista(solicitud, "medicamentos") if str(m).strip()]
+        receta = self.__clinica__.emitir_receta(obtener_campo(solicitud, "dni"), obtener_campo(solicitud, "matricula"),
+                                                medicamentos)
+        return {"fecha": receta.obtener_fecha().isoformat(), "medicamentos": receta.obtener_medicamentos()}
+
+    def _historia(self, solicitud: Dict) -> Dict:
+        # Una página de la historia (la 1 es la más reciente), como en HistoriaClinica.renderizar
+        dni = obtener_campo(solicitud, "dni")
+        total, lineas = self.__clinica__.renderizar_historia(
+            dni, fecha_hora_opcional(solicitud, "desde"), fecha_hora_opcional(solicitud, "hasta"),
+            int(solicitud.get("pagina", 1)), int(solicitud.get("por_pagina", 20)))
+        paciente = self.__clinica__.obtener_historiales_por_dni(dni).obtener_paciente()
+        return {"dni": dni, "nombre": paciente.obtener_nombre(), "total": total,
+                "formato_fecha": FORMATO_FECHA, "lineas": lineas}
+
+class ClienteClinica:
+    """Cliente mínimo del protocolo de ServidorClinica: una solicitud por vez por conexión."""
+
+    def __init__(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.__lector__ = lector
+        self.__escritor__ = escritor
+        self.__siguiente_id__ = 0
+
+    @classmethod
+    async def conectar(cls, host: str = HOST, puerto: int = PUERTO) -> "ClienteClinica":
+        lector, escritor = await asyncio.open_connection(host, puerto, limit=LIMITE_LINEA)
+        return cls(lector, escritor)
+
+    async def pedir(self, operacion: str, **datos) -> Dict:
+        """Envía una solicitud y espera su respuesta (el dict completo, con ok y resultado o error)."""
+        self.__siguiente_id__ += 1
+        solicitud = dict(datos, id=self.__siguiente_id__, operacion=operacion)
+        self.__escritor__.write(json.dumps(solicitud, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self.__escritor__.drain()
+        linea = await self.__lector__.readline()
+        if not linea:
+            raise ConnectionError("El servidor cerró la conexión")
+        return json.loads(linea)
+
+    async def cerrar(self):
+        self.__escritor__.close()
+        await self.__escritor__.wait_closed()
+
+async def servir(clinica: Clinica, host: str = HOST, puerto: int = PUERTO, hilos: Optional[int] = None):
+    """Atiende clientes hasta que se interrumpa el proceso."""
+    servidor = ServidorClinica(clinica, hilos)
+    puerto = await servidor.iniciar(host, puerto)
+    print(f"Escuchando en {host}:{puerto}", flush=True)
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.detener()
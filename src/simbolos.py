@@ -0,0 +1,45 @@
+from typing import Dict, Iterable, List
+
+# Textos distintos que guarda SIMBOLOS: muy por encima de los pocos cientos de especialidades y
+# medicamentos reales, pero acota la memoria si llegan textos libres (errores de tipeo, importaciones)
+LIMITE_SIMBOLOS = 10000
+
+class TablaDeSimbolos(Dict[str, str]):
+    """Guarda una sola copia de cada texto que se repite en muchos objetos (texto -> el mismo texto).
+
+    Especialidades y medicamentos llegan como textos nuevos en cada alta (de la línea de
+    comandos, de un archivo importado o del almacenamiento), aunque sean siempre los mismos
+    pocos cientos de nombres. internar() devuelve siempre el mismo objeto para textos iguales:
+    los duplicados se liberan y comparar dos nombres internados es comparar identidades (== en
+    CPython compara primero la identidad). Es como sys.intern, pero con una tabla propia que se
+    puede medir; solo conviene para textos de un vocabulario acotado, no para nombres o DNI.
+
+    La tabla nunca se vacía (sus textos viven lo que el proceso). Por eso, con `limite` textos
+    guardados, los textos nuevos se devuelven tal cual, sin internar; los ya guardados se siguen
+    compartiendo.
+    """
+
+    def __init__(self, limite: int = LIMITE_SIMBOLOS):
+        super().__init__()
+        self.__limite__ = limite
+
+    def obtener_limite(self) -> int:
+        return self.__limite__
+
+    def internar(self, texto: str) -> str:
+        simbolo = self.get(texto)
+        if simbolo is not None:
+            return simbolo
+        if len(self) >= self.__limite__:
+            return texto
+        # setdefault es una sola operación para otros hilos: todos reciben el mismo objeto
+        return self.setdefault(texto, texto)
+
+    def internar_todos(self, textos: Iterable[str]) -> List[str]:
+        buscar, internar = self.get, self.internar
+        return [buscar(texto) or internar(texto) for texto in textos]
+
+# Tabla que comparten Especialidad, Turno y Receta
+SIMBOLOS = TablaDeSimbolos()
+internar = SIMBOLOS.internar
+internar_todos = SIMBOLOS.internar_todos
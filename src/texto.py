@@ -0,0 +1,7 @@
+import unicodedata
+
+def normalizar_texto(texto: str) -> str:
+    """Forma canónica para buscar: minúsculas, sin tildes y con los espacios simplificados."""
+    if not texto.isascii():
+        texto = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return " ".join(texto.lower().split())
@@ -1,14 +1,30 @@
 from datetime import datetime
+from typing import Optional
 from src.paciente import Paciente
 from src.medico import Medico
+from src.simbolos import SIMBOLOS, internar
+
+# get de la tabla de símbolos antes de internar(): se llama en cada turno y casi siempre el texto ya está
+_buscar = SIMBOLOS.get
+
 class Turno:
+    # Sin __dict__ por instancia: con millones de turnos es la mayor parte de la memoria
+    __slots__ = ("__paciente__", "__medico__", "__fecha_hora__", "__especialidad__", "__id__")
 
-    def __init__(self, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str):
+    def __init__(self, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str,
+                 id_turno: Optional[int] = None):
         self.__paciente__ = paciente
         self.__medico__ = medico
         self.__fecha_hora__ = fecha_hora
-        self.__especialidad__ = especialidad
+        # Las especialidades se repiten en millones de turnos: todos comparten el mismo texto
+        self.__especialidad__ = _buscar(especialidad) or internar(especialidad)
+        # Lo asigna la clínica al registrarlo; al reprogramar, el turno nuevo conserva el del anterior
+        self.__id__ = id_turno
 
+    def obtener_id(self) -> Optional[int]:
+        return self.__id__
+    def asignar_id(self, id_turno: int):
+        self.__id__ = id_turno
     def obtener_fecha_hora(self) -> datetime:
         return self.__fecha_hora__ 
     def obtener_medico(self) -> Medico:
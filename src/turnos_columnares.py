@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from src.turno import Turno
+
+# NumPy es opcional: solo hace falta para usar Clinica(columnar=True)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CAPACIDAD_INICIAL = 1024
+EPOCH = datetime(1970, 1, 1)
+SEGUNDO = timedelta(seconds=1)
+# datetime64 cuenta desde el 1/1/1970, que fue jueves (lunes = 0)
+DIA_SEMANA_EPOCH = 3
+
+class TurnosColumnares:
+    """Copia de los turnos de la clínica en columnas de NumPy, para estadísticas vectorizadas.
+
+    fecha_hora se guarda como datetime64 (segundos) y matrícula, DNI y especialidad como códigos
+    enteros; cada columna es un arreglo que crece duplicando su capacidad. Los conteos recorren
+    los arreglos con operaciones de NumPy en lugar de iterar objetos Turno. Quitar un turno mueve
+    la última fila a su lugar (el orden de las filas no importa para los conteos).
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("Los turnos columnares necesitan NumPy: pip install numpy")
+        self.__cantidad__ = 0
+        self.__fechas__ = np.empty(CAPACIDAD_INICIAL, dtype="datetime64[s]")
+        self.__medicos__ = np.empty(CAPACIDAD_INICIAL, dtype=np.int32)
+        self.__pacientes__ = np.empty(CAPACIDAD_INICIAL, dtype=np.int32)
+        self.__especialidades__ = np.empty(CAPACIDAD_INICIAL, dtype=np.int32)
+        self.__ids__ = np.empty(CAPACIDAD_INICIAL, dtype=np.int64)
+        # Id del turno -> fila
+        self.__posiciones__: Dict[int, int] = {}
+        # Valor -> código y código -> valor de cada columna codificada
+        self.__codigos_medico__: Dict[str, int] = {}
+        self.__codigos_paciente__: Dict[str, int] = {}
+        self.__codigos_especialidad__: Dict[str, int] = {}
+        self.__matriculas__: List[str] = []
+        self.__dnis__: List[str] = []
+        self.__nombres_especialidad__: List[str] = []
+
+    def _asegurar_capacidad(self, cantidad: int):
+        capacidad = len(self.__fechas__)
+        if cantidad <= capacidad:
+            return
+        while capacidad < cantidad:
+            capacidad *= 2
+        for nombre in ("__fechas__", "__medicos__", "__pacientes__", "__especialidades__", "__ids__"):
+            anterior = getattr(self, nombre)
+            nuevo = np.empty(capacidad, dtype=anterior.dtype)
+            nuevo[:self.__cantidad__] = anterior[:self.__cantidad__]
+            setattr(self, nombre, nuevo)
+
+    @staticmethod
+    def _codificar(valor: str, codigos: Dict[str, int], valores: List[str]) -> int:
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(valores)
+            valores.append(valor)
+        return codigo
+
+    def agregar_turno(self, turno: Turno):
+        self.agregar_turnos([turno])
+
+    def agregar_turnos(self, turnos: List[Turno]):
+        inicio = self.__cantidad__
+        fin = inicio + len(turnos)
+        self._asegurar_capacidad(fin)
+        codificar = self._codificar
+        # Convertir cada datetime a segundos en Python es varias veces más rápido que dejar que NumPy lo haga
+        self.__fechas__[inicio:fin] = np.array([(t.obtener_fecha_hora() - EPOCH) // SEGUNDO for t in turnos],
+                                               dtype=np.int64).view("datetime64[s]")
+        self.__medicos__[inicio:fin] = [codificar(t.obtener_medico().obtener_matricula(), self.__codigos_medico__, self.__matriculas__)
+                                        for t in turnos]
+        self.__pacientes__[inicio:fin] = [codificar(t.obtener_paciente().obtener_dni(), self.__codigos_paciente__, self.__dnis__)
+                                          for t in turnos]
+        self.__especialidades__[inicio:fin] = [codificar(t.obtener_especialidad(), self.__codigos_especialidad__, self.__nombres_especialidad__)
+                                               for t in turnos]
+        ids = [t.obtener_id() for t in turnos]
+        self.__ids__[inicio:fin] = ids
+        self.__posiciones__.update(zip(ids, range(inicio, fin)))
+        self.__cantidad__ = fin
+
+    def quitar_turno(self, turno: Turno) -> bool:
+        """Quita la fila del turno (por su id); devuelve False si no estaba."""
+        posicion = self.__posiciones__.pop(turno.obtener_id(), None)
+        if posicion is None:
+            return False
+        ultima = self.__cantidad__ - 1
+        if posicion != ultima:
+            for columna in (self.__fechas__, self.__medicos__, self.__pacientes__, self.__especialidades__, self.__ids__):
+                columna[posicion] = columna[ultima]
+            self.__posiciones__[int(self.__ids__[posicion])] = posicion
+        self.__cantidad__ = ultima
+        return True
+
+    def __len__(self) -> int:
+        return self.__cantidad__
+
+    def _filtro(self, desde: Optional[datetime], hasta: Optional[datetime], matricula: Optional[str] = None,
+                especialidad: Optional[str] = None):
+        """Máscara booleana de los turnos con desde <= fecha_hora < hasta (y del médico/especialidad, si se indican)."""
+        fechas = self.__fechas__[:self.__cantidad__]
+        filtro = np.ones(self.__cantidad__, dtype=bool)
+        if desde is not None:
+            filtro &= fechas >= np.datetime64(desde, "s")
+        if hasta is not None:
+            filtro &= fechas < np.datetime64(hasta, "s")
+        if matricula is not None:
+            filtro &= self.__medicos__[:self.__cantidad__] == self.__codigos_medico__.get(matricula, -1)
+        if especialidad is not None:
+            filtro &= self.__especialidades__[:self.__cantidad__] == self.__codigos_especialidad__.get(especialidad, -1)
+        return filtro
+
+    @staticmethod
+    def _contar_codigos(codigos, valores: List[str]) -> Dict[str, int]:
+        conteos = np.bincount(codigos, minlength=len(valores))
+        return {valores[codigo]: int(conteos[codigo]) for codigo in np.flatnonzero(conteos)}
+
+    def contar(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+               matricula: Optional[str] = None, especialidad: Optional[str] = None) -> int:
+        return int(np.count_nonzero(self._filtro(desde, hasta, matricula, especialidad)))
+
+    def contar_por_medico(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Dict[str, int]:
+        filtro = self._filtro(desde, hasta)
+        return self._contar_codigos(self.__medicos__[:self.__cantidad__][filtro], self.__matriculas__)
+
+    def contar_por_especialidad(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Dict[str, int]:
+        filtro = self._filtro(desde, hasta)
+        return self._contar_codigos(self.__especialidades__[:self.__cantidad__][filtro], self.__nombres_especialidad__)
+
+    def contar_por_dia(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                       matricula: Optional[str] = None) -> Dict[date, int]:
+        dias = self.__fechas__[:self.__cantidad__][self._filtro(desde, hasta, matricula)].astype("datetime64[D]")
+        valores, conteos = np.unique(dias, return_counts=True)
+        return {dia.item(): int(cantidad) for dia, cantidad in zip(valores, conteos)}
+
+    def histograma_ocupacion(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                             matricula: Optional[str] = None) -> List[List[int]]:
+        segundos = self.__fechas__[:self.__cantidad__][self._filtro(desde, hasta, matricula)].astype(np.int64)
+        dias = (segundos // 86400 + DIA_SEMANA_EPOCH) % 7
+        horas = segundos // 3600 % 24
+        conteos = np.bincount(dias * 24 + horas, minlength=7 * 24)
+        return conteos.reshape(7, 24).tolist()
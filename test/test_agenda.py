@@ -0,0 +1,135 @@
+import random
+import unittest
+from unittest import mock
+from datetime import datetime
+from datetime import timedelta
+from src.agenda import Agenda
+from src.turno import Turno
+from src.paciente import Paciente
+from src.medico import Medico
+
+class TestAgenda(unittest.TestCase):
+    def setUp(self):
+        self.paciente = Paciente("12345678", "Juan Pérez", "1985-05-15")
+        self.medico = Medico("98765", "Dr. María García")
+        self.agenda = Agenda()
+
+    def crear_turno(self, fecha_hora):
+        return Turno(self.paciente, self.medico, fecha_hora, "Cardiología")
+
+    def test_01_agenda_vacia(self):
+        self.assertEqual(len(self.agenda), 0)
+        self.assertEqual(self.agenda.obtener_turnos(), [])
+
+    def test_02_turnos_ordenados_por_fecha(self):
+        fechas = [datetime(2024, 6, 19, 9, 0), datetime(2024, 6, 17, 10, 30), datetime(2024, 6, 18, 8, 0)]
+        for fecha in fechas:
+            self.agenda.agregar_turno(self.crear_turno(fecha))
+        obtenidas = [t.obtener_fecha_hora() for t in self.agenda.obtener_turnos()]
+        self.assertEqual(obtenidas, sorted(fechas))
+
+    def test_03_rango_excluye_hasta(self):
+        for dia in range(17, 22):
+            self.agenda.agregar_turno(self.crear_turno(datetime(2024, 6, dia, 10, 0)))
+        turnos = self.agenda.obtener_turnos(datetime(2024, 6, 18), datetime(2024, 6, 20, 10, 0))
+        self.assertEqual([t.obtener_fecha_hora().day for t in turnos], [18, 19])
+
+    def test_04_rango_abierto(self):
+        for dia in range(17, 22):
+            self.agenda.agregar_turno(self.crear_turno(datetime(2024, 6, dia, 10, 0)))
+        self.assertEqual(len(self.agenda.obtener_turnos(desde=datetime(2024, 6, 20))), 2)
+        self.assertEqual(len(self.agenda.obtener_turnos(hasta=datetime(2024, 6, 20))), 3)
+
+    def test_05_rango_sin_turnos(self):
+        self.agenda.agregar_turno(self.crear_turno(datetime(2024, 6, 17, 10, 0)))
+        self.assertEqual(self.agenda.obtener_turnos(datetime(2024, 7, 1), datetime(2024, 7, 31)), [])
+
+    def test_06_agregar_turnos_en_lote_mantiene_orden(self):
+        for dia in (3, 10, 20):
+            self.agenda.agregar_turno(self.crear_turno(datetime(2024, 6, dia, 10, 0)))
+        nuevos = [self.crear_turno(datetime(2024, 6, dia, 9, 0)) for dia in range(30, 0, -1)]
+        self.agenda.agregar_turnos(nuevos)
+        fechas = [t.obtener_fecha_hora() for t in self.agenda.obtener_turnos()]
+        self.assertEqual(len(fechas), 33)
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertEqual(len(self.agenda.obtener_turnos(datetime(2024, 6, 10), datetime(2024, 6, 11))), 2)
+
+    def test_07_paginas_igual_que_obtener_turnos(self):
+        for dia in (20, 3, 10):
+            self.agenda.agregar_turno(self.crear_turno(datetime(2024, 6, dia, 10, 0)))
+        desde, hasta = datetime(2024, 6, 5), datetime(2024, 6, 20, 10, 0)
+        self.assertEqual(self.agenda.obtener_pagina(desde, hasta, 5), self.agenda.obtener_turnos(desde, hasta))
+        primera = self.agenda.obtener_pagina(None, None, 2)
+        self.assertEqual(primera, self.agenda.obtener_turnos()[:2])
+        # La página siguiente empieza después de la última fecha de la anterior
+        siguiente = self.agenda.obtener_pagina(primera[-1].obtener_fecha_hora(), None, 2, excluir_desde=True)
+        self.assertEqual(siguiente, self.agenda.obtener_turnos()[2:])
+
+    def test_08_quitar_turno(self):
+        turnos = [self.crear_turno(datetime(2024, 6, dia, 10, 0)) for dia in (17, 18, 19)]
+        for turno in turnos:
+            self.agenda.agregar_turno(turno)
+        # Otro objeto con la misma fecha no es el turno agendado
+        self.assertFalse(self.agenda.quitar_turno(self.crear_turno(datetime(2024, 6, 18, 10, 0))))
+        self.assertTrue(self.agenda.quitar_turno(turnos[1]))
+        self.assertFalse(self.agenda.quitar_turno(turnos[1]))
+        self.assertEqual(self.agenda.obtener_turnos(), [turnos[0], turnos[2]])
+        self.assertEqual(len(self.agenda), 2)
+        for turno in (turnos[0], turnos[2]):
+            self.agenda.quitar_turno(turno)
+        self.assertEqual(self.agenda.obtener_turnos(), [])
+        self.agenda.agregar_turno(turnos[1])
+        self.assertEqual(self.agenda.obtener_turnos(), [turnos[1]])
+
+    def test_09_muchos_cambios_en_varios_bloques(self):
+        # Bloques chicos: los turnos se parten en muchos bloques que se vacían y se vuelven a llenar
+        azar = random.Random(3)
+        inicio = datetime(2024, 6, 17)
+        agendados = []
+        with mock.patch("src.agenda.CAPACIDAD_BLOQUE", 4):
+            for paso in range(3000):
+                if agendados and azar.random() < 0.45:
+                    turno = agendados.pop(azar.randrange(len(agendados)))
+                    self.assertTrue(self.agenda.quitar_turno(turno))
+                elif azar.random() < 0.05:
+                    nuevos = [self.crear_turno(inicio + timedelta(hours=azar.randrange(200))) for _ in range(10)]
+                    self.agenda.agregar_turnos(nuevos)
+                    agendados += nuevos
+                else:
+                    turno = self.crear_turno(inicio + timedelta(hours=azar.randrange(200)))
+                    self.agenda.agregar_turno(turno)
+                    agendados.append(turno)
+            todos = self.agenda.obtener_turnos()
+            self.assertEqual(len(self.agenda), len(agendados))
+            self.assertEqual({id(t) for t in todos}, {id(t) for t in agendados})
+            fechas = [t.obtener_fecha_hora() for t in todos]
+            self.assertEqual(fechas, sorted(fechas))
+            desde, hasta = inicio + timedelta(hours=50), inicio + timedelta(hours=120)
+            self.assertEqual(self.agenda.obtener_turnos(desde, hasta), [t for t in todos if desde <= t.obtener_fecha_hora() < hasta])
+            self.assertEqual(self.agenda.obtener_pagina(desde, hasta, 7), self.agenda.obtener_turnos(desde, hasta)[:7])
+
+    def test_10_lote_chico_en_agenda_grande_solo_toca_sus_bloques(self):
+        inicio = datetime(2024, 6, 17)
+        with mock.patch("src.agenda.CAPACIDAD_BLOQUE", 4):
+            existentes = [self.crear_turno(inicio + timedelta(hours=2 * i)) for i in range(100)]
+            self.agenda.agregar_turnos(existentes)
+            # Un lote de 12 repartido en tres bloques, con fechas repetidas y una después del final
+            horas = [1, 3, 5, 7, 9, 11, 13, 15, 40, 40, 41, 500]
+            nuevos = [self.crear_turno(inicio + timedelta(hours=h)) for h in horas]
+            with mock.patch.object(Agenda, "_armar_bloques") as armar:
+                self.agenda.agregar_turnos(nuevos)
+            armar.assert_not_called()
+            todos = self.agenda.obtener_turnos()
+            self.assertEqual(len(self.agenda), 112)
+            fechas = [t.obtener_fecha_hora() for t in todos]
+            self.assertEqual(fechas, sorted(fechas))
+            # Con la misma fecha, el turno que ya estaba queda antes, como con agregar_turno
+            a_las_40 = [t for t in todos if t.obtener_fecha_hora() == inicio + timedelta(hours=40)]
+            self.assertEqual(a_las_40, [existentes[20], nuevos[8], nuevos[9]])
+            self.assertEqual(self.agenda.obtener_pagina(inicio, None, 200), todos)
+            for turno in nuevos:
+                self.assertTrue(self.agenda.quitar_turno(turno))
+            self.assertEqual(self.agenda.obtener_turnos(), existentes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.clinica import Clinica, TurnoOcupadoException, PacienteNoEncontradoException
+from src.almacenamiento_binario import AlmacenamientoBinario, escribir_snapshot_binario
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+class TestAlmacenamientoBinario(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clinica.bin")
+        self.clinica = Clinica()
+        self.clinica.agregar_paciente(Paciente("12345678", "Juan Pérez", datetime(1985, 5, 15)))
+        self.clinica.agregar_paciente(Paciente("87654321", "Ana Martín", "1990-03-20"))
+        self.clinica.agregar_paciente(Paciente("11111111", "José Núñez", "01/01/2000"))
+        self.clinica.agregar_medico(Medico("98765", "Dr. María García", [Especialidad("Cardiología", ["lunes", "miércoles"]),
+                                                                        Especialidad("Clínica", ["viernes"])]))
+        self.clinica.agregar_medico(Medico("M-2", "Dr. Sin Turnos"))
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        self.clinica.agendar_turno("87654321", "98765", "Clínica", datetime(2024, 6, 21, 9, 0))
+        self.clinica.emitir_receta("12345678", "98765", ["Aspirina 100mg", "Ibuprofeno"], datetime(2024, 6, 17, 10, 45, 12, 345))
+        self.abiertas = []
+
+    def tearDown(self):
+        for clinica in self.abiertas:
+            clinica.cerrar()
+        self.directorio.cleanup()
+
+    def abrir(self):
+        escribir_snapshot_binario(self.clinica, self.ruta)
+        clinica = Clinica(AlmacenamientoBinario(self.ruta))
+        self.abiertas.append(clinica)
+        return clinica
+
+    def test_01_al_abrir_solo_se_cargan_los_medicos(self):
+        clinica = self.abrir()
+        self.assertEqual(clinica.__paciente__, {})
+        self.assertEqual(clinica.__turnos__, {})
+        medico = clinica.obtener_medico_por_matricula("98765")
+        self.assertEqual(medico.obtener_especialidad_para_dia("viernes"), ["Clínica"])
+        self.assertEqual(len(clinica.obtener_medicos_por_especialidad_y_dia("Cardiología", "miércoles")), 1)
+        self.assertEqual(clinica.obtener_medico_por_matricula("M-2").obtener_especialidades(), [])
+
+    def test_02_historia_se_arma_al_pedirla(self):
+        clinica = self.abrir()
+        historia = clinica.obtener_historiales_por_dni("12345678")
+        self.assertEqual(list(clinica.__paciente__), ["12345678"])
+        self.assertEqual(historia.obtener_paciente().obtener_fecha_nacimiento(), datetime(1985, 5, 15))
+        self.assertEqual(clinica.renderizar_historia("12345678"), self.clinica.renderizar_historia("12345678"))
+        receta = historia.obtener_recetas()[0]
+        self.assertEqual(receta.obtener_medicamentos(), ["Aspirina 100mg", "Ibuprofeno"])
+        self.assertEqual(receta.obtener_fecha(), datetime(2024, 6, 17, 10, 45, 12, 345))
+        self.assertEqual(clinica.obtener_historiales_por_dni("87654321").obtener_paciente().obtener_fecha_nacimiento(), "1990-03-20")
+        with self.assertRaises(PacienteNoEncontradoException):
+            clinica.obtener_historiales_por_dni("00000000")
+
+    def test_03_agenda_del_medico_y_turno_ocupado(self):
+        clinica = self.abrir()
+        with self.assertRaises(TurnoOcupadoException):
+            clinica.agendar_turno("11111111", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        turnos = clinica.obtener_turnos_de_medico("98765")
+        self.assertEqual(len(turnos), 2)
+        # El turno cargado desde el médico y desde el paciente es el mismo objeto
+        self.assertIs(clinica.obtener_historiales_por_dni("12345678").obtener_turnos()[0],
+                      [t for t in turnos if t.obtener_paciente().obtener_dni() == "12345678"][0])
+
+    def test_04_todos_los_pacientes_en_el_orden_original(self):
+        clinica = self.abrir()
+        self.assertEqual([p.obtener_dni() for p in clinica.obtener_pacientes()], ["12345678", "87654321", "11111111"])
+        self.assertEqual(len(clinica.obtener_turnos()), 2)
+        # Lo agregado después queda en memoria y entra en el siguiente snapshot
+        clinica.agendar_turno("11111111", "98765", "Cardiología", datetime(2024, 6, 19, 8, 0))
+        self.clinica = clinica
+        self.assertEqual(len(self.abrir().obtener_turnos_de_medico("98765")), 3)
+
+    def test_05_archivo_que_no_es_snapshot(self):
+        escribir_snapshot_binario(self.clinica, self.ruta)
+        with open(self.ruta, "rb") as archivo:
+            datos = archivo.read()
+        for contenido in (b"", b"hola", datos[:-1], b"XXXX" + datos[4:]):
+            with open(self.ruta, "wb") as archivo:
+                archivo.write(contenido)
+            with self.assertRaises(ValueError):
+                AlmacenamientoBinario(self.ruta)
+
+    def test_06_solo_se_guardan_especialidades_y_medicamentos_decodificados(self):
+        clinica = self.abrir()
+        for paciente in clinica.obtener_pacientes():
+            clinica.obtener_historiales_por_dni(paciente.obtener_dni())
+        clinica.obtener_turnos_de_medico("98765")
+        vocabulario = set(clinica.__almacenamiento__.__vocabulario__.values())
+        self.assertEqual(vocabulario, {"Cardiología", "Clínica", "Aspirina 100mg", "Ibuprofeno"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime
+from src.clinica import Clinica, TurnoOcupadoException
+from src.almacenamiento_journal import AlmacenamientoJournal, NOMBRE_JOURNAL, NOMBRE_SNAPSHOT
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+class TestAlmacenamientoJournal(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.clinica = self.abrir()
+
+    def tearDown(self):
+        self.clinica.cerrar()
+        self.directorio.cleanup()
+
+    def abrir(self, snapshot_cada=None):
+        return Clinica(AlmacenamientoJournal(self.directorio.name, snapshot_cada=snapshot_cada))
+
+    def reabrir(self, snapshot_cada=None):
+        self.clinica.cerrar()
+        self.clinica = self.abrir(snapshot_cada)
+        return self.clinica
+
+    def poblar(self, clinica, cantidad_turnos=3):
+        clinica.agregar_paciente(Paciente("12345678", "Juan Pérez", datetime(1985, 5, 15)))
+        clinica.agregar_medico(Medico("98765", "Dr. María García", [Especialidad("Cardiología", ["lunes"])]))
+        clinica.agregar_especialidad_a_medico("98765", Especialidad("Clínica", ["martes"]))
+        for i in range(cantidad_turnos):
+            clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8 + i, 0))
+        clinica.emitir_receta("12345678", "98765", ["Aspirina 100mg"])
+
+    def test_01_reinicio_reproduce_el_journal(self):
+        self.poblar(self.clinica)
+        clinica = self.reabrir()
+        historia = clinica.obtener_historiales_por_dni("12345678")
+        self.assertEqual(len(historia.obtener_turnos()), 3)
+        self.assertEqual(historia.obtener_recetas()[0].obtener_medicamentos(), ["Aspirina 100mg"])
+        self.assertEqual(historia.obtener_paciente().obtener_fecha_nacimiento(), datetime(1985, 5, 15))
+        self.assertEqual(clinica.obtener_medico_por_matricula("98765").obtener_especialidad_para_dia("martes"), ["Clínica"])
+        with self.assertRaises(TurnoOcupadoException):
+            clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, 0))
+
+    def test_02_registro_truncado_a_mitad_se_descarta(self):
+        self.poblar(self.clinica)
+        self.clinica.cerrar()
+        ruta = os.path.join(self.directorio.name, NOMBRE_JOURNAL)
+        # Se corta la última línea (la receta) a la mitad
+        with open(ruta, "rb") as archivo:
+            lineas = archivo.readlines()
+        with open(ruta, "wb") as archivo:
+            archivo.writelines(lineas[:-1])
+            archivo.write(lineas[-1][:len(lineas[-1]) // 2])
+        self.clinica = self.abrir()
+        historia = self.clinica.obtener_historiales_por_dni("12345678")
+        self.assertEqual(len(historia.obtener_turnos()), 3)
+        self.assertEqual(historia.obtener_recetas(), [])
+        # Lo que se escriba después queda bien encadenado
+        self.clinica.emitir_receta("12345678", "98765", ["Ibuprofeno"])
+        historia = self.reabrir().obtener_historiales_por_dni("12345678")
+        self.assertEqual([r.obtener_medicamentos() for r in historia.obtener_recetas()], [["Ibuprofeno"]])
+
+    def test_03_registro_danado_se_descarta(self):
+        self.poblar(self.clinica)
+        self.clinica.cerrar()
+        ruta = os.path.join(self.directorio.name, NOMBRE_JOURNAL)
+        with open(ruta, "rb") as archivo:
+            lineas = archivo.readlines()
+        lineas[-2] = lineas[-2].replace(b"T10:", b"T11:")
+        with open(ruta, "wb") as archivo:
+            archivo.writelines(lineas)
+        self.clinica = self.abrir()
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        self.assertEqual(self.clinica.obtener_historiales_por_dni("12345678").obtener_recetas(), [])
+
+    def test_04_snapshot_vacia_el_journal(self):
+        self.clinica = self.reabrir(snapshot_cada=4)
+        self.poblar(self.clinica, cantidad_turnos=6)
+        self.assertTrue(os.path.exists(os.path.join(self.directorio.name, NOMBRE_SNAPSHOT)))
+        with open(os.path.join(self.directorio.name, NOMBRE_JOURNAL), "rb") as archivo:
+            self.assertLess(len(archivo.readlines()), 4)
+        clinica = self.reabrir()
+        self.assertEqual(len(clinica.obtener_turnos()), 6)
+        self.assertEqual(len(clinica.obtener_historiales_por_dni("12345678").obtener_recetas()), 1)
+        self.assertEqual(len(clinica.obtener_medicos()), 1)
+
+    def test_05_registros_ya_incluidos_en_el_snapshot_no_se_repiten(self):
+        self.poblar(self.clinica)
+        ruta = os.path.join(self.directorio.name, NOMBRE_JOURNAL)
+        with open(ruta, "rb") as archivo:
+            journal_anterior = archivo.read()
+        self.clinica.__almacenamiento__.escribir_snapshot()
+        self.clinica.cerrar()
+        # Simula una caída después de escribir el snapshot y antes de vaciar el journal
+        with open(ruta, "wb") as archivo:
+            archivo.write(journal_anterior)
+        self.clinica = self.abrir()
+        self.assertEqual(len(self.clinica.obtener_turnos()), 3)
+        self.assertEqual(len(self.clinica.obtener_historiales_por_dni("12345678").obtener_recetas()), 1)
+
+    def test_06_cancelar_y_reprogramar_se_reproducen(self):
+        self.poblar(self.clinica)
+        turnos = self.clinica.obtener_turnos_de_medico("98765")
+        self.clinica.cancelar_turno(turnos[0].obtener_id())
+        self.clinica.reprogramar_turno(turnos[2].obtener_id(), datetime(2024, 6, 24, 10, 0))
+        clinica = self.reabrir()
+        fechas = [t.obtener_fecha_hora() for t in clinica.obtener_turnos_de_medico("98765")]
+        self.assertEqual(fechas, [datetime(2024, 6, 17, 9, 0), datetime(2024, 6, 24, 10, 0)])
+        # También después de un snapshot
+        clinica.__almacenamiento__.escribir_snapshot()
+        clinica.cancelar_turno(clinica.buscar_turno("98765", datetime(2024, 6, 17, 9, 0)).obtener_id())
+        clinica = self.reabrir()
+        self.assertEqual(len(clinica.obtener_turnos()), 1)
+        clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, 0))
+
+    def test_07_snapshot_con_series_pendientes(self):
+        # El snapshot se escribe con los cerrojos del turno tomados: no debe crear los turnos de la serie
+        self.clinica = self.reabrir(snapshot_cada=4)
+        self.poblar(self.clinica, cantidad_turnos=0)
+        self.clinica.agendar_serie("12345678", "98765", "Cardiología", datetime(2024, 6, 24, 10, 0), cantidad=5)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, 0))
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        self.assertTrue(os.path.exists(os.path.join(self.directorio.name, NOMBRE_SNAPSHOT)))
+        clinica = self.reabrir()
+        # El snapshot guarda la serie como serie: al recuperarla sigue pendiente
+        self.assertEqual(len(clinica.__turnos__), 2)
+        with self.assertRaises(TurnoOcupadoException):
+            clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 7, 22, 10, 0))
+        self.assertEqual(len(clinica.obtener_turnos_de_medico("98765")), 7)
+
+    def test_08_snapshot_espera_los_turnos_ya_escritos_en_el_journal(self):
+        self.clinica = self.reabrir(snapshot_cada=5)
+        for numero in (1, 2):
+            self.clinica.agregar_paciente(Paciente(f"{numero}", f"Paciente {numero}", "01/01/1990"))
+            self.clinica.agregar_medico(Medico(f"M-{numero}", f"Médico {numero}", [Especialidad("Clínica", ["lunes"])]))
+        # El turno del médico 1 (quinto registro: pide el snapshot) queda escrito en el journal pero
+        # todavía no en memoria mientras el médico 2 agenda el suyo
+        registrar = self.clinica._registrar_turno
+        guardado, otro_agendado = threading.Event(), threading.Event()
+
+        def registrar_despues_del_otro(turno):
+            if turno.obtener_medico().obtener_matricula() == "M-1":
+                guardado.set()
+                otro_agendado.wait(timeout=0.5)
+            registrar(turno)
+
+        with mock.patch.object(self.clinica, "_registrar_turno", registrar_despues_del_otro):
+            hilo = threading.Thread(target=self.clinica.agendar_turno, args=("1", "M-1", "Clínica", datetime(2024, 6, 17, 8, 0)))
+            hilo.start()
+            guardado.wait()
+            self.clinica.agendar_turno("2", "M-2", "Clínica", datetime(2024, 6, 17, 8, 0))
+            otro_agendado.set()
+            hilo.join()
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        self.assertEqual(len(self.reabrir().obtener_turnos()), 2)
+
+    def test_09_serie_se_guarda_como_serie_y_sus_turnos_se_pueden_cancelar(self):
+        self.poblar(self.clinica, cantidad_turnos=0)
+        self.clinica.agendar_serie("12345678", "98765", "Cardiología", datetime(2024, 6, 24, 10, 0), cantidad=5)
+        clinica = self.reabrir()
+        self.assertEqual(clinica.__turnos__, {})
+        turno = clinica.buscar_turno("98765", datetime(2024, 7, 8, 10, 0))
+        clinica.cancelar_turno(turno.obtener_id())
+        clinica = self.reabrir()
+        fechas = [t.obtener_fecha_hora().day for t in clinica.obtener_turnos_de_medico("98765")]
+        self.assertEqual(fechas, [24, 1, 15, 22])
+
+    def test_10_fsync_por_tiempo_sin_mas_registros(self):
+        self.clinica.cerrar()
+        almacenamiento = AlmacenamientoJournal(self.directorio.name, fsync_cada=100, intervalo_fsync=0.05)
+        self.clinica = Clinica(almacenamiento)
+        sincronizado = threading.Event()
+        sincronizar = almacenamiento.sincronizar
+
+        def sincronizar_y_avisar():
+            sincronizar()
+            sincronizado.set()
+
+        with mock.patch.object(almacenamiento, "sincronizar", sincronizar_y_avisar):
+            self.clinica.agregar_paciente(Paciente("1", "Ana", "01/01/1990"))
+            # Ningún otro registro llega: el temporizador hace el fsync
+            self.assertTrue(sincronizado.wait(timeout=2))
+        self.assertEqual(almacenamiento.__sin_fsync__, 0)
+
+if __name__ == '__main__':
+    unittest.main()
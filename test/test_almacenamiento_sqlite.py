@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from src.clinica import Clinica, TurnoOcupadoException, PacienteNoEncontradoException
+from src.almacenamiento_sqlite import AlmacenamientoSQLite
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+class TestAlmacenamientoSQLite(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clinica.db")
+        self.clinica = Clinica(AlmacenamientoSQLite(self.ruta))
+        self.clinica.agregar_paciente(Paciente("12345678", "Juan Pérez", datetime(1985, 5, 15)))
+        self.clinica.agregar_paciente(Paciente("87654321", "Ana Martín", "1990-03-20"))
+        self.clinica.agregar_medico(Medico("98765", "Dr. María García", [Especialidad("Cardiología", ["lunes", "miércoles"])]))
+
+    def tearDown(self):
+        self.clinica.cerrar()
+        self.directorio.cleanup()
+
+    def reabrir(self):
+        self.clinica.cerrar()
+        self.clinica = Clinica(AlmacenamientoSQLite(self.ruta))
+        return self.clinica
+
+    def test_01_pacientes_y_medicos_persisten(self):
+        clinica = self.reabrir()
+        self.assertEqual(len(clinica.obtener_medicos()), 1)
+        self.assertEqual([p.obtener_dni() for p in clinica.obtener_pacientes()], ["12345678", "87654321"])
+        paciente = clinica.obtener_historiales_por_dni("12345678").obtener_paciente()
+        self.assertEqual(paciente.obtener_fecha_nacimiento(), datetime(1985, 5, 15))
+
+    def test_02_pacientes_se_cargan_bajo_demanda(self):
+        clinica = self.reabrir()
+        self.assertEqual(clinica.__paciente__, {})
+        clinica.obtener_historiales_por_dni("87654321")
+        self.assertEqual(list(clinica.__paciente__), ["87654321"])
+        with self.assertRaises(PacienteNoEncontradoException):
+            clinica.obtener_historiales_por_dni("00000000")
+
+    def test_03_historia_clinica_persiste(self):
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        self.clinica.emitir_receta("12345678", "98765", ["Aspirina 100mg", "Ibuprofeno"])
+        fecha_receta = self.clinica.obtener_historiales_por_dni("12345678").obtener_recetas()[0].obtener_fecha()
+        historia = self.reabrir().obtener_historiales_por_dni("12345678")
+        self.assertEqual([t.obtener_fecha_hora() for t in historia.obtener_turnos()], [datetime(2024, 6, 17, 10, 30)])
+        receta = historia.obtener_recetas()[0]
+        self.assertEqual(receta.obtener_medicamentos(), ["Aspirina 100mg", "Ibuprofeno"])
+        self.assertEqual(receta.obtener_fecha(), fecha_receta)
+
+    def test_04_turno_ocupado_se_detecta_despues_de_reabrir(self):
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        clinica = self.reabrir()
+        with self.assertRaises(TurnoOcupadoException):
+            clinica.agendar_turno("87654321", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        turnos = clinica.obtener_turnos_de_medico("98765")
+        self.assertEqual(len(turnos), 1)
+        # El turno cargado desde el médico y desde el paciente es el mismo objeto
+        self.assertIs(turnos[0], clinica.obtener_historiales_por_dni("12345678").obtener_turnos()[0])
+        self.assertEqual(len(clinica.obtener_turnos()), 1)
+
+    def test_05_especialidad_agregada_despues_persiste(self):
+        self.clinica.obtener_medico_por_matricula("98765").agregar_especialidad(Especialidad("Clínica", ["viernes"]))
+        clinica = self.reabrir()
+        self.assertEqual(clinica.obtener_medico_por_matricula("98765").obtener_especialidad_para_dia("viernes"), ["Clínica"])
+        self.assertEqual(len(clinica.obtener_medicos_por_especialidad_y_dia("Clínica", "viernes")), 1)
+
+    def test_06_lote_de_turnos_persiste(self):
+        solicitudes = [("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8 + i, 0)) for i in range(5)]
+        self.assertTrue(all(r.fue_agendado() for r in self.clinica.agendar_turnos(solicitudes)))
+        self.assertEqual(len(self.reabrir().obtener_turnos_de_medico("98765")), 5)
+
+    def test_07_modo_wal_e_indices(self):
+        conexion = sqlite3.connect(self.ruta)
+        self.assertEqual(conexion.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indices = {fila[0] for fila in conexion.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"idx_turnos_dni_fecha", "idx_turnos_fecha", "idx_recetas_dni"} <= indices)
+        conexion.close()
+
+    def test_08_cancelar_y_reprogramar_persisten(self):
+        cancelado = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 10, 30))
+        movido = self.clinica.agendar_turno("87654321", "98765", "Cardiología", datetime(2024, 6, 19, 10, 30))
+        self.clinica.cancelar_turno(cancelado.obtener_id())
+        self.clinica.reprogramar_turno(movido.obtener_id(), datetime(2024, 6, 17, 10, 30))
+        clinica = self.reabrir()
+        turnos = clinica.obtener_turnos_de_medico("98765")
+        self.assertEqual([(t.obtener_paciente().obtener_dni(), t.obtener_fecha_hora()) for t in turnos],
+                         [("87654321", datetime(2024, 6, 17, 10, 30))])
+        self.assertEqual(clinica.obtener_historiales_por_dni("12345678").obtener_turnos(), [])
+        # El horario anterior del turno movido quedó libre
+        clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 19, 10, 30))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.clinica import (
     Clinica, 
+    ResultadoTurno,
     PacienteNoEncontradoException, 
     MedicoNoDisponibleException, 
     TurnoOcupadoException,
+    TurnoNoEncontradoException,
     RecetaInvalidaException
 )
 from src.paciente import Paciente
@@ -113,5 +115,279 @@ class TestClinica(unittest.TestCase):
             )
         self.assertIn("no puede estar vacía", str(context.exception))
 
+    def test_11_agendar_turno_medico_ocupado_falla(self):
+        self.clinica.agregar_paciente(self.paciente)
+        otro_paciente = Paciente("87654321", "Ana Martín", "1990-03-20")
+        self.clinica.agregar_paciente(otro_paciente)
+        self.clinica.agregar_medico(self.medico)
+        fecha_lunes = datetime(2024, 6, 17, 10, 30)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", fecha_lunes)
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("87654321", "98765", "Cardiología", fecha_lunes)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+
+    def test_12_agendar_turno_paciente_ocupado_falla(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        otro_medico = Medico("11111", "Dr. Carlos López")
+        otro_medico.agregar_especialidad(Especialidad("Pediatría", ["lunes"]))
+        self.clinica.agregar_medico(otro_medico)
+        fecha_lunes = datetime(2024, 6, 17, 10, 30)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", fecha_lunes)
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("12345678", "11111", "Pediatría", fecha_lunes)
+
+    def test_13_agendar_turno_mismo_medico_otro_horario(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        for i in range(50):
+            self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, i))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 50)
+
+    def test_14_obtener_turnos_de_medico_por_rango(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        for dia in (24, 17, 19, 26):
+            self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, dia, 10, 0))
+        turnos = self.clinica.obtener_turnos_de_medico("98765", datetime(2024, 6, 18), datetime(2024, 6, 25))
+        self.assertEqual([t.obtener_fecha_hora().day for t in turnos], [19, 24])
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.obtener_turnos_de_medico("MATRICULA_INEXISTENTE")
+
+    def test_15_medicos_por_especialidad_y_dia(self):
+        self.clinica.agregar_medico(self.medico)
+        otro_medico = Medico("11111", "Dr. Carlos López")
+        self.clinica.agregar_medico(otro_medico)
+        self.clinica.agregar_especialidad_a_medico("11111", Especialidad("Cardiología", ["miércoles", "jueves"]))
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad_y_dia("cardiología", "Miércoles"), [otro_medico, self.medico])
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad_y_dia("Cardiología", "lunes"), [self.medico])
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad_y_dia("Pediatría", "lunes"), [])
+        with self.assertRaises(ValueError):
+            self.clinica.obtener_medicos_por_especialidad_y_dia("Cardiología", "feriado")
+
+    def test_16_indice_actualizado_al_agregar_especialidad_al_medico(self):
+        self.clinica.agregar_medico(self.medico)
+        self.medico.agregar_especialidad(Especialidad("Clínica", ["viernes"]))
+        self.assertEqual(self.clinica.obtener_medicos_por_especialidad_y_dia("Clínica", "viernes"), [self.medico])
+
+    def test_17_buscar_proximo_turno_salta_ocupados(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, 0))
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 8, 40))
+        turnos = self.clinica.buscar_proximo_turno("Cardiología", datetime(2024, 6, 17, 7, 0), timedelta(minutes=30), cantidad=2)
+        self.assertEqual(turnos, [(datetime(2024, 6, 17, 9, 0), self.medico), (datetime(2024, 6, 17, 9, 30), self.medico)])
+
+    def test_18_buscar_proximo_turno_otro_dia_y_medico(self):
+        self.clinica.agregar_medico(self.medico)
+        otro_medico = Medico("11111", "Dr. Carlos López", [Especialidad("Cardiología", ["martes"])])
+        self.clinica.agregar_medico(otro_medico)
+        # Domingo a la tarde: el primer turno es el lunes, luego el martes del otro médico
+        turnos = self.clinica.buscar_proximo_turno("cardiología", datetime(2024, 6, 16, 15, 0), timedelta(hours=5), cantidad=3)
+        self.assertEqual(turnos, [(datetime(2024, 6, 17, 8, 0), self.medico),
+                                  (datetime(2024, 6, 17, 13, 0), self.medico),
+                                  (datetime(2024, 6, 18, 8, 0), otro_medico)])
+        self.assertEqual(self.clinica.buscar_proximo_turno("Pediatría", datetime(2024, 6, 16)), [])
+        with self.assertRaises(ValueError):
+            self.clinica.buscar_proximo_turno("Cardiología", datetime(2024, 6, 16), timedelta(0))
+
+    def test_19_agendar_turnos_en_lote(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        solicitudes = [("12345678", "98765", "Cardiología", datetime(2024, 6, 17) + timedelta(weeks=i)) for i in range(10)]
+        resultados = self.clinica.agendar_turnos(solicitudes)
+        self.assertTrue(all(isinstance(r, ResultadoTurno) and r.fue_agendado() for r in resultados))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 10)
+        self.assertEqual(len(self.clinica.obtener_historiales_por_dni("12345678").obtener_turnos()), 10)
+
+    def test_20_agendar_turnos_en_lote_todo_o_nada(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        solicitudes = [
+            ("12345678", "98765", "Cardiología", datetime(2024, 6, 19, 9, 0)),
+            ("DNI_INEXISTENTE", "98765", "Cardiología", datetime(2024, 6, 19, 10, 0)),
+            ("12345678", "98765", "Cardiología", datetime(2024, 6, 18, 9, 0)),
+            ("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0)),
+            ("12345678", "98765", "Cardiología", datetime(2024, 6, 19, 9, 0)),
+        ]
+        resultados = self.clinica.agendar_turnos(solicitudes)
+        errores = [type(r.obtener_error()) for r in resultados]
+        self.assertEqual(errores, [type(None), PacienteNoEncontradoException, MedicoNoDisponibleException,
+                                   TurnoOcupadoException, TurnoOcupadoException])
+        self.assertFalse(any(r.fue_agendado() for r in resultados))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+        self.assertEqual(len(self.clinica.obtener_historiales_por_dni("12345678").obtener_turnos()), 1)
+
+    def test_21_iterar_pacientes_por_paginas(self):
+        for i in range(25):
+            self.clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "1990-01-01"))
+        pagina = list(self.clinica.iterar_pacientes(offset=10, limite=10))
+        self.assertEqual([p.obtener_dni() for p in pagina], [f"{i:08}" for i in range(10, 20)])
+        self.assertEqual(len(list(self.clinica.iterar_pacientes(offset=20, limite=10))), 5)
+        self.assertEqual(list(self.clinica.iterar_pacientes(offset=30)), [])
+        self.assertEqual(list(self.clinica.iterar_pacientes()), self.clinica.obtener_pacientes())
+        with self.assertRaises(ValueError):
+            self.clinica.iterar_pacientes(offset=-1)
+
+    def test_22_iterar_medicos_con_filtros(self):
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_medico(Medico("11111", "Dr. Pedro López", [Especialidad("Pediatría", ["martes"])]))
+        self.clinica.agregar_medico(Medico("22222", "Dra. Ana Ruiz", [Especialidad("cardiología", ["viernes"])]))
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.iterar_medicos(especialidad="Cardiología")], ["98765", "22222"])
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.iterar_medicos(dia="martes")], ["11111"])
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.iterar_medicos(especialidad="Cardiología", dia="viernes")], ["22222"])
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.iterar_medicos(offset=1, limite=1)], ["11111"])
+        with self.assertRaises(ValueError):
+            self.clinica.iterar_medicos(dia="feriado")
+
+    def test_23_iterar_turnos_con_filtros_y_paginas(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_paciente(Paciente("87654321", "Ana Gómez", "1990-01-01"))
+        self.clinica.agregar_medico(self.medico)
+        # Se agendan en orden no cronológico
+        for semana in (3, 0, 2, 1):
+            self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0) + timedelta(weeks=semana))
+        self.clinica.agendar_turno("87654321", "98765", "Cardiología", datetime(2024, 6, 19, 9, 0))
+        todos = list(self.clinica.iterar_turnos())
+        self.assertEqual(todos, self.clinica.obtener_turnos())
+        self.assertEqual(list(self.clinica.iterar_turnos(offset=3, limite=10)), todos[3:])
+        del_medico = [t.obtener_fecha_hora() for t in self.clinica.iterar_turnos(matricula="98765", offset=1, limite=2)]
+        self.assertEqual(del_medico, [datetime(2024, 6, 19, 9, 0), datetime(2024, 6, 24, 9, 0)])
+        en_rango = list(self.clinica.iterar_turnos(desde=datetime(2024, 6, 18), hasta=datetime(2024, 7, 1)))
+        self.assertEqual(len(en_rango), 2)
+        del_paciente = list(self.clinica.iterar_turnos(dni="87654321"))
+        self.assertEqual([t.obtener_paciente().obtener_dni() for t in del_paciente], ["87654321"])
+        with self.assertRaises(PacienteNoEncontradoException):
+            self.clinica.iterar_turnos(dni="DNI_INEXISTENTE")
+
+    def test_24_recetas_y_pacientes_por_medicamento(self):
+        otro = Paciente("87654321", "Ana Gómez", "1990-01-01")
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_paciente(otro)
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.emitir_receta("87654321", "98765", ["Ibuprofeno 400mg"], datetime(2024, 5, 20))
+        self.clinica.emitir_receta("12345678", "98765", ["ibuprofeno 600mg", "Paracetamol"], datetime(2024, 6, 3))
+        self.clinica.emitir_receta("87654321", "98765", ["Ibuprofeno 400mg"], datetime(2024, 6, 10))
+        self.clinica.emitir_receta("12345678", "98765", ["Paracetamol"], datetime(2024, 6, 12))
+
+        junio = self.clinica.obtener_recetas_por_medicamento("IBUPROFENO", datetime(2024, 6, 1), datetime(2024, 7, 1))
+        self.assertEqual([r.obtener_fecha() for r in junio], [datetime(2024, 6, 3), datetime(2024, 6, 10)])
+        pacientes = self.clinica.obtener_pacientes_por_medicamento("ibuprofeno")
+        self.assertEqual([p.obtener_dni() for p in pacientes], ["87654321", "12345678"])
+        self.assertEqual(self.clinica.obtener_medicamentos_mas_recetados("98765", 1), [("Ibuprofeno 400mg", 2)])
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.obtener_medicamentos_mas_recetados("00000")
+
+    def test_25_buscar_pacientes_por_nombre(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_paciente(Paciente("87654321", "María García", "1990-01-01"))
+        self.clinica.agregar_paciente(Paciente("11223344", "Mario Garay", "1992-03-04"))
+
+        encontrados = self.clinica.buscar_pacientes_por_nombre("MAR gar")
+        self.assertEqual([p.obtener_dni() for p in encontrados], ["87654321", "11223344"])
+        self.assertEqual(self.clinica.buscar_pacientes_por_nombre("mar", 1)[0].obtener_dni(), "87654321")
+        self.assertEqual(self.clinica.buscar_pacientes_por_nombre("perz"), [])
+        aproximados = self.clinica.buscar_pacientes_aproximado("perz")
+        self.assertEqual([(p.obtener_dni(), errores) for p, errores in aproximados], [("12345678", 1)])
+
+    def test_26_iterar_recetas(self):
+        otro = Paciente("87654321", "Ana Gómez", "1990-01-01")
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_paciente(otro)
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_medico(Medico("11111", "Dr. Luis Díaz"))
+        self.clinica.emitir_receta("87654321", "98765", ["Ibuprofeno"], datetime(2024, 5, 20))
+        self.clinica.emitir_receta("12345678", "11111", ["Paracetamol"], datetime(2024, 6, 3))
+        self.clinica.emitir_receta("12345678", "98765", ["Amoxicilina"], datetime(2024, 6, 10))
+
+        # Paciente por paciente, en orden de registro
+        fechas = [r.obtener_fecha().day for r in self.clinica.iterar_recetas()]
+        self.assertEqual(fechas, [3, 10, 20])
+        junio = self.clinica.iterar_recetas(desde=datetime(2024, 6, 1), hasta=datetime(2024, 7, 1), matricula="98765")
+        self.assertEqual([r.obtener_medicamentos() for r in junio], [["Amoxicilina"]])
+        self.assertEqual(len(list(self.clinica.iterar_recetas(offset=1, limite=1, dni="12345678"))), 1)
+
+    def test_27_cancelar_turno(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        primero = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        segundo = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 19, 9, 0))
+        self.assertNotEqual(primero.obtener_id(), segundo.obtener_id())
+        self.assertIs(self.clinica.obtener_turno(primero.obtener_id()), primero)
+        self.assertIs(self.clinica.buscar_turno("98765", datetime(2024, 6, 19, 9, 0)), segundo)
+
+        self.assertIs(self.clinica.cancelar_turno(primero.obtener_id()), primero)
+        self.assertEqual(self.clinica.obtener_turnos(), [segundo])
+        self.assertEqual(self.clinica.obtener_turnos_de_medico("98765"), [segundo])
+        self.assertEqual(self.clinica.obtener_historiales_por_dni("12345678").obtener_turnos(), [segundo])
+        self.assertEqual(self.clinica.renderizar_historia("12345678")[0], 1)
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.cancelar_turno(primero.obtener_id())
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.buscar_turno("98765", datetime(2024, 6, 17, 9, 0))
+        # El horario quedó libre
+        otro = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        self.assertNotEqual(otro.obtener_id(), primero.obtener_id())
+
+    def test_28_reprogramar_turno(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        turno = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        ocupado = self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 19, 9, 0))
+        nuevo = self.clinica.reprogramar_turno(turno.obtener_id(), datetime(2024, 6, 24, 10, 0))
+        self.assertEqual(nuevo.obtener_id(), turno.obtener_id())
+        self.assertEqual(nuevo.obtener_fecha_hora(), datetime(2024, 6, 24, 10, 0))
+        # Conserva su lugar en el orden de registro; la agenda queda en orden cronológico
+        self.assertEqual(self.clinica.obtener_turnos(), [nuevo, ocupado])
+        self.assertEqual(self.clinica.obtener_turnos_de_medico("98765"), [ocupado, nuevo])
+        self.assertIs(self.clinica.obtener_turno(turno.obtener_id()), nuevo)
+        self.clinica.agendar_turno("12345678", "98765", "Cardiología", datetime(2024, 6, 17, 9, 0))
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.reprogramar_turno(nuevo.obtener_id(), datetime(2024, 6, 19, 9, 0))
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.reprogramar_turno(nuevo.obtener_id(), datetime(2024, 6, 18, 9, 0))
+        self.assertEqual(self.clinica.obtener_turno(nuevo.obtener_id()).obtener_fecha_hora(), datetime(2024, 6, 24, 10, 0))
+
+    def test_29_cancelar_muchos_turnos_mantiene_los_indices(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_paciente(Paciente("87654321", "Ana Gómez", "1990-01-01"))
+        self.clinica.agregar_medico(Medico("11111", "Dr. Todos los días", [Especialidad("Clínica", ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"])]))
+        inicio = datetime(2025, 1, 6, 8, 0)
+        # Más turnos que un bloque de la Agenda, para que se quiten de varios bloques
+        resultados = self.clinica.agendar_turnos([(("12345678", "87654321")[i % 2], "11111", "Clínica", inicio + timedelta(minutes=15 * i))
+                                                  for i in range(5000)])
+        turnos = [r.obtener_turno() for r in resultados]
+        for turno in turnos[::3]:
+            self.clinica.cancelar_turno(turno.obtener_id())
+        for turno in turnos[1::3]:
+            self.clinica.reprogramar_turno(turno.obtener_id(), turno.obtener_fecha_hora() + timedelta(minutes=5))
+        quedan = self.clinica.obtener_turnos()
+        self.assertEqual(len(quedan), 5000 - len(turnos[::3]))
+        self.assertEqual([t.obtener_id() for t in quedan], [t.obtener_id() for i, t in enumerate(turnos) if i % 3])
+        agenda = self.clinica.obtener_turnos_de_medico("11111")
+        fechas = [t.obtener_fecha_hora() for t in agenda]
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertEqual(sorted(t.obtener_id() for t in agenda), [t.obtener_id() for t in quedan])
+        en_historias = sum(len(self.clinica.obtener_historiales_por_dni(dni).obtener_turnos()) for dni in ("12345678", "87654321"))
+        self.assertEqual(en_historias, len(quedan))
+        dia = self.clinica.obtener_turnos_de_medico("11111", datetime(2025, 1, 7), datetime(2025, 1, 8))
+        self.assertEqual([t.obtener_fecha_hora().minute % 15 for t in dia][:3], [5, 0, 5])
+
+    def test_30_turnos_de_un_medico_de_a_varias_copias(self):
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(Medico("11111", "Dr. Todos los días", [Especialidad("Clínica", ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"])]))
+        inicio = datetime(2025, 1, 6, 8, 0)
+        # Más turnos que los que iterar_turnos copia de la Agenda por vez
+        self.clinica.agendar_turnos([("12345678", "11111", "Clínica", inicio + timedelta(minutes=15 * i)) for i in range(700)])
+        todos = self.clinica.obtener_turnos_de_medico("11111")
+        self.assertEqual(list(self.clinica.iterar_turnos(matricula="11111")), todos)
+        self.assertEqual(list(self.clinica.iterar_turnos(matricula="11111", offset=250, limite=20)), todos[250:270])
+        desde, hasta = inicio + timedelta(hours=10), inicio + timedelta(hours=150)
+        self.assertEqual(list(self.clinica.iterar_turnos(matricula="11111", desde=desde, hasta=hasta)),
+                         self.clinica.obtener_turnos_de_medico("11111", desde, hasta))
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.iterar_turnos(matricula="no existe")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,206 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+import random
+from src.clinica import Clinica, TurnoOcupadoException, TurnoNoEncontradoException
+from src.almacenamiento_sqlite import AlmacenamientoSQLite
+from src.almacenamiento_journal import AlmacenamientoJournal
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+CANTIDAD_HILOS = 8
+
+class TestClinicaConcurrente(unittest.TestCase):
+
+    def setUp(self):
+        # Cambios de hilo más frecuentes: más intercalados entre validar y registrar
+        self.intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.clinica = self.crear_clinica()
+        for i in range(40):
+            self.clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+        for i in range(4):
+            self.clinica.agregar_medico(Medico(f"M-{i}", f"Médico {i}", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+        inicio = datetime(2025, 1, 6, 8, 0)
+        self.horarios = [inicio + timedelta(minutes=15 * i) for i in range(200)]
+
+    def crear_clinica(self):
+        return Clinica()
+
+    def tearDown(self):
+        sys.setswitchinterval(self.intervalo)
+        self.clinica.cerrar()
+
+    def ejecutar_en_hilos(self, trabajo):
+        barrera = threading.Barrier(CANTIDAD_HILOS)
+        errores = []
+
+        def correr(numero):
+            barrera.wait()
+            try:
+                trabajo(numero)
+            except Exception as e:
+                errores.append(e)
+
+        hilos = [threading.Thread(target=correr, args=(n,)) for n in range(CANTIDAD_HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+
+    def verificar_consistencia(self):
+        turnos = self.clinica.obtener_turnos()
+        claves_medico = [(t.obtener_medico().obtener_matricula(), t.obtener_fecha_hora()) for t in turnos]
+        claves_paciente = [(t.obtener_paciente().obtener_dni(), t.obtener_fecha_hora()) for t in turnos]
+        self.assertEqual(len(claves_medico), len(set(claves_medico)), "un médico quedó con dos turnos a la misma hora")
+        self.assertEqual(len(claves_paciente), len(set(claves_paciente)), "un paciente quedó con dos turnos a la misma hora")
+        en_agendas = sum(len(self.clinica.obtener_turnos_de_medico(f"M-{i}")) for i in range(4))
+        en_historias = sum(len(self.clinica.obtener_historiales_por_dni(f"{i:08}").obtener_turnos()) for i in range(40))
+        self.assertEqual(en_agendas, len(turnos))
+        self.assertEqual(en_historias, len(turnos))
+        for i in range(4):
+            fechas = [t.obtener_fecha_hora() for t in self.clinica.obtener_turnos_de_medico(f"M-{i}")]
+            self.assertEqual(fechas, sorted(fechas))
+        return turnos
+
+    def test_01_todos_los_hilos_compiten_por_los_mismos_horarios(self):
+        agendados = []
+
+        def trabajo(numero):
+            # Cada hilo usa sus propios pacientes y pide todos los horarios de todos los médicos
+            for indice, fecha_hora in enumerate(self.horarios):
+                for medico in range(4):
+                    dni = f"{numero * 5 + (indice + medico) % 5:08}"
+                    try:
+                        agendados.append(self.clinica.agendar_turno(dni, f"M-{medico}", "Clínica", fecha_hora))
+                    except TurnoOcupadoException:
+                        pass
+
+        self.ejecutar_en_hilos(trabajo)
+        turnos = self.verificar_consistencia()
+        # Cada horario de cada médico quedó agendado exactamente una vez
+        self.assertEqual(len(turnos), 4 * len(self.horarios))
+        self.assertEqual(len(agendados), len(turnos))
+
+    def test_02_un_paciente_no_queda_con_dos_turnos_simultaneos(self):
+        def trabajo(numero):
+            # Todos los hilos intentan dar al mismo paciente el mismo horario con distintos médicos
+            for fecha_hora in self.horarios:
+                try:
+                    self.clinica.agendar_turno("00000000", f"M-{numero % 4}", "Clínica", fecha_hora)
+                except TurnoOcupadoException:
+                    pass
+
+        self.ejecutar_en_hilos(trabajo)
+        turnos = self.verificar_consistencia()
+        self.assertEqual(len(turnos), len(self.horarios))
+
+    def test_03_lotes_y_turnos_sueltos_en_paralelo(self):
+        def trabajo(numero):
+            if numero % 2:
+                solicitudes = [(f"{numero * 5 + i % 5:08}", f"M-{i % 4}", "Clínica", self.horarios[(i + numero) % 30]) for i in range(20)]
+                self.clinica.agendar_turnos(solicitudes)
+            else:
+                for i in range(20):
+                    try:
+                        self.clinica.agendar_turno(f"{numero * 5 + i % 5:08}", f"M-{i % 4}", "Clínica", self.horarios[(i + numero) % 30])
+                    except TurnoOcupadoException:
+                        pass
+                self.clinica.emitir_receta(f"{numero * 5:08}", "M-0", ["Ibuprofeno"])
+
+        self.ejecutar_en_hilos(trabajo)
+        self.verificar_consistencia()
+        recetas = sum(len(self.clinica.obtener_historiales_por_dni(f"{i:08}").obtener_recetas()) for i in range(40))
+        self.assertEqual(recetas, CANTIDAD_HILOS // 2)
+
+    def test_04_cancelar_y_reprogramar_en_paralelo(self):
+        resultados = self.clinica.agendar_turnos([(f"{(i * 7 + medico) % 40:08}", f"M-{medico}", "Clínica", fecha_hora)
+                                                  for i, fecha_hora in enumerate(self.horarios) for medico in range(4)])
+        ids = [r.obtener_turno().obtener_id() for r in resultados]
+        a_cancelar = ids[0::3]
+        a_reprogramar = ids[1::3]
+        libres = [self.horarios[-1] + timedelta(minutes=15 * (i + 1)) for i in range(100)]
+        cancelados = []
+
+        def trabajo(numero):
+            azar = random.Random(numero)
+            if numero % 2 == 0:
+                # Todos estos hilos intentan cancelar los mismos turnos, en distinto orden
+                for id_turno in azar.sample(a_cancelar, len(a_cancelar)):
+                    try:
+                        cancelados.append(self.clinica.cancelar_turno(id_turno).obtener_id())
+                    except TurnoNoEncontradoException:
+                        pass
+            else:
+                # Y estos mueven los mismos turnos a los mismos horarios libres, mientras se agenda en ellos
+                for id_turno in azar.sample(a_reprogramar, 60):
+                    try:
+                        self.clinica.reprogramar_turno(id_turno, azar.choice(libres))
+                    except TurnoOcupadoException:
+                        pass
+                for fecha_hora in azar.sample(libres, 10):
+                    try:
+                        self.clinica.agendar_turno(f"{numero:08}", f"M-{numero % 4}", "Clínica", fecha_hora)
+                    except TurnoOcupadoException:
+                        pass
+
+        self.ejecutar_en_hilos(trabajo)
+        turnos = self.verificar_consistencia()
+        # Cada turno se canceló una sola vez y ninguno quedó en algún índice
+        self.assertEqual(sorted(cancelados), sorted(a_cancelar))
+        for id_turno in a_cancelar:
+            with self.assertRaises(TurnoNoEncontradoException):
+                self.clinica.obtener_turno(id_turno)
+        quedan = {t.obtener_id() for t in turnos}
+        self.assertTrue(quedan.isdisjoint(a_cancelar))
+        self.assertTrue(set(a_reprogramar) <= quedan)
+        for turno in turnos:
+            self.assertIs(self.clinica.obtener_turno(turno.obtener_id()), turno)
+            self.assertIs(self.clinica.buscar_turno(turno.obtener_medico().obtener_matricula(), turno.obtener_fecha_hora()), turno)
+
+class TestClinicaConcurrenteSQLite(TestClinicaConcurrente):
+    """Las mismas pruebas guardando en SQLite: la conexión se comparte entre los hilos."""
+
+    def crear_clinica(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clinica.db")
+        return Clinica(AlmacenamientoSQLite(self.ruta))
+
+    def tearDown(self):
+        super().tearDown()
+        self.directorio.cleanup()
+
+    def verificar_consistencia(self):
+        turnos = super().verificar_consistencia()
+        reabierta = Clinica(AlmacenamientoSQLite(self.ruta))
+        self.assertEqual(len(reabierta.obtener_turnos()), len(turnos))
+        reabierta.cerrar()
+        return turnos
+
+class TestClinicaConcurrenteJournal(TestClinicaConcurrente):
+    """Las mismas pruebas con el journal y snapshots frecuentes: lo que se reabre coincide con lo que había en memoria."""
+
+    def crear_clinica(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        return Clinica(AlmacenamientoJournal(self.directorio.name, snapshot_cada=5))
+
+    def tearDown(self):
+        super().tearDown()
+        self.directorio.cleanup()
+
+    def verificar_consistencia(self):
+        turnos = super().verificar_consistencia()
+        self.clinica.__almacenamiento__.sincronizar()
+        reabierta = Clinica(AlmacenamientoJournal(self.directorio.name))
+        self.assertEqual(sorted((t.obtener_medico().obtener_matricula(), t.obtener_fecha_hora()) for t in reabierta.obtener_turnos()),
+                         sorted((t.obtener_medico().obtener_matricula(), t.obtener_fecha_hora()) for t in turnos))
+        return turnos
+
+if __name__ == '__main__':
+    unittest.main()
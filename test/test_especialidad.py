@@ -1,5 +1,5 @@
 import unittest
-from src.especialidad import Especialidad
+from src.especialidad import Especialidad, indice_dia
 
 class TestEspecialidad(unittest.TestCase):
     def test_01_crear_especialidad_con_un_dia(self):
@@ -68,5 +68,25 @@ class TestEspecialidad(unittest.TestCase):
         self.assertTrue(especialidad.verificar_dia("lunes"))
         self.assertTrue(especialidad.verificar_dia("martes"))
 
+    def test_11_mascara_dias(self):
+        especialidad = Especialidad("Cardiología", ["lunes", "miércoles", "domingo"])
+        self.assertEqual(especialidad.obtener_mascara_dias(), 0b1000101)
+        self.assertTrue(especialidad.verificar_indice_dia(2))
+        self.assertFalse(especialidad.verificar_indice_dia(1))
+
+    def test_12_dias_sin_tilde_y_invalidos(self):
+        especialidad = Especialidad("Pediatría", ["Sabado", "Miercoles", "sabado"])
+        # obtener_dias devuelve los días en el orden de la semana y escritos como en DIAS_SEMANA
+        self.assertEqual(especialidad.obtener_dias(), ["miércoles", "sábado"])
+        self.assertTrue(especialidad.verificar_dia("miércoles"))
+        self.assertFalse(especialidad.verificar_dia("feriado"))
+        with self.assertRaises(ValueError):
+            Especialidad("Pediatría", ["lunes", "lunse"])
+
+    def test_13_dias_que_no_son_texto(self):
+        with self.assertRaises(ValueError):
+            Especialidad("Pediatría", [1, 2])
+        self.assertIsNone(indice_dia(1))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
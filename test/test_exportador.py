@@ -0,0 +1,124 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+from src.clinica import Clinica, MedicoNoDisponibleException
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.exportador import Exportador, ResultadoExportacion, formato_de_archivo
+
+class TestExportador(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.clinica.agregar_paciente(Paciente("1", 'Ana "Anita" Gómez', "1990-01-01"))
+        self.clinica.agregar_paciente(Paciente("2", "Luis, Díaz", "1985-02-03"))
+        self.clinica.agregar_medico(Medico("M1", "Dr. Pan", [Especialidad("Pediatría", ["lunes"]),
+                                                             Especialidad("Clínica", ["martes"])]))
+        self.clinica.agregar_medico(Medico("M2", "Dra. Sol", [Especialidad("Clínica", ["lunes", "martes"])]))
+        self.clinica.agendar_turno("1", "M1", "Pediatría", datetime(2025, 1, 6, 8, 0))
+        self.clinica.agendar_turno("2", "M1", "Clínica", datetime(2025, 1, 7, 9, 0))
+        self.clinica.agendar_turno("2", "M2", "Clínica", datetime(2025, 1, 6, 10, 30))
+        self.clinica.agendar_turno("1", "M2", "Clínica", datetime(2025, 1, 14, 8, 0))
+        self.clinica.emitir_receta("1", "M1", ["Ibuprofeno 400mg", "Paracetamol"], datetime(2025, 1, 6, 8, 20))
+        self.clinica.emitir_receta("2", "M2", ["Amoxicilina"], datetime(2025, 1, 20, 11, 0))
+        self.exportador = Exportador(self.clinica)
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_01_formato_de_archivo(self):
+        self.assertEqual(formato_de_archivo("turnos.csv"), "csv")
+        self.assertEqual(formato_de_archivo("turnos.csv.gz"), "csv")
+        self.assertEqual(formato_de_archivo("recetas.jsonl.gz"), "jsonl")
+        with self.assertRaises(ValueError):
+            formato_de_archivo("turnos.txt")
+
+    def test_02_turnos_csv_con_filtros(self):
+        ruta = self.ruta("turnos.csv")
+        resultado = self.exportador.exportar_turnos(ruta, datetime(2025, 1, 6), datetime(2025, 1, 8), especialidad="Clínica")
+        self.assertEqual(resultado.obtener_filas(), 2)
+        self.assertEqual(resultado.obtener_bytes(), os.path.getsize(ruta))
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual([(f["fecha_hora"], f["dni"], f["matricula"]) for f in filas],
+                         [("2025-01-07T09:00:00", "2", "M1"), ("2025-01-06T10:30:00", "2", "M2")])
+        # Las comas del nombre no rompen las columnas
+        self.assertEqual(filas[0]["paciente"], "Luis, Díaz")
+
+        self.exportador.exportar_turnos(ruta, matricula="M2")
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            self.assertEqual([f["fecha_hora"] for f in csv.DictReader(archivo)], ["2025-01-06T10:30:00", "2025-01-14T08:00:00"])
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.exportador.exportar_turnos(ruta, matricula="M9")
+
+    def test_03_recetas_jsonl_comprimido(self):
+        ruta = self.ruta("recetas.jsonl.gz")
+        resultado = self.exportador.exportar_recetas(ruta)
+        self.assertEqual(resultado.obtener_filas(), 2)
+        with gzip.open(ruta, "rt", encoding="utf-8") as archivo:
+            recetas = [json.loads(linea) for linea in archivo]
+        self.assertEqual(recetas[0], {"fecha": "2025-01-06T08:20:00", "dni": "1", "paciente": 'Ana "Anita" Gómez',
+                                      "matricula": "M1", "medico": "Dr. Pan",
+                                      "medicamentos": ["Ibuprofeno 400mg", "Paracetamol"]})
+        self.exportador.exportar_recetas(ruta, hasta=datetime(2025, 1, 10))
+        with gzip.open(ruta, "rt", encoding="utf-8") as archivo:
+            self.assertEqual(len(archivo.readlines()), 1)
+
+    def test_04_recetas_csv_separa_medicamentos(self):
+        ruta = self.ruta("recetas.csv")
+        self.exportador.exportar_recetas(ruta, matricula="M1")
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas = list(csv.DictReader(archivo))
+        self.assertEqual([f["medicamentos"] for f in filas], ["Ibuprofeno 400mg; Paracetamol"])
+
+    def test_05_error_no_deja_archivos(self):
+        with self.assertRaises(ValueError):
+            self.exportador.exportar_turnos(self.ruta("turnos.txt"))
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.exportador.exportar_recetas(self.ruta("recetas.csv"), matricula="M9")
+        self.assertEqual(os.listdir(self.directorio.name), [])
+
+    def test_06_se_puede_agendar_mientras_se_exporta(self):
+        # Más de un lote (1.000 filas): entre lote y lote se agregan pacientes, turnos y recetas
+        self.clinica.agregar_paciente(Paciente("3", "Eva", "2000-03-04"))
+        lunes = datetime(2025, 2, 3, 8)
+        for semana in range(60):
+            for media_hora in range(20):
+                self.clinica.agendar_turno("3", "M2", "Clínica", lunes + timedelta(weeks=semana, minutes=30 * media_hora))
+        for _ in range(1100):
+            self.clinica.emitir_receta("3", "M2", ["Amoxicilina"], datetime(2025, 2, 3, 9))
+        llamadas = []
+
+        def modificar_clinica(resultado, cantidad):
+            semanas = timedelta(weeks=len(llamadas))
+            dni = str(100 + len(llamadas))
+            llamadas.append(cantidad)
+            self.clinica.agregar_paciente(Paciente(dni, "Nuevo", "2000-01-01"))
+            self.clinica.agendar_turno(dni, "M1", "Pediatría", datetime(2025, 1, 13, 8) + semanas)
+            self.clinica.agendar_turno(dni, "M2", "Clínica", datetime(2027, 1, 4, 8) + semanas)
+            self.clinica.emitir_receta(dni, "M1", ["Paracetamol"], datetime(2025, 1, 13, 8))
+            resultado.__filas__ += cantidad
+
+        with mock.patch.object(ResultadoExportacion, "registrar_filas", modificar_clinica):
+            turnos = self.exportador.exportar_turnos(self.ruta("turnos.csv"))
+            self.assertEqual(llamadas, [1000, 205])
+            recetas = self.exportador.exportar_recetas(self.ruta("recetas.csv"))
+        # Los turnos de M1 ya se exportaron cuando se agendó el nuevo; el de M2 va al final de su agenda
+        self.assertEqual(turnos.obtener_filas(), 4 + 1200 + 1)
+        with open(self.ruta("turnos.csv"), newline="", encoding="utf-8") as archivo:
+            self.assertEqual(list(csv.DictReader(archivo))[-1]["fecha_hora"], "2027-01-04T08:00:00")
+        # Los dos pacientes agregados antes de exportar las recetas están; el agregado durante la
+        # exportación llegó después de que se copiara la (única) página de historias
+        self.assertEqual(recetas.obtener_filas(), 2 + 1100 + 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -118,5 +118,64 @@ class TestHistoriaClinica(unittest.TestCase):
         self.assertIn(turno_adicional, historia.obtener_turnos())
         self.assertIn(receta_adicional, historia.obtener_recetas())
 
+    def test_11_renderizar_de_lo_mas_reciente_a_lo_mas_antiguo(self):
+        historia = HistoriaClinica(self.paciente)
+        historia.agregar_turno(Turno(self.paciente, self.medico, datetime(2024, 6, 24, 9, 0), "Cardiología"))
+        historia.agregar_turno(Turno(self.paciente, self.medico, self.fecha_hora, "Cardiología"))
+        historia.agregar_receta(Receta(self.paciente, self.medico, self.medicamentos, datetime(2024, 6, 17, 11, 0)))
+        lineas = list(historia.renderizar())
+        self.assertEqual(lineas, [
+            "24/06/2024 09:00 - Turno de Cardiología con Dr. María García (Matrícula: 98765)",
+            "17/06/2024 11:00 - Receta de Dr. María García (Matrícula: 98765): Aspirina 100mg, Atorvastatina 20mg",
+            "17/06/2024 10:30 - Turno de Cardiología con Dr. María García (Matrícula: 98765)",
+        ])
+
+    def test_12_renderizar_paginas_ultimos_y_rango(self):
+        historia = HistoriaClinica(self.paciente)
+        for dia in range(1, 26):
+            historia.agregar_turno(Turno(self.paciente, self.medico, datetime(2024, 6, dia, 10, 0), "Cardiología"))
+        self.assertEqual(historia.contar_entradas(), 25)
+        self.assertEqual(len(list(historia.renderizar(pagina=1, por_pagina=10))), 10)
+        tercera = list(historia.renderizar(pagina=3, por_pagina=10))
+        self.assertEqual(len(tercera), 5)
+        self.assertTrue(tercera[-1].startswith("01/06/2024"))
+        self.assertEqual(list(historia.renderizar(pagina=4, por_pagina=10)), [])
+        ultimos = list(historia.renderizar(ultimos=2))
+        self.assertTrue(ultimos[0].startswith("25/06/2024") and ultimos[1].startswith("24/06/2024"))
+        desde, hasta = datetime(2024, 6, 10), datetime(2024, 6, 15)
+        self.assertEqual(historia.contar_entradas(desde, hasta), 5)
+        en_rango = list(historia.renderizar(desde, hasta, pagina=2, por_pagina=3))
+        self.assertEqual([linea[:10] for linea in en_rango], ["11/06/2024", "10/06/2024"])
+        # Un turno nuevo invalida la línea de tiempo ya armada
+        historia.agregar_turno(Turno(self.paciente, self.medico, datetime(2024, 6, 12, 15, 0), "Cardiología"))
+        self.assertEqual(historia.contar_entradas(desde, hasta), 6)
+        with self.assertRaises(ValueError):
+            list(historia.renderizar(pagina=0, por_pagina=10))
+
+    def test_13_quitar_turno(self):
+        historia = HistoriaClinica(self.paciente)
+        turnos = [Turno(self.paciente, self.medico, datetime(2024, 6, dia, 10, 0), "Cardiología") for dia in (17, 19, 24)]
+        for turno in turnos:
+            historia.agregar_turno(turno)
+        self.assertEqual(historia.contar_entradas(), 3)
+        self.assertTrue(historia.quitar_turno(turnos[1]))
+        self.assertFalse(historia.quitar_turno(turnos[1]))
+        self.assertEqual(historia.obtener_turnos(), [turnos[0], turnos[2]])
+        # La línea de tiempo se vuelve a armar sin el turno quitado
+        self.assertEqual(historia.contar_entradas(), 2)
+        self.assertEqual([linea[:10] for linea in historia.renderizar()], ["24/06/2024", "17/06/2024"])
+
+    def test_14_iterar_turnos_no_copia(self):
+        historia = HistoriaClinica(self.paciente)
+        turnos = [Turno(self.paciente, self.medico, datetime(2024, 6, dia, 10, 0), "Cardiología") for dia in (17, 19)]
+        for turno in turnos:
+            historia.agregar_turno(turno)
+        self.assertNotIsInstance(historia.iterar_turnos(), list)
+        self.assertEqual(list(historia.iterar_turnos()), turnos)
+        # obtener_turnos sigue devolviendo una copia que se puede modificar
+        copia = historia.obtener_turnos()
+        copia.pop()
+        self.assertEqual(list(historia.iterar_turnos()), turnos)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
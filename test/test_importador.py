@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.clinica import Clinica
+from src.importador import Importador, parsear_fecha
+
+class TestImportador(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.importador = Importador(self.clinica)
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def crear_archivo(self, nombre, contenido):
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_01_parsear_fecha_formatos(self):
+        self.assertEqual(parsear_fecha("28/05/2006"), datetime(2006, 5, 28))
+        self.assertEqual(parsear_fecha(" 2006-05-28 "), datetime(2006, 5, 28))
+
+    def test_02_parsear_fecha_invalida(self):
+        for texto in ["31/02/2000", "2000/01/01", "1/1/2000", "aa/bb/cccc", ""]:
+            with self.assertRaises(ValueError):
+                parsear_fecha(texto)
+
+    def test_03_importar_pacientes_csv(self):
+        ruta = self.crear_archivo("pacientes.csv", "dni,nombre,fecha_nacimiento\n1,Ana,28/05/2006\n2,Luis,2000-01-02\n")
+        resultado = self.importador.importar_pacientes(ruta)
+        self.assertEqual(resultado.obtener_importadas(), 2)
+        self.assertEqual(resultado.obtener_cantidad_errores(), 0)
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 2)
+
+    def test_04_errores_por_fila_no_cortan_la_carga(self):
+        ruta = self.crear_archivo("pacientes.csv", "dni,nombre,fecha_nacimiento\n1,Ana,28/05/2006\n1,Dup,01/01/2000\n2,Mal,31/02/2000\n3,,01/01/2000\n4,Eva,01/01/2000\n")
+        resultado = self.importador.importar_pacientes(ruta)
+        self.assertEqual(resultado.obtener_filas(), 5)
+        self.assertEqual(resultado.obtener_importadas(), 2)
+        self.assertEqual([linea for linea, _ in resultado.obtener_errores()], [3, 4, 5])
+        self.assertIn("ya está registrado", resultado.obtener_errores()[0][1])
+
+    def test_05_importar_medicos_y_especialidades_jsonl(self):
+        medicos = self.crear_archivo("medicos.jsonl", '{"matricula": "M1", "nombre": "Dr. Pan"}\nno es json\n\n[1, 2]\n')
+        especialidades = self.crear_archivo("especialidades.jsonl",
+            '{"matricula": "M1", "especialidad": "Pediatría", "dias": ["lunes", "martes"]}\n'
+            '{"matricula": "M9", "especialidad": "Clínica", "dias": "lunes"}\n'
+            '{"matricula": "M1", "especialidad": "Clínica", "dias": "feriado"}\n')
+        resultado_medicos = self.importador.importar_medicos(medicos)
+        self.assertEqual(resultado_medicos.obtener_importadas(), 1)
+        self.assertEqual([linea for linea, _ in resultado_medicos.obtener_errores()], [2, 4])
+        resultado_esp = self.importador.importar_especialidades(especialidades)
+        self.assertEqual(resultado_esp.obtener_importadas(), 1)
+        self.assertEqual(resultado_esp.obtener_cantidad_errores(), 2)
+        medico = self.clinica.obtener_medico_por_matricula("M1")
+        self.assertEqual(medico.obtener_especialidad_para_dia("martes"), ["Pediatría"])
+
+    def test_06_dias_que_no_son_texto_son_error_de_fila(self):
+        ruta = self.crear_archivo("especialidades.jsonl",
+            '{"matricula": "M1", "especialidad": "Pediatría", "dias": [1, 2]}\n'
+            '{"matricula": "M1", "especialidad": "Clínica", "dias": ["lunes"]}\n')
+        self.importador.importar_medicos(self.crear_archivo("medicos.jsonl", '{"matricula": "M1", "nombre": "Dr. Pan"}\n'))
+        resultado = self.importador.importar_especialidades(ruta)
+        self.assertEqual(resultado.obtener_importadas(), 1)
+        self.assertEqual([linea for linea, _ in resultado.obtener_errores()], [1])
+
+    def test_07_formato_no_soportado(self):
+        ruta = self.crear_archivo("pacientes.txt", "")
+        with self.assertRaises(ValueError):
+            self.importador.importar_pacientes(ruta)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime
+from src.indice_medicamentos import IndiceMedicamentos, normalizar_medicamento
+from src.receta import Receta
+from src.paciente import Paciente
+from src.medico import Medico
+
+class TestIndiceMedicamentos(unittest.TestCase):
+    def setUp(self):
+        self.paciente = Paciente("12345678", "Juan Pérez", "1985-05-15")
+        self.medico = Medico("98765", "Dr. María García")
+        self.otro_medico = Medico("11111", "Dr. Luis Díaz")
+        self.indice = IndiceMedicamentos()
+
+    def agregar(self, medicamentos, fecha, medico=None):
+        receta = Receta(self.paciente, medico or self.medico, medicamentos, fecha)
+        self.indice.agregar_receta(receta)
+        return receta
+
+    def test_01_normalizar(self):
+        self.assertEqual(normalizar_medicamento("  Ibuprofeno   400mg "), "ibuprofeno 400mg")
+        self.assertEqual(normalizar_medicamento("Ácido Fólico"), "acido folico")
+
+    def test_02_buscar_ordenado_por_fecha(self):
+        tercera = self.agregar(["Ibuprofeno"], datetime(2024, 6, 19))
+        primera = self.agregar(["ibuprofeno", "Paracetamol"], datetime(2024, 6, 17))
+        segunda = self.agregar(["IBUPROFENO"], datetime(2024, 6, 18))
+        self.assertEqual(self.indice.buscar("Ibuprofeno"), [primera, segunda, tercera])
+        self.assertEqual(self.indice.buscar("paracetamol"), [primera])
+        self.assertEqual(self.indice.buscar("Amoxicilina"), [])
+
+    def test_03_rango_de_fechas_excluye_hasta(self):
+        recetas = [self.agregar(["Ibuprofeno"], datetime(2024, 6, dia)) for dia in range(10, 20)]
+        self.assertEqual(self.indice.buscar("ibuprofeno", datetime(2024, 6, 12), datetime(2024, 6, 15)), recetas[2:5])
+
+    def test_04_nombre_incluye_presentaciones(self):
+        a = self.agregar(["Ibuprofeno 400mg"], datetime(2024, 6, 17))
+        b = self.agregar(["Ibuprofeno 600mg", "Ibuprofeno 400mg"], datetime(2024, 6, 18))
+        self.agregar(["Ibuprofenox"], datetime(2024, 6, 19))
+        # La receta con dos presentaciones aparece una sola vez
+        self.assertEqual(self.indice.buscar("ibuprofeno"), [a, b])
+        self.assertEqual(self.indice.buscar("ibuprofeno 600mg"), [b])
+
+    def test_05_mas_recetados_por_medico(self):
+        for _ in range(3):
+            self.agregar(["Ibuprofeno", "Paracetamol"], datetime(2024, 6, 17))
+        self.agregar(["Paracetamol"], datetime(2024, 6, 17))
+        self.agregar(["Amoxicilina", "amoxicilina"], datetime(2024, 6, 17), self.otro_medico)
+        self.assertEqual(self.indice.mas_recetados("98765", 2), [("Paracetamol", 4), ("Ibuprofeno", 3)])
+        self.assertEqual(self.indice.mas_recetados("11111"), [("Amoxicilina", 1)])
+        self.assertEqual(self.indice.mas_recetados(cantidad=1), [("Paracetamol", 4)])
+        self.assertEqual(self.indice.mas_recetados("00000"), [])
+        self.assertEqual(len(self.indice), 3)
+
+if __name__ == '__main__':
+    unittest.main()
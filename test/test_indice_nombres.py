@@ -0,0 +1,55 @@
+import unittest
+from src.indice_nombres import IndiceNombres, distancia_edicion
+from src.paciente import Paciente
+
+class TestIndiceNombres(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceNombres()
+        self.pacientes = {}
+        for dni, nombre in [("1", "María García"), ("2", "Mario Garay"), ("3", "José González"),
+                            ("4", "Ana Gonzales"), ("5", "Juan Pérez"), ("6", "Ana María López")]:
+            self.pacientes[dni] = Paciente(dni, nombre, "1990-01-01")
+            self.indice.agregar_paciente(self.pacientes[dni])
+
+    def dnis(self, pacientes):
+        return [p.obtener_dni() for p in pacientes]
+
+    def test_01_distancia_edicion(self):
+        self.assertEqual(distancia_edicion("gonzalez", "gonzales", 2), 1)
+        self.assertEqual(distancia_edicion("maira", "maria", 1), 1)
+        self.assertEqual(distancia_edicion("perz", "perez", 1), 1)
+        # Pasado el máximo devuelve maximo + 1
+        self.assertEqual(distancia_edicion("abc", "xyz", 1), 2)
+        self.assertEqual(distancia_edicion("ana", "anastasia", 2), 3)
+
+    def test_02_prefijo_de_cada_palabra(self):
+        self.assertEqual(self.dnis(self.indice.buscar_por_prefijo("mar gar")), ["1", "2"])
+        self.assertEqual(self.dnis(self.indice.buscar_por_prefijo("GARCÍA")), ["1"])
+        self.assertEqual(self.dnis(self.indice.buscar_por_prefijo("ana mar")), ["6"])
+        self.assertEqual(self.indice.buscar_por_prefijo("mar xyz"), [])
+        self.assertEqual(self.indice.buscar_por_prefijo("   "), [])
+
+    def test_03_prefijo_respeta_cantidad(self):
+        self.assertEqual(len(self.indice.buscar_por_prefijo("a", 1)), 1)
+        # Un paciente con dos palabras que empiezan igual aparece una vez
+        self.assertEqual(self.dnis(self.indice.buscar_por_prefijo("ma")), ["1", "6", "2"])
+
+    def test_04_aproximado_ordena_por_errores(self):
+        resultados = self.indice.buscar_aproximado("gonzalez")
+        self.assertEqual([(p.obtener_dni(), errores) for p, errores in resultados], [("3", 0), ("4", 1)])
+        resultados = self.indice.buscar_aproximado("maira garcia", 1)
+        self.assertEqual([(p.obtener_dni(), errores) for p, errores in resultados], [("1", 1)])
+        self.assertEqual(self.indice.buscar_aproximado("zzzz"), [])
+
+    def test_05_muchos_pacientes(self):
+        indice = IndiceNombres()
+        for i in range(5000):
+            indice.agregar_paciente(Paciente(str(i), f"Paciente{i % 50} Apellido{i}", "1990-01-01"))
+        self.assertEqual(len(indice.buscar_por_prefijo("paciente7 apellido4999")), 0)
+        self.assertEqual(self.dnis(indice.buscar_por_prefijo("apellido4999")), ["4999"])
+        resultados = indice.buscar_aproximado("apelido4999", 3)
+        self.assertEqual((resultados[0][0].obtener_dni(), resultados[0][1]), ("4999", 1))
+        self.assertEqual(len(indice), 5050)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -82,5 +82,14 @@ class TestMedico(unittest.TestCase):
         self.assertIn("77777", str_representation)
         self.assertIn("Oftalmología", str_representation)
 
+    def test_11_obtener_especialidades_por_indice_dia(self):
+        medico = Medico("88888", "Dra. Sofía Díaz")
+        medico.agregar_especialidad(Especialidad("Cardiología", ["lunes", "miércoles"]))
+        medico.agregar_especialidad(Especialidad("Clínica", ["lunes"]))
+        medico.agregar_especialidad(Especialidad("Cardiología", ["lunes", "viernes"]))
+        self.assertEqual(medico.obtener_especialidades_por_indice_dia(0), ("Cardiología", "Clínica"))
+        self.assertEqual(medico.obtener_especialidades_por_indice_dia(4), ("Cardiología",))
+        self.assertEqual(medico.obtener_especialidades_por_indice_dia(6), ())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
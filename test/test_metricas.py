@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from src.clinica import Clinica, PacienteNoEncontradoException, TurnoOcupadoException, TurnoNoEncontradoException
+from src.metricas import Metricas, LIMITES_LATENCIA
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+class TestMetricas(unittest.TestCase):
+
+    def setUp(self):
+        self.clinica = Clinica()
+        self.clinica.agregar_paciente(Paciente("12345678", "Ana López", "28/05/2006"))
+        self.clinica.agregar_medico(Medico("M-1", "Dr. García", [Especialidad("Clínica", TODOS_LOS_DIAS)]))
+        self.fecha = datetime(2025, 1, 6, 8, 0)
+
+    def test_01_sin_metricas_no_se_envuelven_los_metodos(self):
+        self.assertIsNone(self.clinica.obtener_metricas())
+        self.assertNotIn("agendar_turno", vars(self.clinica))
+
+    def test_02_cuenta_llamadas_y_errores_por_tipo(self):
+        metricas = self.clinica.activar_metricas()
+        self.clinica.agendar_turno("12345678", "M-1", "Clínica", self.fecha)
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("12345678", "M-1", "Clínica", self.fecha)
+        with self.assertRaises(PacienteNoEncontradoException):
+            self.clinica.agendar_turno("99", "M-1", "Clínica", self.fecha)
+
+        operacion = metricas.obtener_operacion("agendar_turno")
+        self.assertEqual(operacion.obtener_llamadas(), 3)
+        self.assertEqual(operacion.obtener_errores(), {"TurnoOcupadoException": 1, "PacienteNoEncontradoException": 1})
+        histograma = operacion.obtener_histograma()
+        self.assertEqual(len(histograma), len(LIMITES_LATENCIA) + 1)
+        self.assertEqual(histograma[-1], (float("inf"), 3))
+        # Acumulado: nunca decrece
+        self.assertEqual([c for _, c in histograma], sorted(c for _, c in histograma))
+
+    def test_03_desactivar_restaura_los_metodos(self):
+        metricas = self.clinica.activar_metricas()
+        self.clinica.obtener_medicos()
+        self.clinica.desactivar_metricas()
+        self.clinica.obtener_medicos()
+        self.assertNotIn("obtener_medicos", vars(self.clinica))
+        self.assertEqual(metricas.obtener_operacion("obtener_medicos").obtener_llamadas(), 1)
+
+    def test_04_exportar_prometheus(self):
+        metricas = Metricas()
+        clinica = Clinica(metricas=metricas)
+        with self.assertRaises(PacienteNoEncontradoException):
+            clinica.obtener_historiales_por_dni("99")
+        texto = metricas.exportar_prometheus()
+        self.assertIn("# TYPE clinica_llamadas_total counter", texto)
+        self.assertIn('clinica_llamadas_total{operacion="obtener_historiales_por_dni"} 1', texto)
+        self.assertIn('clinica_errores_total{operacion="obtener_historiales_por_dni",tipo="PacienteNoEncontradoException"} 1', texto)
+        self.assertIn('clinica_latencia_segundos_bucket{operacion="obtener_historiales_por_dni",le="+Inf"} 1', texto)
+        self.assertIn('clinica_latencia_segundos_count{operacion="obtener_historiales_por_dni"} 1', texto)
+        # Las operaciones que no se llamaron no aparecen
+        self.assertNotIn("agendar_turno", texto)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "clinica.prom")
+            metricas.guardar(ruta)
+            with open(ruta, encoding="utf-8") as archivo:
+                self.assertEqual(archivo.read(), texto)
+
+    def test_05_varios_hilos(self):
+        metricas = self.clinica.activar_metricas()
+        for i in range(8):
+            self.clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+
+        def trabajo(numero):
+            for n in range(100):
+                fecha_hora = self.fecha + timedelta(minutes=15 * (n * 8 + numero))
+                self.clinica.agendar_turno(f"{numero:08}", "M-1", "Clínica", fecha_hora)
+
+        hilos = [threading.Thread(target=trabajo, args=(i,)) for i in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(metricas.obtener_operacion("agendar_turno").obtener_llamadas(), 800)
+        self.assertEqual(metricas.obtener_operacion("agendar_turno").obtener_histograma()[-1][1], 800)
+
+    def test_06_solo_se_mide_la_llamada_externa(self):
+        metricas = self.clinica.activar_metricas()
+        turno = self.clinica.agendar_turno("12345678", "M-1", "Clínica", self.fecha)
+        # cancelar_turno busca el turno con obtener_turno, que no se cuenta otra vez
+        self.clinica.cancelar_turno(turno.obtener_id())
+        self.assertEqual(metricas.obtener_operacion("cancelar_turno").obtener_llamadas(), 1)
+        self.assertEqual(metricas.obtener_operacion("obtener_turno").obtener_llamadas(), 0)
+        with self.assertRaises(TurnoNoEncontradoException):
+            self.clinica.obtener_turno(turno.obtener_id())
+        # Después de una excepción el hilo vuelve a medir
+        self.clinica.obtener_medicos()
+        self.assertEqual(metricas.obtener_operacion("obtener_turno").obtener_llamadas(), 1)
+        self.assertEqual(metricas.obtener_operacion("obtener_medicos").obtener_llamadas(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -94,5 +94,10 @@ class TestReceta(unittest.TestCase):
         self.assertEqual(receta.obtener_medicamentos(), medicamentos_originales)
         self.assertIsInstance(receta.obtener_fecha(), datetime)
 
+    def test_11_receta_con_fecha_indicada(self):
+        fecha = datetime(2024, 6, 15, 14, 30, 0)
+        receta = Receta(self.paciente, self.medico, self.medicamentos, fecha)
+        self.assertEqual(receta.obtener_fecha(), fecha)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
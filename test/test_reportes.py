@@ -0,0 +1,88 @@
+import multiprocessing
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.reportes import dias_por_mes, partir, reporte_utilizacion
+
+TIENE_FORK = "fork" in multiprocessing.get_all_start_methods()
+
+class TestReportes(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.clinica.agregar_paciente(Paciente("1", "Ana", "1990-01-01"))
+        self.clinica.agregar_paciente(Paciente("2", "Luis", "1985-02-03"))
+        self.clinica.agregar_medico(Medico("M1", "Dr. Pan", [Especialidad("Pediatría", ["lunes"]),
+                                                             Especialidad("Clínica", ["martes", "jueves"])]))
+        self.clinica.agregar_medico(Medico("M2", "Dra. Sol", [Especialidad("Clínica", ["lunes"])]))
+        # Enero de 2025 tiene 4 lunes, 4 martes y 5 jueves; febrero, 4 de cada uno
+        for hora in range(8, 12):
+            self.clinica.agendar_turno("1", "M1", "Pediatría", datetime(2025, 1, 6, hora))
+        self.clinica.agendar_turno("2", "M1", "Clínica", datetime(2025, 1, 9, 9))
+        self.clinica.agendar_turno("2", "M2", "Clínica", datetime(2025, 2, 3, 10))
+        self.desde, self.hasta = datetime(2025, 1, 1), datetime(2025, 3, 1)
+
+    def test_01_dias_por_mes(self):
+        dias = dias_por_mes(self.desde, self.hasta)
+        self.assertEqual(dias["2025-01"], [4, 4, 5, 5, 5, 4, 4])
+        self.assertEqual(dias["2025-02"], [4] * 7)
+        # Un día cuenta si su comienzo (00:00) está en el período
+        self.assertEqual(sum(dias_por_mes(datetime(2025, 1, 1, 12), datetime(2025, 1, 3))["2025-01"]), 1)
+
+    def test_02_reporte_por_medico(self):
+        reporte = reporte_utilizacion(self.clinica, self.desde, self.hasta, procesos=1)
+        filas = reporte.obtener_por_medico()
+        self.assertIn(("2025-01", "M1", "Pediatría", 4, 2.0, 40.0), filas)
+        self.assertIn(("2025-01", "M1", "Clínica", 1, 0.5, 90.0), filas)
+        self.assertIn(("2025-02", "M2", "Clínica", 1, 0.5, 40.0), filas)
+        self.assertEqual(len(filas), 6)
+        self.assertAlmostEqual(reporte.utilizacion(2.0, 40.0), 5.0)
+
+    def test_03_reporte_por_especialidad(self):
+        reporte = reporte_utilizacion(self.clinica, self.desde, self.hasta, timedelta(minutes=15), procesos=1)
+        por_especialidad = reporte.obtener_por_especialidad()
+        self.assertIn(("2025-01", "Clínica", 1, 0.25, 130.0), por_especialidad)
+        self.assertIn(("2025-02", "Pediatría", 0, 0.0, 40.0), por_especialidad)
+        self.assertEqual(len(list(reporte.lineas())), len(por_especialidad) + 6 + 3)
+
+    @unittest.skipUnless(TIENE_FORK, "los procesos del reporte se crean con fork")
+    def test_04_con_procesos_igual_que_sin_procesos(self):
+        en_serie = reporte_utilizacion(self.clinica, self.desde, self.hasta, procesos=1)
+        self.assertEqual(en_serie.obtener_procesos(), 1)
+        # Con más partes que turnos, cada parte tiene uno
+        for procesos in [2, 4]:
+            # Otro test pudo dejar un hilo terminando; acá solo importa que el fork cuente igual
+            with mock.patch("threading.active_count", return_value=1):
+                en_paralelo = reporte_utilizacion(self.clinica, self.desde, self.hasta, procesos=procesos)
+            self.assertEqual(en_paralelo.obtener_procesos(), procesos)
+            self.assertEqual(en_paralelo.obtener_por_medico(), en_serie.obtener_por_medico())
+
+    def test_05_con_otros_hilos_no_se_hace_fork(self):
+        en_serie = reporte_utilizacion(self.clinica, self.desde, self.hasta, procesos=1)
+        fin = threading.Event()
+        hilo = threading.Thread(target=fin.wait)
+        hilo.start()
+        try:
+            with mock.patch("multiprocessing.get_context") as get_context, \
+                    self.assertLogs("src.reportes", "WARNING") as avisos:
+                reporte = reporte_utilizacion(self.clinica, self.desde, self.hasta, procesos=4)
+            get_context.assert_not_called()
+        finally:
+            fin.set()
+            hilo.join()
+        self.assertIn("un solo proceso en lugar de 4", avisos.output[0])
+        self.assertEqual(reporte.obtener_procesos(), 1)
+        self.assertEqual(reporte.obtener_por_medico(), en_serie.obtener_por_medico())
+
+    def test_06_partir_y_errores(self):
+        self.assertEqual(partir(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(partir(2, 4), [(0, 1), (1, 2)])
+        with self.assertRaises(ValueError):
+            reporte_utilizacion(self.clinica, self.hasta, self.desde)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from src.clinica import Clinica, TurnoOcupadoException, MedicoNoDisponibleException
+from src.almacenamiento_sqlite import AlmacenamientoSQLite
+from src.serie_turnos import SerieTurnos, MAXIMO_TURNOS_SERIE
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+LUNES = datetime(2025, 1, 6, 10, 0)
+
+def poblar(clinica: Clinica) -> Clinica:
+    clinica.agregar_paciente(Paciente("1", "Ana", "01/01/1990"))
+    clinica.agregar_paciente(Paciente("2", "Beto", "01/01/1980"))
+    clinica.agregar_medico(Medico("M-1", "Dr. Uno", [Especialidad("Kinesiología", ["lunes", "jueves"])]))
+    return clinica
+
+class TestSerieTurnos(unittest.TestCase):
+    def setUp(self):
+        self.clinica = poblar(Clinica())
+
+    def test_01_fechas_de_la_serie(self):
+        paciente = Paciente("1", "Ana", "01/01/1990")
+        medico = Medico("M-1", "Dr. Uno")
+        serie = SerieTurnos(paciente, medico, "Kinesiología", LUNES, 4, cada_semanas=2)
+        fechas = list(serie.obtener_fechas())
+        self.assertEqual(fechas, [LUNES + timedelta(weeks=2 * i) for i in range(4)])
+        self.assertEqual(serie.obtener_ultima(), fechas[-1])
+        self.assertTrue(all(serie.contiene(f) for f in fechas))
+        self.assertFalse(serie.contiene(LUNES + timedelta(weeks=1)))
+        self.assertFalse(serie.contiene(LUNES + timedelta(weeks=8)))
+        self.assertFalse(serie.contiene(LUNES - timedelta(weeks=2)))
+        self.assertEqual(serie.fecha_en_dia(date(2025, 1, 20)), datetime(2025, 1, 20, 10, 0))
+        self.assertIsNone(serie.fecha_en_dia(date(2025, 1, 13)))
+        self.assertEqual(SerieTurnos.cantidad_hasta(LUNES, date(2025, 2, 3)), 5)
+        self.assertEqual(SerieTurnos.cantidad_hasta(LUNES, date(2025, 2, 2), cada_semanas=2), 2)
+        with self.assertRaises(ValueError):
+            SerieTurnos(paciente, medico, "Kinesiología", LUNES, MAXIMO_TURNOS_SERIE + 1)
+
+    def test_02_serie_se_guarda_sin_crear_turnos(self):
+        resultado = self.clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES, cantidad=10)
+        self.assertTrue(resultado.fue_agendada())
+        self.assertEqual(len(resultado.obtener_serie()), 10)
+        self.assertEqual(self.clinica.__turnos__, {})
+        # Los turnos se crean al consultar la historia, una sola vez
+        turnos = self.clinica.obtener_historiales_por_dni("1").obtener_turnos()
+        self.assertEqual([t.obtener_fecha_hora() for t in turnos], list(resultado.obtener_serie().obtener_fechas()))
+        self.assertEqual(len(self.clinica.obtener_turnos_de_medico("M-1")), 10)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 10)
+
+    def test_03_turnos_que_chocan_con_la_serie(self):
+        self.clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES, hasta=date(2025, 3, 31), cada_semanas=2)
+        # Otro paciente, el mismo médico, una fecha de la serie
+        with self.assertRaises(TurnoOcupadoException):
+            self.clinica.agendar_turno("2", "M-1", "Kinesiología", datetime(2025, 3, 31, 10, 0))
+        # La semana intermedia y el lunes siguiente al final están libres
+        self.clinica.agendar_turno("2", "M-1", "Kinesiología", datetime(2025, 1, 13, 10, 0))
+        self.clinica.agendar_turno("2", "M-1", "Kinesiología", datetime(2025, 4, 7, 10, 0))
+        resultados = self.clinica.agendar_turnos([("2", "M-1", "Kinesiología", datetime(2025, 1, 20, 10, 0))])
+        self.assertIsInstance(resultados[0].obtener_error(), TurnoOcupadoException)
+        # Buscar horario libre tiene en cuenta la serie sin crear sus turnos
+        libre = self.clinica.buscar_proximo_turno("Kinesiología", datetime(2025, 1, 20, 10, 0))
+        self.assertEqual(libre[0][0], datetime(2025, 1, 20, 10, 30))
+        self.assertEqual(len(self.clinica.__turnos__), 2)
+
+    def test_04_conflictos_se_informan_y_no_se_agenda_nada(self):
+        self.clinica.agendar_turno("2", "M-1", "Kinesiología", datetime(2025, 1, 20, 10, 0))
+        self.clinica.agendar_turno("1", "M-1", "Kinesiología", datetime(2025, 2, 3, 10, 0))
+        resultado = self.clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES, cantidad=6)
+        self.assertFalse(resultado.fue_agendada())
+        self.assertEqual([f for f, _ in resultado.obtener_conflictos()], [datetime(2025, 1, 20, 10, 0), datetime(2025, 2, 3, 10, 0)])
+        self.assertTrue(all(isinstance(e, TurnoOcupadoException) for _, e in resultado.obtener_conflictos()))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        # Dos series del mismo paciente en el mismo horario también chocan
+        self.assertTrue(self.clinica.agendar_serie("2", "M-1", "Kinesiología", datetime(2025, 1, 9, 9, 0), cantidad=3).fue_agendada())
+        conflictos = self.clinica.agendar_serie("2", "M-1", "Kinesiología", datetime(2024, 12, 26, 9, 0), cantidad=4).obtener_conflictos()
+        self.assertEqual([f for f, _ in conflictos], [datetime(2025, 1, 9, 9, 0), datetime(2025, 1, 16, 9, 0)])
+        # La especialidad se valida una vez para toda la serie, y hay que indicar cantidad o fecha final
+        with self.assertRaises(MedicoNoDisponibleException):
+            self.clinica.agendar_serie("1", "M-1", "Kinesiología", datetime(2025, 1, 7, 10, 0), cantidad=3)
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES)
+
+    def test_05_listar_y_buscar_pacientes_no_crea_los_turnos(self):
+        self.clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES, cantidad=10)
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 2)
+        self.assertEqual(len(list(self.clinica.iterar_pacientes())), 2)
+        self.assertEqual(self.clinica.buscar_pacientes_por_nombre("Ana")[0].obtener_dni(), "1")
+        self.clinica.buscar_pacientes_aproximado("Bet")
+        self.clinica.obtener_medicamentos_mas_recetados()
+        self.assertEqual(self.clinica.__turnos__, {})
+        # Lo que recorre todos los turnos sí los crea
+        self.assertEqual(self.clinica.contar_turnos(), 10)
+        self.assertEqual(len(self.clinica.__turnos__), 10)
+
+    def test_06_serie_persistida_se_carga_como_serie(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "clinica.db")
+            clinica = poblar(Clinica(AlmacenamientoSQLite(ruta)))
+            clinica.agendar_serie("1", "M-1", "Kinesiología", LUNES, cantidad=5)
+            clinica.cerrar()
+            clinica = Clinica(AlmacenamientoSQLite(ruta))
+            # Al abrir, la serie vuelve a estar pendiente: una fila, no cinco turnos
+            self.assertEqual(clinica.__turnos__, {})
+            with self.assertRaises(TurnoOcupadoException):
+                clinica.agendar_turno("2", "M-1", "Kinesiología", LUNES + timedelta(weeks=4))
+            # Al crear sus turnos se guardan sueltos, y se pueden cancelar uno por uno
+            turno = clinica.buscar_turno("M-1", LUNES + timedelta(weeks=1))
+            clinica.cancelar_turno(turno.obtener_id())
+            clinica.cerrar()
+            clinica = Clinica(AlmacenamientoSQLite(ruta))
+            self.assertEqual(len(clinica.obtener_turnos_de_medico("M-1")), 4)
+            clinica.agendar_turno("2", "M-1", "Kinesiología", LUNES + timedelta(weeks=1))
+            clinica.cerrar()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from src.clinica import Clinica
+from src.servidor import ServidorClinica, ClienteClinica
+
+TODOS_LOS_DIAS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+class TestServidor(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.clinica = Clinica()
+        self.servidor = ServidorClinica(self.clinica, hilos=4)
+        self.puerto = await self.servidor.iniciar("127.0.0.1", 0)
+        self.cliente = await ClienteClinica.conectar("127.0.0.1", self.puerto)
+
+    async def asyncTearDown(self):
+        await self.cliente.cerrar()
+        await self.servidor.detener()
+
+    async def cargar_datos(self):
+        respuesta = await self.cliente.pedir("agregar_paciente", dni="12345678", nombre="Ana López", fecha_nacimiento="28/05/2006")
+        self.assertTrue(respuesta["ok"], respuesta)
+        respuesta = await self.cliente.pedir("agregar_medico", matricula="M-1", nombre="Dr. García",
+                                             especialidades=[{"especialidad": "Clínica", "dias": TODOS_LOS_DIAS}])
+        self.assertTrue(respuesta["ok"], respuesta)
+
+    async def test_01_agendar_turno_y_consultar_historia(self):
+        await self.cargar_datos()
+        respuesta = await self.cliente.pedir("agendar_turno", dni="12345678", matricula="M-1",
+                                             especialidad="Clínica", fecha_hora="2025-01-06T08:00")
+        self.assertTrue(respuesta["ok"], respuesta)
+        self.assertEqual(respuesta["resultado"]["fecha_hora"], "2025-01-06T08:00:00")
+        respuesta = await self.cliente.pedir("emitir_receta", dni="12345678", matricula="M-1", medicamentos=["Ibuprofeno"])
+        self.assertTrue(respuesta["ok"], respuesta)
+
+        respuesta = await self.cliente.pedir("historia", dni="12345678", hasta="2025-01-07")
+        self.assertTrue(respuesta["ok"], respuesta)
+        self.assertEqual(respuesta["resultado"]["total"], 1)
+        self.assertEqual(respuesta["resultado"]["lineas"],
+                         ["06/01/2025 08:00 - Turno de Clínica con Dr. García (Matrícula: M-1)"])
+        self.assertEqual(len(self.clinica.obtener_historiales_por_dni("12345678").obtener_recetas()), 1)
+
+    async def test_02_errores_se_informan_sin_cortar_la_conexion(self):
+        await self.cargar_datos()
+        respuesta = await self.cliente.pedir("agendar_turno", dni="99", matricula="M-1",
+                                             especialidad="Clínica", fecha_hora="2025-01-06T08:00")
+        self.assertFalse(respuesta["ok"])
+        self.assertEqual(respuesta["error"], "PacienteNoEncontradoException")
+        respuesta = await self.cliente.pedir("agendar_turno", dni="12345678", matricula="M-1",
+                                             especialidad="Clínica", fecha_hora="06/01/2025")
+        self.assertEqual(respuesta["error"], "ValueError")
+        respuesta = await self.cliente.pedir("emitir_receta", dni="12345678", matricula="M-1", medicamentos=[])
+        self.assertEqual(respuesta["error"], "RecetaInvalidaException")
+        respuesta = await self.cliente.pedir("agregar_medico", matricula="M-2", nombre="Dr. Paz",
+                                             especialidades=[{"especialidad": "Clínica", "dias": [1, 2]}])
+        self.assertEqual(respuesta["error"], "ValueError")
+        respuesta = await self.cliente.pedir("borrar_todo")
+        self.assertEqual(respuesta["error"], "ValueError")
+        # La conexión sigue funcionando después de los errores
+        respuesta = await self.cliente.pedir("historia", dni="12345678")
+        self.assertTrue(respuesta["ok"], respuesta)
+        self.assertEqual(respuesta["resultado"]["total"], 0)
+
+    async def test_03_json_invalido(self):
+        respuesta = await self.servidor.procesar(b"{no es json")
+        self.assertFalse(respuesta["ok"])
+        respuesta = await self.servidor.procesar(b"[1, 2]")
+        self.assertFalse(respuesta["ok"])
+
+    async def test_04_muchos_clientes_no_agendan_el_mismo_horario(self):
+        await self.cargar_datos()
+        for i in range(20):
+            await self.cliente.pedir("agregar_paciente", dni=f"{i:08}", nombre=f"Paciente {i}", fecha_nacimiento="01/01/1990")
+        horarios = [(datetime(2025, 1, 6, 8, 0) + timedelta(minutes=15 * i)).isoformat() for i in range(10)]
+
+        async def trabajo(numero):
+            cliente = await ClienteClinica.conectar("127.0.0.1", self.puerto)
+            try:
+                # Todos los clientes piden los mismos horarios del mismo médico
+                return [await cliente.pedir("agendar_turno", dni=f"{numero:08}", matricula="M-1",
+                                            especialidad="Clínica", fecha_hora=fecha_hora)
+                        for fecha_hora in horarios]
+            finally:
+                await cliente.cerrar()
+
+        respuestas = [r for lista in await asyncio.gather(*(trabajo(n) for n in range(20))) for r in lista]
+        agendados = [r for r in respuestas if r["ok"]]
+        self.assertEqual(len(agendados), len(horarios))
+        self.assertEqual(sorted(r["resultado"]["fecha_hora"] for r in agendados), horarios)
+        self.assertTrue(all(r["error"] == "TurnoOcupadoException" for r in respuestas if not r["ok"]))
+        self.assertEqual(len(self.clinica.obtener_turnos()), len(horarios))
+
+    async def test_05_cancelar_y_reprogramar_turno(self):
+        await self.cargar_datos()
+        respuesta = await self.cliente.pedir("agendar_turno", dni="12345678", matricula="M-1",
+                                             especialidad="Clínica", fecha_hora="2025-01-06T08:00")
+        id_turno = respuesta["resultado"]["id_turno"]
+        respuesta = await self.cliente.pedir("reprogramar_turno", id_turno=id_turno, fecha_hora="2025-01-07T09:30")
+        self.assertTrue(respuesta["ok"], respuesta)
+        self.assertEqual(respuesta["resultado"]["id_turno"], id_turno)
+        self.assertEqual(respuesta["resultado"]["fecha_hora"], "2025-01-07T09:30:00")
+        respuesta = await self.cliente.pedir("cancelar_turno", id_turno=id_turno)
+        self.assertTrue(respuesta["ok"], respuesta)
+        self.assertEqual(self.clinica.obtener_turnos(), [])
+        respuesta = await self.cliente.pedir("cancelar_turno", id_turno=id_turno)
+        self.assertEqual(respuesta["error"], "TurnoNoEncontradoException")
+        respuesta = await self.cliente.pedir("cancelar_turno", id_turno="1")
+        self.assertEqual(respuesta["error"], "ValueError")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime
+from src.simbolos import SIMBOLOS, TablaDeSimbolos
+from src.clinica import Clinica
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+from src.turno import Turno
+from src.receta import Receta
+
+def copia(texto: str) -> str:
+    """Un texto igual pero en otro objeto, como los que se leen de un archivo."""
+    return "".join(list(texto))
+
+class TestSimbolos(unittest.TestCase):
+    def test_01_textos_iguales_son_el_mismo_objeto(self):
+        tabla = TablaDeSimbolos()
+        primero = tabla.internar(copia("Cardiología"))
+        segundo = tabla.internar(copia("Cardiología"))
+        self.assertIs(primero, segundo)
+        self.assertEqual(len(tabla), 1)
+        self.assertIn("Cardiología", tabla)
+        nombres = tabla.internar_todos([copia("Ibuprofeno"), copia("Cardiología")])
+        self.assertIs(nombres[1], primero)
+        self.assertEqual(len(tabla), 2)
+
+    def test_02_turnos_y_especialidades_comparten_el_nombre(self):
+        paciente = Paciente("1", "Ana", "01/01/1990")
+        especialidad = Especialidad(copia("Pediatría"), ["lunes"])
+        medico = Medico("M-1", "Dr. Uno", [especialidad])
+        turnos = [Turno(paciente, medico, datetime(2025, 1, 6, 8, 0), copia("Pediatría")) for _ in range(3)]
+        for turno in turnos:
+            self.assertIs(turno.obtener_especialidad(), especialidad.obtener_especialidad())
+        self.assertIs(medico.obtener_especialidades_por_indice_dia(0)[0], especialidad.obtener_especialidad())
+
+    def test_03_recetas_comparten_los_medicamentos(self):
+        paciente = Paciente("1", "Ana", "01/01/1990")
+        medico = Medico("M-1", "Dr. Uno")
+        medicamentos = [copia("Amoxicilina 500mg"), copia("Omeprazol 20mg")]
+        primera = Receta(paciente, medico, medicamentos)
+        segunda = Receta(paciente, medico, [copia("Omeprazol 20mg")])
+        self.assertEqual(primera.obtener_medicamentos(), ["Amoxicilina 500mg", "Omeprazol 20mg"])
+        self.assertIs(primera.obtener_medicamentos()[1], segunda.obtener_medicamentos()[0])
+        # La receta tiene su propia lista: cambiar la que se pasó no la modifica
+        medicamentos.append("Otro")
+        self.assertEqual(len(primera.obtener_medicamentos()), 2)
+
+    def test_04_clinica_guarda_una_copia_por_nombre(self):
+        clinica = Clinica()
+        clinica.agregar_paciente(Paciente("1", "Ana", "01/01/1990"))
+        clinica.agregar_medico(Medico("M-1", "Dr. Uno", [Especialidad("Clínica", ["lunes"])]))
+        for hora in range(8, 12):
+            clinica.agendar_turno("1", "M-1", copia("Clínica"), datetime(2025, 1, 6, hora, 0))
+            clinica.emitir_receta("1", "M-1", [copia("Paracetamol 500mg")])
+        historia = clinica.obtener_historiales_por_dni("1")
+        self.assertEqual(len({id(t.obtener_especialidad()) for t in historia.obtener_turnos()}), 1)
+        self.assertEqual(len({id(r.obtener_medicamentos()[0]) for r in historia.obtener_recetas()}), 1)
+        self.assertIs(historia.obtener_turnos()[0].obtener_especialidad(), SIMBOLOS.internar("Clínica"))
+
+    def test_05_con_el_limite_los_textos_nuevos_no_se_guardan(self):
+        tabla = TablaDeSimbolos(limite=2)
+        primero = tabla.internar(copia("Cardiología"))
+        tabla.internar(copia("Pediatría"))
+        nuevo = copia("Cardiologia")
+        self.assertIs(tabla.internar(nuevo), nuevo)
+        self.assertEqual(len(tabla), 2)
+        # Los textos ya guardados se siguen compartiendo
+        self.assertIs(tabla.internar(copia("Cardiología")), primero)
+        self.assertIs(tabla.internar_todos([copia("Cardiología"), nuevo])[0], primero)
+        self.assertEqual(len(tabla), 2)
+
+if __name__ == "__main__":
+    unittest.main()
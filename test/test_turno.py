@@ -82,5 +82,11 @@ class TestTurno(unittest.TestCase):
         self.assertIs(turno.obtener_paciente(), self.paciente)
         self.assertIs(turno.obtener_medico(), self.medico)
 
+    def test_11_turno_sin_dict_por_instancia(self):
+        turno = Turno(self.paciente, self.medico, self.fecha_hora, self.especialidad_str)
+        self.assertFalse(hasattr(turno, "__dict__"))
+        with self.assertRaises(AttributeError):
+            turno.otro_atributo = 1
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date, datetime, timedelta
+from src.clinica import Clinica
+from src.turnos_columnares import np
+from src.paciente import Paciente
+from src.medico import Medico
+from src.especialidad import Especialidad
+
+def poblar(clinica):
+    for i in range(5):
+        clinica.agregar_paciente(Paciente(f"{i:08}", f"Paciente {i}", "01/01/1990"))
+    clinica.agregar_medico(Medico("M-1", "Dr. Uno", [Especialidad("Cardiología", ["lunes", "martes"])]))
+    clinica.agregar_medico(Medico("M-2", "Dra. Dos", [Especialidad("Pediatría", ["lunes"]), Especialidad("Clínica", ["martes"])]))
+    lunes = datetime(2025, 1, 6, 8, 0)
+    for i in range(20):
+        clinica.agendar_turno(f"{i % 5:08}", "M-1", "Cardiología", lunes + timedelta(days=i % 2, minutes=30 * i))
+    clinica.agendar_turnos([(f"{i:08}", "M-2", "Pediatría", lunes + timedelta(days=7, hours=i)) for i in range(5)])
+    clinica.agendar_turno("00000000", "M-2", "Clínica", lunes + timedelta(days=8, hours=3))
+
+class TestEstadisticasTurnos(unittest.TestCase):
+    """Estadísticas de turnos recorriendo los objetos (sin NumPy)."""
+
+    def setUp(self):
+        self.clinica = Clinica()
+        poblar(self.clinica)
+
+    def test_01_contar_turnos_con_filtros(self):
+        self.assertEqual(self.clinica.contar_turnos(), 26)
+        self.assertEqual(self.clinica.contar_turnos(matricula="M-2"), 6)
+        self.assertEqual(self.clinica.contar_turnos(especialidad="Clínica"), 1)
+        self.assertEqual(self.clinica.contar_turnos(desde=datetime(2025, 1, 7), hasta=datetime(2025, 1, 8)), 10)
+
+    def test_02_conteos_por_medico_especialidad_y_dia(self):
+        self.assertEqual(self.clinica.contar_turnos_por_medico(), {"M-1": 20, "M-2": 6})
+        self.assertEqual(self.clinica.contar_turnos_por_especialidad(desde=datetime(2025, 1, 7)),
+                         {"Cardiología": 10, "Pediatría": 5, "Clínica": 1})
+        self.assertEqual(self.clinica.contar_turnos_por_dia(matricula="M-2"),
+                         {date(2025, 1, 13): 5, date(2025, 1, 14): 1})
+
+    def test_03_histograma_ocupacion(self):
+        histograma = self.clinica.histograma_ocupacion(matricula="M-2")
+        self.assertEqual(len(histograma), 7)
+        self.assertEqual(histograma[0][8:13], [1, 1, 1, 1, 1])
+        self.assertEqual(histograma[1][11], 1)
+        self.assertEqual(sum(map(sum, histograma)), 6)
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestTurnosColumnares(unittest.TestCase):
+
+    def setUp(self):
+        self.objetos = Clinica()
+        self.columnar = Clinica(columnar=True)
+        poblar(self.objetos)
+        poblar(self.columnar)
+
+    def test_01_mismos_resultados_que_recorrer_objetos(self):
+        rangos = [(None, None), (datetime(2025, 1, 7), None), (datetime(2025, 1, 6, 10), datetime(2025, 1, 7, 12))]
+        for desde, hasta in rangos:
+            self.assertEqual(self.columnar.contar_turnos(desde, hasta), self.objetos.contar_turnos(desde, hasta))
+            self.assertEqual(self.columnar.contar_turnos_por_medico(desde, hasta), self.objetos.contar_turnos_por_medico(desde, hasta))
+            self.assertEqual(self.columnar.contar_turnos_por_especialidad(desde, hasta), self.objetos.contar_turnos_por_especialidad(desde, hasta))
+            self.assertEqual(self.columnar.contar_turnos_por_dia(desde, hasta), self.objetos.contar_turnos_por_dia(desde, hasta))
+            self.assertEqual(self.columnar.histograma_ocupacion(desde, hasta), self.objetos.histograma_ocupacion(desde, hasta))
+        self.assertEqual(self.columnar.contar_turnos(matricula="M-2", especialidad="Pediatría"), 5)
+        self.assertEqual(self.columnar.contar_turnos(matricula="no existe"), 0)
+
+    def test_02_columnas_crecen_con_muchos_turnos(self):
+        clinica = Clinica(columnar=True)
+        clinica.agregar_paciente(Paciente("1", "Paciente", "01/01/1990"))
+        clinica.agregar_medico(Medico("M-1", "Dr. Uno", [Especialidad("Clínica", ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"])]))
+        inicio = datetime(2025, 1, 6)
+        clinica.agendar_turnos([("1", "M-1", "Clínica", inicio + timedelta(minutes=15 * i)) for i in range(3000)])
+        self.assertEqual(clinica.contar_turnos(), 3000)
+        self.assertEqual(sum(clinica.contar_turnos_por_dia().values()), 3000)
+        self.assertEqual(clinica.contar_turnos_por_dia()[date(2025, 1, 6)], 96)
+
+    def test_03_cancelar_y_reprogramar_actualiza_las_columnas(self):
+        for clinica in (self.objetos, self.columnar):
+            turnos = clinica.obtener_turnos_de_medico("M-1")
+            for turno in turnos[::2]:
+                clinica.cancelar_turno(turno.obtener_id())
+            clinica.reprogramar_turno(turnos[1].obtener_id(), datetime(2025, 1, 13, 18, 0))
+        self.assertEqual(self.columnar.contar_turnos(), 16)
+        self.assertEqual(self.columnar.contar_turnos_por_medico(), self.objetos.contar_turnos_por_medico())
+        self.assertEqual(self.columnar.contar_turnos_por_dia(), self.objetos.contar_turnos_por_dia())
+        self.assertEqual(self.columnar.histograma_ocupacion(), self.objetos.histograma_ocupacion())
+
+if __name__ == '__main__':
+    unittest.main()